@@ -0,0 +1,257 @@
+"""
+⚡ Vectorized Batch Scoring
+Score whole screening camps at once with NumPy
+"""
+
+import numpy as np
+from city_index import CITY_INDEX
+from prediction import CRITICAL_SYMPTOMS, RULESET, RuleSet
+
+
+# Matrix columns follow the compiled symptom vocabulary, which starts with
+# SYMPTOM_LIST, so a SYMPTOM_LIST-ordered checkbox grid can be used directly.
+SYMPTOM_COLUMNS = list(RULESET.symptom_bits)
+DISEASE_NAMES = [rule.name for rule in RULESET.rules]
+
+
+def _mask_columns(mask: int, width: int) -> np.ndarray:
+    """Expand an integer symptom mask into a 0/1 column vector."""
+    return np.array([(mask >> i) & 1 for i in range(width)], dtype=np.int32)
+
+
+def compile_batch_rules(ruleset: RuleSet = RULESET) -> dict:
+    """
+    Lay out a compiled rule set as matrices for vectorized scoring.
+
+    Args:
+        ruleset: Compiled rules from prediction.compile_rules
+
+    Returns:
+        Dictionary of NumPy arrays used by predict_disease_batch
+    """
+    width = len(ruleset.symptom_bits)
+    rules = ruleset.rules
+
+    combo_cols, combo_rule, combo_min, combo_bonus = [], [], [], []
+    for idx, rule in enumerate(rules):
+        for combo_mask, min_match, bonus in rule.combos:
+            combo_cols.append(_mask_columns(combo_mask, width))
+            combo_rule.append(idx)
+            combo_min.append(min_match)
+            combo_bonus.append(bonus)
+
+    combos = np.array(combo_cols, dtype=np.int32).reshape(-1, width).T
+    return {
+        "width": width,
+        "rules": rules,
+        "symptoms": np.array([_mask_columns(r.mask, width) for r in rules], dtype=np.int32).reshape(-1, width).T,
+        "requires": np.array([_mask_columns(r.require_mask, width) for r in rules], dtype=np.int32).reshape(-1, width).T,
+        "require_count": np.array([r.require_mask.bit_count() for r in rules], dtype=np.int32),
+        "min_match": np.array([r.min_match for r in rules], dtype=np.int32),
+        "base": np.array([r.base for r in rules], dtype=np.int32),
+        "per_match": np.array([r.per_match for r in rules], dtype=np.int32),
+        "cap": np.array([r.cap for r in rules], dtype=np.int32),
+        "combos": combos,
+        "combo_count": combos.sum(axis=0),
+        "combo_rule": np.array(combo_rule, dtype=np.intp),
+        "combo_min": np.array(combo_min, dtype=np.int32),
+        "combo_bonus": np.array(combo_bonus, dtype=np.int32)
+    }
+
+
+BATCH_RULES = compile_batch_rules()
+
+
+def symptom_matrix(symptom_lists: list) -> np.ndarray:
+    """
+    Encode per-patient symptom lists as a patient × symptom matrix.
+
+    Args:
+        symptom_lists: One list of symptom strings per patient
+
+    Returns:
+        Boolean array of shape (patients, len(SYMPTOM_COLUMNS))
+    """
+    bits = RULESET.symptom_bits
+    matrix = np.zeros((len(symptom_lists), len(bits)), dtype=bool)
+    for row, symptoms in enumerate(symptom_lists):
+        for s in symptoms:
+            col = bits.get(s.lower())
+            if col is not None:
+                matrix[row, col] = True
+    return matrix
+
+
+def _city_codes(cities, n: int) -> tuple:
+    """Return (unique city names, per-patient index into them)."""
+    if isinstance(cities, str):
+        return [cities], np.zeros(n, dtype=np.intp)
+    names, codes = np.unique(np.asarray(cities, dtype=str), return_inverse=True)
+    return list(names), codes
+
+
+def _as_matrix(symptoms, width: int) -> np.ndarray:
+    matrix = np.asarray(symptoms, dtype=np.int32)
+    if matrix.ndim != 2 or matrix.shape[1] > width:
+        raise ValueError(f"symptom matrix must be 2-D with at most {width} columns")
+    if matrix.shape[1] < width:
+        matrix = np.pad(matrix, ((0, 0), (0, width - matrix.shape[1])))
+    return matrix
+
+
+def predict_disease_batch(symptoms, cities, ages, rules: dict = BATCH_RULES) -> np.ndarray:
+    """
+    Vectorized predict_disease over many patients.
+
+    Args:
+        symptoms: Patient × symptom 0/1 matrix (columns in SYMPTOM_COLUMNS order)
+        cities: One city for everyone, or a city per patient
+        ages: Patient ages
+        rules: Rule matrices from compile_batch_rules
+
+    Returns:
+        Integer array of shape (patients, len(DISEASE_NAMES)); 0 means the
+        disease was not predicted for that patient
+    """
+    matrix = _as_matrix(symptoms, rules["width"])
+    ages = np.asarray(ages)
+    n = matrix.shape[0]
+
+    match = matrix @ rules["symptoms"]
+    fired = (match >= rules["min_match"]) & (matrix @ rules["requires"] >= rules["require_count"])
+    prob = rules["base"] + rules["per_match"] * match
+
+    # Combination bonuses, scattered back onto their rules
+    if len(rules["combo_rule"]):
+        present = (matrix @ rules["combos"] >= rules["combo_count"]) & (
+            match[:, rules["combo_rule"]] >= rules["combo_min"]
+        )
+        bonus = np.zeros_like(prob)
+        np.add.at(bonus.T, rules["combo_rule"], (present * rules["combo_bonus"]).T)
+        prob += bonus
+
+    # City outbreak bonuses, looked up once per distinct city
+    names, codes = _city_codes(cities, n)
+    city_bonus = np.zeros((len(names), len(rules["rules"])), dtype=np.int32)
+    for c, city in enumerate(names):
+        city_risk = CITY_INDEX.risk_levels(city)
+        for idx, rule in enumerate(rules["rules"]):
+            if rule.city_bonus:
+                city_bonus[c, idx] = rule.city_bonus.get(city_risk.get(rule.city_disease), 0)
+    prob += city_bonus[codes]
+
+    # Age modifiers (first match wins)
+    for idx, rule in enumerate(rules["rules"]):
+        if not rule.age:
+            continue
+        conditions = [
+            ((ages > over) if over is not None else False) | ((ages < under) if under is not None else False)
+            for over, under, _ in rule.age
+        ]
+        prob[:, idx] += np.select(conditions, [bonus for _, _, bonus in rule.age], 0)
+
+    return np.where(fired, np.minimum(prob, rules["cap"]), 0)
+
+
+def top_predictions(probabilities: np.ndarray) -> tuple:
+    """
+    Pick each patient's top disease, breaking ties by rule order like predict_disease.
+
+    Args:
+        probabilities: Output of predict_disease_batch
+
+    Returns:
+        (top disease index array, top probability array); index is -1 when
+        nothing was predicted
+    """
+    top = probabilities.argmax(axis=1)
+    top_prob = probabilities[np.arange(len(top)), top] if len(top) else np.zeros(0, dtype=probabilities.dtype)
+    return np.where(top_prob > 0, top, -1), top_prob
+
+
+def calculate_risk_score_batch(
+    symptoms,
+    ages,
+    bp_systolic,
+    bp_diastolic,
+    pulse,
+    cities,
+    probabilities: np.ndarray
+) -> dict:
+    """
+    Vectorized calculate_risk_score over many patients.
+
+    Args:
+        symptoms: Patient × symptom 0/1 matrix (columns in SYMPTOM_COLUMNS order)
+        ages: Patient ages
+        bp_systolic: Systolic blood pressures (0 = not recorded)
+        bp_diastolic: Diastolic blood pressures (0 = not recorded)
+        pulse: Heart rates (0 = not recorded)
+        cities: One city for everyone, or a city per patient
+        probabilities: Output of predict_disease_batch
+
+    Returns:
+        Dictionary with "score" (int array) and "category" (str array).
+        The symptom count is the number of distinct symptoms in each row.
+    """
+    matrix = _as_matrix(symptoms, BATCH_RULES["width"])
+    ages = np.asarray(ages)
+    sys_bp = np.asarray(bp_systolic)
+    dia_bp = np.asarray(bp_diastolic)
+    pulse = np.asarray(pulse)
+    n = matrix.shape[0]
+
+    # ========== AGE FACTOR ==========
+    score = np.select(
+        [ages >= 75, ages >= 65, ages >= 55, ages <= 2, ages <= 5],
+        [35, 25, 15, 30, 20],
+        0
+    )
+
+    # ========== SYMPTOM COUNT ==========
+    count = matrix.sum(axis=1)
+    score += np.select([count >= 6, count >= 4, count >= 2], [30, 20, 10], 0)
+
+    # ========== CRITICAL SYMPTOMS ==========
+    weights = np.zeros(BATCH_RULES["width"], dtype=np.int32)
+    for symptom, points in CRITICAL_SYMPTOMS.items():
+        col = RULESET.symptom_bits.get(symptom)
+        if col is not None:
+            weights[col] = points
+    score += matrix @ weights
+
+    # ========== VITAL SIGNS ==========
+    has_bp = (sys_bp > 0) & (dia_bp > 0)
+    score += np.select(
+        [
+            has_bp & ((sys_bp >= 180) | (dia_bp >= 120)),
+            has_bp & ((sys_bp >= 140) | (dia_bp >= 90)),
+            has_bp & ((sys_bp < 90) | (dia_bp < 60))
+        ],
+        [35, 18, 22],
+        0
+    )
+    has_pulse = pulse > 0
+    score += np.select(
+        [has_pulse & (pulse > 120), has_pulse & (pulse > 100), has_pulse & (pulse < 50)],
+        [18, 10, 18],
+        0
+    )
+
+    # ========== CITY OUTBREAK FACTOR ==========
+    names, codes = _city_codes(cities, n)
+    high_counts = np.array([CITY_INDEX.high_risk_count(city) for city in names], dtype=np.int32)[codes]
+    score += np.select([high_counts >= 4, high_counts >= 2, high_counts >= 1], [20, 12, 6], 0)
+
+    # ========== DISEASE PREDICTION SEVERITY ==========
+    _, top_prob = top_predictions(np.asarray(probabilities))
+    score += np.select([top_prob >= 85, top_prob >= 70, top_prob >= 55], [25, 15, 8], 0)
+
+    # ========== CALCULATE FINAL CATEGORY ==========
+    score = np.minimum(score, 100)
+    category = np.select([score >= 70, score >= 40], ["HIGH", "MEDIUM"], "LOW")
+
+    return {
+        "score": score,
+        "category": category
+    }
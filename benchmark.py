@@ -0,0 +1,292 @@
+"""
+⏱️ Benchmark Suite
+Synthetic patient/transcript workloads, latency percentiles and regression gating
+
+Usage:
+    python benchmark.py --save baseline.json
+    python benchmark.py --compare baseline.json --threshold 0.15
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from data import CITY_DISEASE_DATA, SYMPTOM_LIST, VOICE_PATTERNS
+from prediction import (
+    calculate_risk_score,
+    generate_patient_summary,
+    parse_voice_input,
+    predict_disease
+)
+
+
+# ============================================================
+# 🧪 SYNTHETIC WORKLOADS
+# ============================================================
+
+NAMES = ["Ramesh", "Sita", "Arjun", "Priya", "Mohan", "Kavita", "Imran", "Neha", "Suresh", "Anita"]
+
+# Connective words per language so transcripts read like real dictation
+FILLER = {
+    "english": ["has", "and", "since", "two", "days", "also", "complains", "of", "mild", "severe"],
+    "hindi": ["को", "और", "से", "है", "दिन", "भी", "बहुत", "हल्का"],
+    "gujarati": ["ને", "અને", "થી", "છે", "દિવસ", "પણ", "ખૂબ"]
+}
+
+
+def make_patients(n: int, seed: int = 0) -> list:
+    """
+    Generate synthetic patient records with vitals.
+
+    Args:
+        n: Number of patients
+        seed: Random seed
+
+    Returns:
+        List of patient dicts shaped like the app's patient_data
+    """
+    rng = random.Random(seed)
+    cities = list(CITY_DISEASE_DATA)
+    patients = []
+    for i in range(n):
+        # Most visits report 2-4 symptoms; a few report many
+        count = min(len(SYMPTOM_LIST), max(1, int(rng.expovariate(1 / 3)) + 1))
+        age = rng.choice([rng.randint(0, 5), rng.randint(6, 54), rng.randint(55, 90)])
+        systolic = int(rng.gauss(128, 22))
+        diastolic = int(rng.gauss(82, 12))
+        patients.append({
+            "name": rng.choice(NAMES),
+            "age": age,
+            "gender": rng.choice("MF"),
+            "city": rng.choice(cities),
+            "symptoms": rng.sample(SYMPTOM_LIST, count),
+            "bp_systolic": systolic,
+            "bp_diastolic": diastolic,
+            "bp": f"{systolic}/{diastolic}",
+            "pulse": int(rng.gauss(88, 18)),
+            "timestamp": f"2024-01-{i % 28 + 1:02d} 10:00"
+        })
+    return patients
+
+
+def make_transcripts(n: int, seed: int = 0, min_words: int = 8, max_words: int = 60) -> list:
+    """
+    Generate mixed-language voice transcripts of varying length.
+
+    Args:
+        n: Number of transcripts
+        seed: Random seed
+        min_words: Shortest transcript, in words
+        max_words: Longest transcript, in words
+
+    Returns:
+        List of transcript strings
+    """
+    rng = random.Random(seed)
+    keywords = {lang: list(p["symptoms"]) for lang, p in VOICE_PATTERNS.items()}
+    languages = list(keywords)
+    transcripts = []
+    for _ in range(n):
+        words = [f"patient {rng.choice(NAMES)}", f"age {rng.randint(1, 90)}", rng.choice(["male", "female"])]
+        target = rng.randint(min_words, max_words)
+        while len(words) < target:
+            lang = rng.choice(languages)
+            words.append(rng.choice(keywords[lang]) if rng.random() < 0.35 else rng.choice(FILLER[lang]))
+        if rng.random() < 0.7:
+            words.append(f"bp {rng.randint(90, 190)}/{rng.randint(55, 125)}")
+        transcripts.append(" ".join(words))
+    return transcripts
+
+
+# ============================================================
+# 📏 MEASUREMENT
+# ============================================================
+
+def _percentile(sorted_values: list, pct: float) -> float:
+    idx = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+def measure(fn, inputs: list, repeat: int = 3) -> dict:
+    """
+    Time fn over every input, keeping the best of `repeat` passes.
+
+    Args:
+        fn: Callable taking one input
+        inputs: Workload items
+        repeat: Number of passes (the fastest pass is reported)
+
+    Returns:
+        Dictionary with throughput (calls/s) and p50/p90/p99 latency (µs)
+    """
+    best = None
+    for _ in range(repeat):
+        latencies = []
+        start = time.perf_counter()
+        for item in inputs:
+            t0 = time.perf_counter_ns()
+            fn(item)
+            latencies.append(time.perf_counter_ns() - t0)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best[0]:
+            best = (elapsed, latencies)
+
+    elapsed, latencies = best
+    latencies.sort()
+    return {
+        "calls": len(inputs),
+        "throughput": round(len(inputs) / elapsed, 1),
+        "p50_us": round(_percentile(latencies, 50) / 1000, 2),
+        "p90_us": round(_percentile(latencies, 90) / 1000, 2),
+        "p99_us": round(_percentile(latencies, 99) / 1000, 2)
+    }
+
+
+def _end_to_end(text: str) -> str:
+    patient = parse_voice_input(text)
+    patient.update({"city": "Ahmedabad", "pulse": 0, "timestamp": "N/A"})
+    predictions = predict_disease(patient["symptoms"], "Ahmedabad", patient["age"])
+    risk = calculate_risk_score(patient["symptoms"], patient["age"], 0, 0, 0, "Ahmedabad", predictions)
+    return generate_patient_summary(patient, predictions, risk)
+
+
+def run_benchmarks(n: int = 5000, seed: int = 0, repeat: int = 3) -> dict:
+    """
+    Run every hot-path benchmark on a fresh synthetic workload.
+
+    Args:
+        n: Workload size per benchmark
+        seed: Random seed for the workloads
+        repeat: Timing passes per benchmark
+
+    Returns:
+        Dictionary of {benchmark name: measurement}
+    """
+    patients = make_patients(n, seed)
+    transcripts = make_transcripts(n, seed)
+    scored = []
+    for p in patients:
+        predictions = predict_disease(p["symptoms"], p["city"], p["age"])
+        risk = calculate_risk_score(
+            p["symptoms"], p["age"], p["bp_systolic"], p["bp_diastolic"], p["pulse"], p["city"], predictions
+        )
+        scored.append((p, predictions, risk))
+
+    return {
+        "predict_disease": measure(
+            lambda p: predict_disease(p["symptoms"], p["city"], p["age"]), patients, repeat
+        ),
+        "calculate_risk_score": measure(
+            lambda s: calculate_risk_score(
+                s[0]["symptoms"], s[0]["age"], s[0]["bp_systolic"], s[0]["bp_diastolic"],
+                s[0]["pulse"], s[0]["city"], s[1]
+            ),
+            scored,
+            repeat
+        ),
+        "parse_voice_input": measure(parse_voice_input, transcripts, repeat),
+        "generate_patient_summary": measure(lambda s: generate_patient_summary(*s), scored, repeat),
+        "end_to_end": measure(_end_to_end, transcripts, repeat)
+    }
+
+
+# ============================================================
+# 🚦 BASELINES & REGRESSION GATING
+# ============================================================
+
+# Meta keys that define the workload; a baseline measured on another one is not comparable
+WORKLOAD_KEYS = ("n", "seed")
+
+
+def run_meta(n: int, seed: int) -> dict:
+    """Parameters and environment of a run, as stored with a baseline."""
+    return {"n": n, "seed": seed, "python": platform.python_version(), "machine": platform.machine()}
+
+
+def meta_mismatches(baseline_meta: dict, current_meta: dict) -> list:
+    """
+    Run parameters that differ between a baseline and the current run.
+
+    Returns:
+        List of (key, baseline value, current value)
+    """
+    return [
+        (key, baseline_meta.get(key), value)
+        for key, value in current_meta.items()
+        if baseline_meta.get(key) != value
+    ]
+
+
+def save_baseline(results: dict, path: str, n: int, seed: int):
+    """Write results plus the run parameters as a JSON baseline."""
+    payload = {"meta": run_meta(n, seed), "results": results}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+
+
+def compare(results: dict, baseline: dict, threshold: float = 0.10, metric: str = "p50_us") -> list:
+    """
+    Find benchmarks that got slower than the baseline by more than threshold.
+
+    Args:
+        results: Current measurements
+        baseline: Measurements from a saved baseline
+        threshold: Allowed relative slowdown (0.10 = 10%)
+        metric: Latency metric to gate on
+
+    Returns:
+        List of (benchmark, baseline value, current value, relative change)
+    """
+    regressions = []
+    for name, current in results.items():
+        before = baseline.get(name)
+        if not before or not before.get(metric):
+            continue
+        change = current[metric] / before[metric] - 1
+        if change > threshold:
+            regressions.append((name, before[metric], current[metric], change))
+    return regressions
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the prediction hot paths")
+    parser.add_argument("-n", type=int, default=5000, help="workload size per benchmark")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save", metavar="PATH", help="write results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="fail if slower than this baseline")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown, e.g. 0.10 for 10%%")
+    parser.add_argument("--metric", default="p50_us", choices=["p50_us", "p90_us", "p99_us"])
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.n, args.seed, args.repeat)
+    print(f"{'benchmark':<26}{'calls/s':>12}{'p50 µs':>10}{'p90 µs':>10}{'p99 µs':>10}")
+    for name, r in results.items():
+        print(f"{name:<26}{r['throughput']:>12,.0f}{r['p50_us']:>10}{r['p90_us']:>10}{r['p99_us']:>10}")
+
+    if args.save:
+        save_baseline(results, args.save, args.n, args.seed)
+        print(f"Saved baseline to {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            saved = json.load(f)
+        mismatches = meta_mismatches(saved.get("meta", {}), run_meta(args.n, args.seed))
+        for key, before, now in mismatches:
+            print(f"WARNING baseline {key}={before!r}, this run {key}={now!r}")
+        if any(key in WORKLOAD_KEYS for key, _, _ in mismatches):
+            print("Baseline was measured on a different workload; rerun with its -n and --seed")
+            return 2
+        regressions = compare(results, saved["results"], args.threshold, args.metric)
+        for name, before, after, change in regressions:
+            print(f"REGRESSION {name}: {args.metric} {before} -> {after} (+{change:.0%})")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} on {args.metric}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,6 @@
+def bp_risk(s, d):
+    if s > 0 and d > 0:
+        if s >= 170 or d >= 110: return 35, ("crisis",)
+        if s >= 130 or d >= 80: return 18, ("high",)
+        if s < 90 or d < 60: return 22, ("low",)
+    return 0, ()
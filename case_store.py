@@ -0,0 +1,309 @@
+"""
+📅 Weekly Case Store
+Columnar city × disease × week case counts with vectorized trends and risk
+"""
+
+import json
+import re
+import numpy as np
+from city_index import CITY_INDEX
+from data import CITY_DISEASE_DATA
+
+
+# ========== FILE FORMAT ==========
+# MAGIC | uint32 header length | JSON header | padding to 64 bytes | float32 data
+# Data shape is (cities, diseases, weeks); NaN marks a week with no report.
+
+MAGIC = b"HMCASES\x00"
+_ALIGN = 64
+
+RISK_LEVELS = ["LOW", "MEDIUM", "HIGH"]
+
+# (level, minimum weekly trend %, minimum current cases): a disease reaches a
+# level when either bound is met. These reproduce every hand-entered risk in
+# CITY_DISEASE_DATA from its current count and trend, and from its
+# weekly_cases when the trend spans TREND_WEEKS weeks (the hand-entered
+# trends track the two-week change; the last week alone understates them).
+RISK_THRESHOLDS = (("HIGH", 25.0, 175), ("MEDIUM", 10.0, 50))
+TREND_WEEKS = 2
+
+_WEEK_LABEL = re.compile(r"Week\s+(\d+)$")
+
+
+def week_number(label: str) -> int:
+    """Parse a "Week N" label."""
+    match = _WEEK_LABEL.match(label.strip())
+    if not match:
+        raise ValueError(f"not a week label: {label!r}")
+    return int(match.group(1))
+
+
+def format_trend(percent: float) -> str:
+    """Render a trend percentage the way CITY_DISEASE_DATA writes it ("+40%", "0%", "-10%")."""
+    value = int(round(percent))
+    return f"{value:+d}%" if value else "0%"
+
+
+def risk_level(current: float, trend: float, thresholds: tuple = RISK_THRESHOLDS) -> str:
+    """Risk level for one disease from its current count and trend %."""
+    for level, min_trend, min_cases in thresholds:
+        if trend >= min_trend or current >= min_cases:
+            return level
+    return "LOW"
+
+
+class CaseStore:
+    """
+    Weekly case counts for every city and disease in one float32 array.
+
+    Rows are cities, columns diseases and the last axis consecutive weeks
+    starting at `first_week`. All derived values (current, trend, growth,
+    moving averages, risk) are computed for the whole grid at once, so a
+    dashboard query over hundreds of cities and years of weeks is a few
+    array operations.
+
+    `counts` is a view into a larger buffer, so append_week() only copies
+    when the buffer runs out of room, and then doubles it. A store opened
+    with load() is moved into memory by its first append (the file is left
+    as it was); save() it again to keep the new weeks.
+    """
+
+    def __init__(self, cities: list, diseases: list, counts: np.ndarray, first_week: int = 1):
+        self.cities = list(cities)
+        self.diseases = list(diseases)
+        self.counts = counts
+        self._buffer = counts   # counts is always self._buffer[:cities, :diseases, :weeks]
+        self.first_week = first_week
+        self.city_codes = {name: i for i, name in enumerate(self.cities)}
+        self.disease_codes = {name: i for i, name in enumerate(self.diseases)}
+
+    @classmethod
+    def from_city_data(cls, city_data: dict = CITY_DISEASE_DATA) -> "CaseStore":
+        """
+        Build a store from the nested "weekly_cases" dicts.
+
+        Args:
+            city_data: Dictionary shaped like CITY_DISEASE_DATA
+
+        Returns:
+            CaseStore covering every city, disease and week that appears
+        """
+        cities = list(city_data)
+        diseases, weeks = [], set()
+        for entry in city_data.values():
+            for label, cases in entry.get("weekly_cases", {}).items():
+                weeks.add(week_number(label))
+                diseases.extend(d for d in cases if d not in diseases)
+        first = min(weeks, default=1)
+        counts = np.full((len(cities), len(diseases), max(weeks, default=0) - first + 1), np.nan, dtype=np.float32)
+        for c, entry in enumerate(city_data.values()):
+            for label, cases in entry.get("weekly_cases", {}).items():
+                w = week_number(label) - first
+                for disease, n in cases.items():
+                    counts[c, diseases.index(disease), w] = n
+        return cls(cities, diseases, counts, first)
+
+    @property
+    def weeks(self) -> int:
+        return self.counts.shape[2]
+
+    @property
+    def last_week(self) -> int:
+        return self.first_week + self.weeks - 1
+
+    def append_week(self, cases: dict) -> int:
+        """
+        Add the next week's counts.
+
+        Args:
+            cases: {city: {disease: count}}; new cities/diseases are added,
+                anything missing is recorded as not reported
+
+        Returns:
+            The new week's number (amortized O(1) copies per append)
+        """
+        for city, diseases in cases.items():
+            if city not in self.city_codes:
+                self.city_codes[city] = len(self.cities)
+                self.cities.append(city)
+            for disease in diseases:
+                if disease not in self.disease_codes:
+                    self.disease_codes[disease] = len(self.diseases)
+                    self.diseases.append(disease)
+        c, d, w = self.counts.shape
+        needed = (len(self.cities), len(self.diseases), w + 1)
+        if any(n > room for n, room in zip(needed, self._buffer.shape)):
+            shape = tuple(max(n, 2 * room) if n > room else room for n, room in zip(needed, self._buffer.shape))
+            grown = np.full(shape, np.nan, dtype=np.float32)
+            grown[:c, :d, :w] = self.counts
+            self._buffer = grown
+        self.counts = self._buffer[:needed[0], :needed[1], :needed[2]]
+        for city, diseases in cases.items():
+            for disease, n in diseases.items():
+                self.counts[self.city_codes[city], self.disease_codes[disease], w] = n
+        return self.last_week
+
+    def series(self, city: str, disease: str) -> np.ndarray:
+        """Weekly counts for one city and disease (NaN = not reported)."""
+        return self.counts[self.city_codes[city], self.disease_codes[disease]]
+
+    def weekly_cases(self, city: str) -> dict:
+        """One city's counts in the {"Week N": {disease: count}} shape."""
+        rows = self.counts[self.city_codes[city]]
+        return {
+            f"Week {self.first_week + w}": {
+                disease: int(rows[d, w]) for d, disease in enumerate(self.diseases) if not np.isnan(rows[d, w])
+            }
+            for w in range(self.weeks)
+        }
+
+    # ---------- derived values ----------
+
+    def current(self) -> np.ndarray:
+        """Cities × diseases counts for the latest week."""
+        return self.counts[:, :, -1]
+
+    def trend(self, weeks: int = 1) -> np.ndarray:
+        """
+        Percent change of the latest week over `weeks` weeks earlier.
+
+        Returns:
+            Cities × diseases array; NaN where either week is missing or zero
+        """
+        if self.weeks <= weeks:
+            return np.full(self.counts.shape[:2], np.nan, dtype=np.float32)
+        before = self.counts[:, :, -1 - weeks]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            change = (self.counts[:, :, -1] - before) / before * 100
+        return np.where(before > 0, change, np.nan)
+
+    def growth_rate(self, weeks: int = 4) -> np.ndarray:
+        """
+        Compound weekly growth over the last `weeks` intervals (0.1 = +10%/week).
+
+        Returns:
+            Cities × diseases array; NaN where the span is missing or zero
+        """
+        weeks = min(weeks, self.weeks - 1)
+        if weeks < 1:
+            return np.full(self.counts.shape[:2], np.nan, dtype=np.float32)
+        start = self.counts[:, :, -1 - weeks]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rate = (self.counts[:, :, -1] / start) ** (1 / weeks) - 1
+        return np.where(start > 0, rate, np.nan)
+
+    def moving_average(self, window: int = 4) -> np.ndarray:
+        """
+        Trailing mean over `window` weeks, ignoring unreported weeks.
+
+        Returns:
+            Cities × diseases × (weeks - window + 1) array; NaN where a
+            window has no reports
+        """
+        reported = ~np.isnan(self.counts)
+        zero = np.zeros(self.counts.shape[:2] + (1,))
+        sums = np.concatenate([zero, np.cumsum(np.where(reported, self.counts, 0), axis=2)], axis=2)
+        seen = np.concatenate([zero, np.cumsum(reported, axis=2)], axis=2)
+        totals = sums[:, :, window:] - sums[:, :, :-window]
+        counts = seen[:, :, window:] - seen[:, :, :-window]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(counts > 0, totals / counts, np.nan)
+
+    def risk_codes(self, weeks: int = TREND_WEEKS, thresholds: tuple = RISK_THRESHOLDS) -> np.ndarray:
+        """
+        Risk level per city and disease as indices into RISK_LEVELS.
+
+        Args:
+            weeks: Trend span passed to trend()
+            thresholds: (level, min trend %, min current cases) from highest down
+
+        Returns:
+            Cities × diseases int8 array (-1 where the latest week is missing)
+        """
+        current = self.current()
+        trend = np.nan_to_num(self.trend(weeks), nan=0.0)
+        codes = np.zeros(current.shape, dtype=np.int8)
+        for level, min_trend, min_cases in reversed(thresholds):
+            hit = (trend >= min_trend) | (current >= min_cases)
+            codes[hit] = RISK_LEVELS.index(level)
+        codes[np.isnan(current)] = -1
+        return codes
+
+    def summary(self, weeks: int = TREND_WEEKS, thresholds: tuple = RISK_THRESHOLDS) -> dict:
+        """
+        Derived current/trend/risk in the CITY_DISEASE_DATA "diseases" shape.
+
+        Diseases without a report in the latest week are left out.
+
+        Returns:
+            {city: {disease: {"current", "trend", "risk"}}}
+        """
+        current = self.current()
+        trend = np.nan_to_num(self.trend(weeks), nan=0.0)
+        codes = self.risk_codes(weeks, thresholds)
+        result = {}
+        for c, city in enumerate(self.cities):
+            result[city] = {
+                disease: {
+                    "current": int(current[c, d]),
+                    "trend": format_trend(float(trend[c, d])),
+                    "risk": RISK_LEVELS[codes[c, d]]
+                }
+                for d, disease in enumerate(self.diseases) if codes[c, d] >= 0
+            }
+        return result
+
+    def publish(self, index=CITY_INDEX, weeks: int = TREND_WEEKS, thresholds: tuple = RISK_THRESHOLDS) -> int:
+        """
+        Push the derived current/trend/risk into a CityRiskIndex.
+
+        Returns:
+            The index version after the last city update
+        """
+        version = index.version
+        for city, diseases in self.summary(weeks, thresholds).items():
+            if diseases:
+                version = index.update_city(city, diseases)
+        return version
+
+    # ---------- persistence ----------
+
+    def save(self, path: str) -> dict:
+        """Write the store to a file that load() can memory-map."""
+        header = {
+            "cities": self.cities,
+            "diseases": self.diseases,
+            "first_week": self.first_week,
+            "shape": list(self.counts.shape)
+        }
+        encoded = json.dumps(header).encode()
+        prefix = len(MAGIC) + 4 + len(encoded)
+        with open(path, "wb") as f:
+            f.write(MAGIC)
+            f.write(len(encoded).to_bytes(4, "little"))
+            f.write(encoded)
+            f.write(b"\0" * (-prefix % _ALIGN))
+            f.write(np.ascontiguousarray(self.counts, dtype=np.float32).tobytes())
+        return header
+
+    @classmethod
+    def load(cls, path: str, mode: str = "r") -> "CaseStore":
+        """
+        Memory-map a saved store.
+
+        Args:
+            path: File written by save()
+            mode: np.memmap mode; "r+" writes edits back to the file
+
+        Returns:
+            CaseStore backed by the mapped file
+        """
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a case store")
+            size = int.from_bytes(f.read(4), "little")
+            header = json.loads(f.read(size))
+        prefix = len(MAGIC) + 4 + size
+        offset = prefix + (-prefix % _ALIGN)
+        counts = np.memmap(path, dtype=np.float32, mode=mode, offset=offset, shape=tuple(header["shape"]))
+        return cls(header["cities"], header["diseases"], counts, header["first_week"])
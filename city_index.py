@@ -0,0 +1,152 @@
+"""
+🌆 City Risk Index
+Precomputed outbreak lookups over CITY_DISEASE_DATA with versioned live updates
+"""
+
+import threading
+from typing import NamedTuple
+from data import CITY_DISEASE_DATA
+
+
+class CityRisk(NamedTuple):
+    risk: dict          # disease -> "HIGH" / "MEDIUM" / "LOW"
+    high_count: int     # number of diseases at HIGH risk
+    version: int        # index version at which this city was last rebuilt
+
+
+_EMPTY = CityRisk({}, 0, 0)
+
+
+class CityRiskIndex:
+    """
+    Flat per-city lookups derived from the nested city disease data.
+
+    Scoring reads `risk_levels()` and `high_risk_count()` instead of walking
+    the raw dicts per patient. Surveillance updates go through `update()`,
+    which writes the raw data, rebuilds only that city and bumps `version`.
+
+    Names that are not exact city keys go to `locator` (set by the
+    locality index), which resolves aliases and qualified wards to
+    an entry, or returns None for unknown places.
+    """
+
+    def __init__(self, city_data: dict = CITY_DISEASE_DATA):
+        self.city_data = city_data
+        self.version = 0
+        self.locator = None
+        self._lock = threading.Lock()
+        self._cities = {}
+        self._listeners = []
+        for city in city_data:
+            self._rebuild(city)
+
+    def _rebuild(self, city: str):
+        diseases = self.city_data.get(city, {}).get("diseases", {})
+        risk = {name: d.get("risk") for name, d in diseases.items()}
+        high_count = sum(1 for level in risk.values() if level == "HIGH")
+        old = self._cities.get(city, _EMPTY)
+        # Swap in a whole new entry so readers never see a half-built city
+        self._cities[city] = CityRisk(risk, high_count, self.version)
+        for listener in self._listeners:
+            listener(city, old.risk, risk)
+
+    def _locate(self, name: str) -> CityRisk:
+        if self.locator is None:
+            return _EMPTY
+        return self.locator(name) or _EMPTY
+
+    def exact(self, city: str) -> CityRisk:
+        """Return the entry for an exact city key, or None (no locator fallback)."""
+        return self._cities.get(city)
+
+    def get(self, city: str) -> CityRisk:
+        """Return the precomputed entry for a city (empty if unknown)."""
+        entry = self._cities.get(city)
+        return entry if entry is not None else self._locate(city)
+
+    def risk_levels(self, city: str) -> dict:
+        """Return {disease: risk level} for a city."""
+        entry = self._cities.get(city)
+        return (entry if entry is not None else self._locate(city)).risk
+
+    def high_risk_count(self, city: str) -> int:
+        """Return how many of a city's diseases are at HIGH risk."""
+        entry = self._cities.get(city)
+        return (entry if entry is not None else self._locate(city)).high_count
+
+    def subscribe(self, listener):
+        """Call listener(city, old risk levels, new risk levels) after every city rebuild."""
+        self._listeners.append(listener)
+
+    def touch(self) -> int:
+        """Bump the version after data that lookups depend on changed outside the index."""
+        with self._lock:
+            self.version += 1
+            return self.version
+
+    def update(self, city: str, disease: str, risk: str = None, current: int = None, trend: str = None) -> int:
+        """
+        Apply a surveillance update for one disease in one city.
+
+        Args:
+            city: City name (created if new)
+            disease: Disease name as used in CITY_DISEASE_DATA
+            risk: New risk level, if changed
+            current: New current case count, if changed
+            trend: New trend string, if changed
+
+        Returns:
+            The new index version
+        """
+        return self.update_city(city, {disease: {"risk": risk, "current": current, "trend": trend}})
+
+    def update_city(self, city: str, diseases: dict) -> int:
+        """
+        Apply several disease updates for one city with a single rebuild.
+
+        Args:
+            city: City name (created if new)
+            diseases: {disease: {"risk"/"current"/"trend": value}}; None
+                values are left unchanged
+
+        Returns:
+            The new index version
+        """
+        with self._lock:
+            entry = self.city_data.setdefault(city, {"diseases": {}, "weekly_cases": {}, "alert": ""})
+            city_diseases = entry.setdefault("diseases", {})
+            for disease, fields in diseases.items():
+                record = city_diseases.setdefault(disease, {"current": 0, "trend": "0%", "risk": "LOW"})
+                record.update({key: value for key, value in fields.items() if value is not None})
+            self.version += 1
+            self._rebuild(city)
+            return self.version
+
+    def refresh(self, city: str = None) -> int:
+        """
+        Rebuild after CITY_DISEASE_DATA was edited directly.
+
+        Args:
+            city: City to rebuild, or None for every city
+
+        Returns:
+            The new index version
+        """
+        with self._lock:
+            self.version += 1
+            for name in ([city] if city else list(self.city_data)):
+                self._rebuild(name)
+            return self.version
+
+
+CITY_INDEX = CityRiskIndex()
+
+
+def update_city_disease(city: str, disease: str, risk: str = None, current: int = None, trend: str = None) -> int:
+    """
+    Push a surveillance update into the shared city index.
+
+    Returns:
+        The new index version
+    """
+    return CITY_INDEX.update(city, disease, risk=risk, current=current, trend=trend)
@@ -0,0 +1,378 @@
+"""
+📡 Alert Dispatcher
+Asyncio fan-out of patient alerts to city hospitals through an SMS/WhatsApp gateway
+
+Usage:
+    gateway = FakeGateway()
+    await gateway.start()
+    dispatcher = AlertDispatcher(gateway.url)
+    await dispatcher.start()
+    for record in screen_transcript(chunks, "Ahmedabad"):
+        dispatcher.submit(record)
+    await dispatcher.close()
+"""
+
+import asyncio
+import json
+import random
+from urllib.parse import urlsplit
+from data import HOSPITAL_CONTACTS
+
+
+# ============================================================
+# 🚦 RATE LIMITING
+# ============================================================
+
+class TokenBucket:
+    """Async token bucket: `rate` sends per second with bursts up to `burst`."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = None
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            while True:
+                now = loop.time()
+                if self._updated is not None:
+                    self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+# ============================================================
+# 🔌 KEEP-ALIVE HTTP CLIENT
+# ============================================================
+
+class GatewayError(Exception):
+    """The gateway refused or failed a send (status 0: the response could not be read)."""
+
+    def __init__(self, status: int, body: bytes = b"", reason: str = None):
+        super().__init__(reason or f"gateway returned HTTP {status}")
+        self.status = status
+        self.body = body
+
+
+class HttpPool:
+    """
+    Minimal HTTP/1.1 JSON client keeping up to `size` keep-alive connections.
+    """
+
+    def __init__(self, url: str, size: int = 8, timeout: float = 10.0):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.path = parts.path or "/"
+        self.timeout = timeout
+        self._slots = asyncio.Semaphore(size)
+        self._idle = []
+
+    async def post(self, payload: dict) -> dict:
+        """POST payload as JSON and return the decoded JSON response."""
+        body = json.dumps(payload).encode()
+        async with self._slots:
+            # A pooled connection may have been closed by the server; retry once fresh
+            for fresh in (False, True):
+                if self._idle and not fresh:
+                    reader, writer = self._idle.pop()
+                else:
+                    reader, writer = await asyncio.wait_for(
+                        asyncio.open_connection(self.host, self.port), self.timeout
+                    )
+                try:
+                    status, keep_alive, data = await asyncio.wait_for(
+                        self._exchange(reader, writer, body), self.timeout
+                    )
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    writer.close()
+                    if fresh:
+                        raise
+                    continue
+                except BaseException:
+                    writer.close()
+                    raise
+                if keep_alive:
+                    self._idle.append((reader, writer))
+                else:
+                    writer.close()
+                if status >= 300:
+                    raise GatewayError(status, data)
+                try:
+                    return json.loads(data or b"{}")
+                except ValueError:
+                    # Accepted but unreadable: report it rather than resend a maybe-delivered alert
+                    raise GatewayError(status, data, f"gateway returned HTTP {status} with a non-JSON body") from None
+
+    async def _exchange(self, reader, writer, body: bytes) -> tuple:
+        writer.write(
+            (
+                f"POST {self.path} HTTP/1.1\r\n"
+                f"Host: {self.host}:{self.port}\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: keep-alive\r\n\r\n"
+            ).encode() + body
+        )
+        await writer.drain()
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("connection closed by gateway")
+        parts = status_line.split()
+        if len(parts) < 2 or not parts[1].isdigit():
+            # The request went out, so the alert may have been accepted: never resend it
+            raise GatewayError(0, status_line, f"malformed status line from gateway: {status_line[:80]!r}")
+        status = int(parts[1])
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        length = headers.get("content-length", "0")
+        if not length.isdigit():
+            raise GatewayError(status, b"", f"gateway returned HTTP {status} with a bad Content-Length {length!r}")
+        data = await reader.readexactly(int(length))
+        return status, headers.get("connection", "").lower() != "close", data
+
+    async def close(self):
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+
+# ============================================================
+# 📬 DISPATCHER
+# ============================================================
+
+class AlertDispatcher:
+    """
+    Queues HIGH/MEDIUM alerts and sends them to the city's hospitals.
+
+    HIGH alerts go to every hospital in the patient's city, MEDIUM alerts
+    to the first one listed (the civil hospital). Alerts for the same
+    hospital arriving within `batch_window` seconds are coalesced into one
+    message of at most `max_batch` alerts. Sends are rate limited per
+    gateway and retried with exponential backoff on connection errors,
+    HTTP 429 and 5xx.
+    """
+
+    def __init__(
+        self,
+        gateway_url: str,
+        contacts: dict = HOSPITAL_CONTACTS,
+        categories: tuple = ("HIGH", "MEDIUM"),
+        rate: float = 20.0,
+        burst: int = 20,
+        batch_window: float = 0.5,
+        max_batch: int = 10,
+        max_retries: int = 4,
+        backoff: float = 0.2,
+        pool_size: int = 8
+    ):
+        self.contacts = contacts
+        self.categories = categories
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.client = HttpPool(gateway_url, pool_size)
+        self.limiter = TokenBucket(rate, burst)
+        self.stats = {"queued": 0, "skipped": 0, "messages": 0, "alerts_sent": 0, "retries": 0, "failed": 0}
+        self.failures = []
+        self._queue = asyncio.Queue()
+        self._pending = {}   # phone -> list of (hospital, text)
+        self._timers = {}    # phone -> flush task
+        self._sends = set()
+        self._router = None
+
+    async def start(self):
+        """Start routing queued alerts."""
+        self._router = asyncio.create_task(self._route())
+
+    def submit(self, record: dict) -> bool:
+        """
+        Queue a scored record ({"patient", "risk", "summary"}) for delivery.
+
+        Returns:
+            False if the record's risk category does not alert
+        """
+        if record["risk"]["category"] not in self.categories:
+            self.stats["skipped"] += 1
+            return False
+        self._queue.put_nowait(record)
+        self.stats["queued"] += 1
+        return True
+
+    def _recipients(self, record: dict) -> list:
+        hospitals = list(self.contacts.get(record["patient"].get("city", ""), {}).items())
+        if record["risk"]["category"] == "HIGH":
+            return hospitals
+        return hospitals[:1]
+
+    async def _route(self):
+        while True:
+            record = await self._queue.get()
+            try:
+                for hospital, phone in self._recipients(record):
+                    batch = self._pending.setdefault(phone, [])
+                    batch.append((hospital, record["summary"]))
+                    if len(batch) >= self.max_batch:
+                        self._flush(phone)
+                    elif phone not in self._timers:
+                        self._timers[phone] = asyncio.create_task(self._flush_later(phone))
+            finally:
+                self._queue.task_done()
+
+    async def _flush_later(self, phone: str):
+        await asyncio.sleep(self.batch_window)
+        self._timers.pop(phone, None)
+        self._flush(phone)
+
+    def _flush(self, phone: str):
+        timer = self._timers.pop(phone, None)
+        if timer is not None and timer is not asyncio.current_task():
+            timer.cancel()
+        batch = self._pending.pop(phone, None)
+        if batch:
+            task = asyncio.create_task(self._send(phone, batch))
+            self._sends.add(task)
+            task.add_done_callback(self._sends.discard)
+
+    async def _send(self, phone: str, batch: list):
+        hospital = batch[0][0]
+        if len(batch) == 1:
+            text = batch[0][1]
+        else:
+            text = f"🚨 *{len(batch)} PATIENT ALERTS - {hospital}*\n\n" + "\n\n———\n\n".join(t for _, t in batch)
+        payload = {"to": phone, "text": text, "alerts": len(batch)}
+
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.acquire()
+            try:
+                await self.client.post(payload)
+                self.stats["messages"] += 1
+                self.stats["alerts_sent"] += len(batch)
+                return
+            except GatewayError as exc:
+                # Includes garbled responses (status 0 or a non-JSON 2xx): the
+                # alert may have been delivered, so those are not resent
+                if exc.status != 429 and exc.status < 500:
+                    break
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+                # Connection trouble: retry like a 5xx
+                pass
+            if attempt < self.max_retries:
+                self.stats["retries"] += 1
+                await asyncio.sleep(self.backoff * 2 ** attempt * (0.5 + random.random()))
+        self.stats["failed"] += len(batch)
+        self.failures.append(payload)
+
+    async def drain(self):
+        """Route everything queued, flush every pending batch and wait for the sends."""
+        await self._queue.join()
+        for phone in list(self._pending):
+            self._flush(phone)
+        while self._sends:
+            await asyncio.gather(*list(self._sends), return_exceptions=True)
+
+    async def close(self):
+        """Drain, then stop routing and close pooled connections."""
+        await self.drain()
+        if self._router is not None:
+            self._router.cancel()
+            await asyncio.gather(self._router, return_exceptions=True)
+        await self.client.close()
+
+
+# ============================================================
+# 🧪 LOCAL FAKE GATEWAY
+# ============================================================
+
+class FakeGateway:
+    """
+    Local stand-in for the SMS/WhatsApp gateway, for tests and demos.
+
+    Accepts keep-alive HTTP POSTs of {"to", "text"} JSON, records them in
+    `messages`, and can add latency or fail a fraction of requests with 503.
+    """
+
+    def __init__(self, latency: float = 0.0, fail_rate: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.messages = []
+        self.requests = 0
+        self.connections = 0
+        self._rng = random.Random(seed)
+        self._server = None
+        self._handlers = set()
+        self.url = ""
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0):
+        self._server = await asyncio.start_server(self._handle, host, port)
+        bound = self._server.sockets[0].getsockname()
+        self.url = f"http://{bound[0]}:{bound[1]}/send"
+        return self
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        self._handlers.add(asyncio.current_task())
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                self.requests += 1
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+
+                if self._rng.random() < self.fail_rate:
+                    status, reply = 503, {"error": "unavailable"}
+                else:
+                    status, reply = 200, {"status": "queued", "id": len(self.messages) + 1}
+                    self.messages.append(json.loads(body))
+                data = json.dumps(reply).encode()
+                close = headers.get("connection", "").lower() == "close"
+                writer.write(
+                    (
+                        f"HTTP/1.1 {status} {'OK' if status == 200 else 'Service Unavailable'}\r\n"
+                        "Content-Type: application/json\r\n"
+                        f"Content-Length: {len(data)}\r\n"
+                        f"Connection: {'close' if close else 'keep-alive'}\r\n\r\n"
+                    ).encode() + data
+                )
+                await writer.drain()
+                if close:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            self._handlers.discard(asyncio.current_task())
+            writer.close()
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            for task in list(self._handlers):
+                task.cancel()
+            await asyncio.gather(*self._handlers, return_exceptions=True)
+            await self._server.wait_closed()
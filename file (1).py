@@ -90,6 +90,85 @@ CITY_DISEASE_DATA = {
     }
 }
 
+# ============================================================
+# 🗺️ LOCALITIES
+# ============================================================
+# State -> city -> ward hierarchy with alternative spellings. City names
+# match CITY_DISEASE_DATA keys; wards are {ward: [aliases]}.
+
+LOCALITIES = {
+    "Gujarat": {
+        "aliases": ["GJ"],
+        "cities": {
+            "Ahmedabad": {
+                "aliases": ["Amdavad", "Ahmadabad", "અમદાવાદ", "अहमदाबाद"],
+                "wards": {
+                    "Vastrapur": [],
+                    "Maninagar": [],
+                    "Navrangpura": [],
+                    "Satellite": [],
+                    "Bopal": [],
+                    "Naroda": []
+                }
+            },
+            "Surat": {
+                "aliases": ["સુરત", "सूरत"],
+                "wards": {
+                    "Adajan": [],
+                    "Varachha": ["Varachha Road"],
+                    "Athwa": ["Athwalines"],
+                    "Katargam": []
+                }
+            },
+            "Rajkot": {
+                "aliases": ["રાજકોટ", "राजकोट"],
+                "wards": {
+                    "Raiya": [],
+                    "Mavdi": [],
+                    "Kalawad Road": []
+                }
+            }
+        }
+    },
+    "Maharashtra": {
+        "aliases": ["MH"],
+        "cities": {
+            "Mumbai": {
+                "aliases": ["Bombay", "Mumbai City", "मुंबई"],
+                "wards": {
+                    "Andheri": ["Andheri East", "Andheri West"],
+                    "Bandra": [],
+                    "Dadar": [],
+                    "Kurla": [],
+                    "Worli": []
+                }
+            }
+        }
+    },
+    "Delhi NCT": {
+        "aliases": ["NCT of Delhi", "DL"],
+        "cities": {
+            "Delhi": {
+                "aliases": ["New Delhi", "Dilli", "दिल्ली"],
+                "wards": {
+                    "Dwarka": [],
+                    "Rohini": [],
+                    "Karol Bagh": [],
+                    "Lajpat Nagar": [],
+                    "Saket": []
+                }
+            }
+        }
+    }
+}
+
+# Ward-level risk where it differs from the city picture ({city: {ward: {disease: risk}}})
+WARD_DISEASE_DATA = {
+    "Ahmedabad": {
+        "Vastrapur": {"Dengue": "HIGH"}
+    }
+}
+
 # ============================================================
 # 🩺 SYMPTOM LIST
 # ============================================================
@@ -115,6 +194,97 @@ SYMPTOM_LIST = [
     "Jaundice"
 ]
 
+# ============================================================
+# 🧬 DISEASE RULES
+# ============================================================
+# Each rule fires when at least `min_match` of its symptoms are present
+# (and every symptom in `requires` is). Probability is
+#   base + per_match * matches + combo/city/age bonuses, capped at `cap`.
+# Combos apply when all listed symptoms are present and the rule has at
+# least the combo's `min_match` matches. Only the first matching age
+# modifier applies. Rule order breaks ties between equal probabilities.
+
+DISEASE_RULES = [
+    {
+        "name": "Dengue",
+        "symptoms": ["fever", "rash", "headache", "body pain", "joint pain", "fatigue"],
+        "min_match": 2,
+        "base": 35,
+        "per_match": 12,
+        "combos": [{"all": ["fever", "rash"], "bonus": 15}],
+        "city_disease": "Dengue",
+        "city_bonus": {"HIGH": 20, "MEDIUM": 10},
+        "cap": 95
+    },
+    {
+        "name": "Tuberculosis (TB)",
+        "symptoms": ["cough", "night sweats", "weight loss", "fever", "fatigue", "loss of appetite", "chest pain"],
+        "min_match": 2,
+        "base": 25,
+        "per_match": 10,
+        "combos": [
+            {"all": ["cough"], "bonus": 15},
+            {"all": ["cough"], "min_match": 3, "bonus": 10}
+        ],
+        "age": [{"over": 50, "bonus": 8}],
+        "cap": 90
+    },
+    {
+        "name": "Malaria",
+        "symptoms": ["fever", "cold", "headache", "nausea", "vomiting", "fatigue", "body pain"],
+        "min_match": 2,
+        "requires": ["fever"],
+        "base": 30,
+        "per_match": 10,
+        "combos": [{"all": ["cold", "fever"], "bonus": 15}],
+        "city_disease": "Malaria",
+        "city_bonus": {"HIGH": 15},
+        "cap": 88
+    },
+    {
+        "name": "Typhoid",
+        "symptoms": ["fever", "abdominal pain", "headache", "loss of appetite", "diarrhea", "fatigue"],
+        "min_match": 2,
+        "base": 28,
+        "per_match": 11,
+        "combos": [{"all": ["fever", "abdominal pain"], "bonus": 15}],
+        "city_disease": "Typhoid",
+        "city_bonus": {"HIGH": 18},
+        "cap": 85
+    },
+    {
+        "name": "Viral Flu",
+        "symptoms": ["fever", "cough", "cold", "headache", "body pain", "fatigue", "nausea"],
+        "min_match": 2,
+        "base": 40,
+        "per_match": 8,
+        "combos": [{"all": ["fever", "cough"], "bonus": 10}],
+        "cap": 92
+    },
+    {
+        "name": "Respiratory Infection",
+        "symptoms": ["cough", "breathlessness", "chest pain", "fever", "cold", "fatigue"],
+        "min_match": 2,
+        "base": 30,
+        "per_match": 12,
+        "combos": [
+            {"all": ["breathlessness"], "bonus": 15},
+            {"all": ["chest pain"], "bonus": 12}
+        ],
+        "age": [{"over": 60, "bonus": 15}, {"under": 5, "bonus": 10}],
+        "cap": 90
+    },
+    {
+        "name": "Gastroenteritis",
+        "symptoms": ["nausea", "vomiting", "diarrhea", "abdominal pain", "fever", "loss of appetite"],
+        "min_match": 2,
+        "base": 35,
+        "per_match": 10,
+        "combos": [{"all": ["vomiting", "diarrhea"], "bonus": 15}],
+        "cap": 88
+    }
+]
+
 # ============================================================
 # 🏥 HOSPITAL CONTACTS
 # ============================================================
@@ -207,6 +377,71 @@ VOICE_PATTERNS = {
     }
 }
 
+# Latin-script Hindi/Gujarati and common English variants, for fuzzy matching
+SYMPTOM_SYNONYMS = {
+    "bukhar": "Fever",
+    "bukhaar": "Fever",
+    "taav": "Fever",
+    "tav": "Fever",
+    "jwar": "Fever",
+    "temperature": "Fever",
+    "khansi": "Cough",
+    "khaansi": "Cough",
+    "khasi": "Cough",
+    "coughing": "Cough",
+    "jukam": "Cold",
+    "zukam": "Cold",
+    "sardi": "Cold",
+    "shardi": "Cold",
+    "runny nose": "Cold",
+    "sirdard": "Headache",
+    "sir dard": "Headache",
+    "sar dard": "Headache",
+    "mathu dukhe": "Headache",
+    "matha dukhe": "Headache",
+    "mathano dukhavo": "Headache",
+    "badan dard": "Body Pain",
+    "sharir dukhe": "Body Pain",
+    "body ache": "Body Pain",
+    "daane": "Rash",
+    "chakatte": "Rash",
+    "thakan": "Fatigue",
+    "thakaan": "Fatigue",
+    "thak": "Fatigue",
+    "kamzori": "Fatigue",
+    "weakness": "Fatigue",
+    "ji machlana": "Nausea",
+    "ubkai": "Nausea",
+    "nauseous": "Nausea",
+    "ulti": "Vomiting",
+    "ultee": "Vomiting",
+    "ulati": "Vomiting",
+    "vomited": "Vomiting",
+    "dast": "Diarrhea",
+    "jhada": "Diarrhea",
+    "loose motions": "Diarrhea",
+    "diarrhoea": "Diarrhea",
+    "saans": "Breathlessness",
+    "shwas": "Breathlessness",
+    "short of breath": "Breathlessness",
+    "chhati me dard": "Chest Pain",
+    "chhati dard": "Chest Pain",
+    "jodo ka dard": "Joint Pain",
+    "jod dard": "Joint Pain",
+    "bhookh nahi": "Loss of Appetite",
+    "no appetite": "Loss of Appetite",
+    "raat ko pasina": "Night Sweats",
+    "night sweating": "Night Sweats",
+    "vajan ghatna": "Weight Loss",
+    "wajan kam": "Weight Loss",
+    "pet dard": "Abdominal Pain",
+    "stomach pain": "Abdominal Pain",
+    "stomach ache": "Abdominal Pain",
+    "peeliya": "Jaundice",
+    "piliya": "Jaundice",
+    "kamlo": "Jaundice"
+}
+
 # ============================================================
 # 🎨 THEME COLORS
 # ============================================================
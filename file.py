@@ -3,8 +3,195 @@
 Rule-based system with city trend integration
 """
 
-import re
-from data import CITY_DISEASE_DATA, VOICE_PATTERNS
+from typing import NamedTuple
+import metrics
+from city_index import CITY_INDEX
+from data import DISEASE_RULES, SYMPTOM_LIST
+from fuzzy import FUZZY_INDEX
+from locality import LOCALITY_INDEX  # noqa: F401  (resolves aliases and wards in CITY_INDEX)
+from render import RENDERERS
+from voice import VOICE_PARSER
+
+
+# ========== COMPILED RULE ENGINE ==========
+# DISEASE_RULES is compiled once at import into integer symptom bitmasks.
+# Bit i of a patient mask is set when symptom i of the vocabulary is present;
+# the vocabulary starts with SYMPTOM_LIST so masks line up with its indices.
+
+class CompiledRule(NamedTuple):
+    name: str
+    mask: int
+    require_mask: int
+    min_match: int
+    base: int
+    per_match: int
+    combos: tuple
+    city_disease: str
+    city_bonus: dict
+    age: tuple
+    cap: int
+
+
+class RuleSet(NamedTuple):
+    rules: tuple
+    symptom_bits: dict
+    rules_by_bit: tuple
+    always: int
+
+
+def compile_rules(rules: list, symptom_list: list = SYMPTOM_LIST) -> RuleSet:
+    """
+    Compile declarative disease rules into bitmask form.
+    
+    Args:
+        rules: Rule dicts in the DISEASE_RULES format
+        symptom_list: Base symptom vocabulary (defines the first bit indices)
+        
+    Returns:
+        RuleSet with compiled rules, the symptom -> bit index map and a
+        per-bit index of the rules each symptom can contribute to
+    """
+    symptom_bits = {}
+    for symptom in symptom_list:
+        symptom_bits.setdefault(symptom.lower(), len(symptom_bits))
+    
+    def to_mask(names):
+        mask = 0
+        for name in names:
+            mask |= 1 << symptom_bits.setdefault(name.lower(), len(symptom_bits))
+        return mask
+    
+    compiled = []
+    for rule in rules:
+        compiled.append(CompiledRule(
+            name=rule["name"],
+            mask=to_mask(rule["symptoms"]),
+            require_mask=to_mask(rule.get("requires", [])),
+            min_match=rule.get("min_match", 1),
+            base=rule["base"],
+            per_match=rule["per_match"],
+            combos=tuple(
+                (to_mask(combo["all"]), combo.get("min_match", 0), combo["bonus"])
+                for combo in rule.get("combos", [])
+            ),
+            city_disease=rule.get("city_disease", ""),
+            city_bonus=dict(rule.get("city_bonus", {})),
+            age=tuple(
+                (mod.get("over"), mod.get("under"), mod["bonus"])
+                for mod in rule.get("age", [])
+            ),
+            cap=rule["cap"]
+        ))
+    
+    # A rule can only fire if the patient has one of its symptoms, unless
+    # it needs no matches at all; index rules by symptom bit as a rule bitset.
+    rules_by_bit = [0] * len(symptom_bits)
+    always = 0
+    for idx, rule in enumerate(compiled):
+        if rule.min_match <= 0:
+            always |= 1 << idx
+            continue
+        mask = rule.mask
+        while mask:
+            low = mask & -mask
+            rules_by_bit[low.bit_length() - 1] |= 1 << idx
+            mask ^= low
+    
+    return RuleSet(tuple(compiled), symptom_bits, tuple(rules_by_bit), always)
+
+
+RULESET = compile_rules(DISEASE_RULES)
+
+
+def age_cuts(ruleset: RuleSet = RULESET) -> list:
+    """Ages at which some rule's age modifier switches on or off."""
+    cuts = set()
+    for rule in ruleset.rules:
+        for over, under, _ in rule.age:
+            if over is not None:
+                cuts.add(over + 1)
+            if under is not None:
+                cuts.add(under)
+    return sorted(cuts)
+
+
+def symptom_mask(symptoms: list, symptom_bits: dict = None) -> tuple:
+    """
+    Encode a symptom list as a bitmask.
+    
+    Args:
+        symptoms: List of symptom strings (any case)
+        symptom_bits: Symptom -> bit index map (defaults to RULESET's)
+        
+    Returns:
+        (mask, repeats) where repeats lists the bit of every duplicate entry,
+        so match counts stay identical to counting the raw list
+    """
+    if symptom_bits is None:
+        symptom_bits = RULESET.symptom_bits
+    mask = 0
+    repeats = []
+    for s in symptoms:
+        idx = symptom_bits.get(s.lower())
+        if idx is None:
+            continue
+        bit = 1 << idx
+        if mask & bit:
+            repeats.append(bit)
+        else:
+            mask |= bit
+    return mask, repeats
+
+
+def score_rules(mask: int, repeats: list, city_risk: dict, age: int, ruleset: RuleSet = RULESET) -> dict:
+    """
+    Score every candidate rule for an encoded patient.
+    
+    Args:
+        mask: Patient symptom bitmask
+        repeats: Duplicate symptom bits (see symptom_mask)
+        city_risk: The city's {disease: risk level} lookup from CITY_INDEX
+        age: Patient's age
+        ruleset: Compiled rules
+        
+    Returns:
+        Dictionary of {disease_name: probability_percentage} in rule order
+    """
+    predictions = {}
+    rules = ruleset.rules
+    rules_by_bit = ruleset.rules_by_bit
+    
+    candidates = ruleset.always
+    bits = mask
+    while bits:
+        low = bits & -bits
+        candidates |= rules_by_bit[low.bit_length() - 1]
+        bits ^= low
+    
+    while candidates:
+        low = candidates & -candidates
+        candidates ^= low
+        rule = rules[low.bit_length() - 1]
+        
+        match = (mask & rule.mask).bit_count()
+        if repeats:
+            match += sum(1 for bit in repeats if bit & rule.mask)
+        if match < rule.min_match or (mask & rule.require_mask) != rule.require_mask:
+            continue
+        
+        prob = rule.base + rule.per_match * match
+        for combo_mask, combo_min, bonus in rule.combos:
+            if (mask & combo_mask) == combo_mask and match >= combo_min:
+                prob += bonus
+        if rule.city_bonus:
+            prob += rule.city_bonus.get(city_risk.get(rule.city_disease), 0)
+        for over, under, bonus in rule.age:
+            if (over is not None and age > over) or (under is not None and age < under):
+                prob += bonus
+                break
+        predictions[rule.name] = min(prob, rule.cap)
+    
+    return predictions
 
 
 def predict_disease(symptoms: list, city: str, age: int) -> dict:
@@ -19,109 +206,133 @@ def predict_disease(symptoms: list, city: str, age: int) -> dict:
     Returns:
         Dictionary of {disease_name: probability_percentage}
     """
-    predictions = {}
-    symptoms_lower = [s.lower() for s in symptoms]
-    city_data = CITY_DISEASE_DATA.get(city, {}).get("diseases", {})
-    
-    # ========== DENGUE DETECTION ==========
-    dengue_symptoms = ["fever", "rash", "headache", "body pain", "joint pain", "fatigue"]
-    dengue_match = sum(1 for s in symptoms_lower if s in dengue_symptoms)
-    if dengue_match >= 2:
-        base_prob = 35 + (dengue_match * 12)
-        # City outbreak bonus
-        if city_data.get("Dengue", {}).get("risk") == "HIGH":
-            base_prob += 20
-        elif city_data.get("Dengue", {}).get("risk") == "MEDIUM":
-            base_prob += 10
-        # Characteristic combination
-        if "fever" in symptoms_lower and "rash" in symptoms_lower:
-            base_prob += 15
-        predictions["Dengue"] = min(base_prob, 95)
-    
-    # ========== TB DETECTION ==========
-    tb_symptoms = ["cough", "night sweats", "weight loss", "fever", "fatigue", "loss of appetite", "chest pain"]
-    tb_match = sum(1 for s in symptoms_lower if s in tb_symptoms)
-    if tb_match >= 2:
-        base_prob = 25 + (tb_match * 10)
-        # Chronic cough indicator
-        if "cough" in symptoms_lower:
-            base_prob += 15
-            if tb_match >= 3:
-                base_prob += 10
-        # Age factor
-        if age > 50:
-            base_prob += 8
-        predictions["Tuberculosis (TB)"] = min(base_prob, 90)
-    
-    # ========== MALARIA DETECTION ==========
-    malaria_symptoms = ["fever", "cold", "headache", "nausea", "vomiting", "fatigue", "body pain"]
-    malaria_match = sum(1 for s in symptoms_lower if s in malaria_symptoms)
-    if malaria_match >= 2 and "fever" in symptoms_lower:
-        base_prob = 30 + (malaria_match * 10)
-        # Cyclic fever pattern
-        if "cold" in symptoms_lower and "fever" in symptoms_lower:
-            base_prob += 15
-        # City outbreak
-        if city_data.get("Malaria", {}).get("risk") == "HIGH":
-            base_prob += 15
-        predictions["Malaria"] = min(base_prob, 88)
-    
-    # ========== TYPHOID DETECTION ==========
-    typhoid_symptoms = ["fever", "abdominal pain", "headache", "loss of appetite", "diarrhea", "fatigue"]
-    typhoid_match = sum(1 for s in symptoms_lower if s in typhoid_symptoms)
-    if typhoid_match >= 2:
-        base_prob = 28 + (typhoid_match * 11)
-        # Characteristic pattern
-        if "fever" in symptoms_lower and "abdominal pain" in symptoms_lower:
-            base_prob += 15
-        # City factor
-        if city_data.get("Typhoid", {}).get("risk") == "HIGH":
-            base_prob += 18
-        predictions["Typhoid"] = min(base_prob, 85)
-    
-    # ========== VIRAL FLU DETECTION ==========
-    flu_symptoms = ["fever", "cough", "cold", "headache", "body pain", "fatigue", "nausea"]
-    flu_match = sum(1 for s in symptoms_lower if s in flu_symptoms)
-    if flu_match >= 2:
-        base_prob = 40 + (flu_match * 8)
-        # Common combination
-        if "fever" in symptoms_lower and "cough" in symptoms_lower:
-            base_prob += 10
-        predictions["Viral Flu"] = min(base_prob, 92)
-    
-    # ========== RESPIRATORY INFECTION ==========
-    resp_symptoms = ["cough", "breathlessness", "chest pain", "fever", "cold", "fatigue"]
-    resp_match = sum(1 for s in symptoms_lower if s in resp_symptoms)
-    if resp_match >= 2:
-        base_prob = 30 + (resp_match * 12)
-        # Severity indicators
-        if "breathlessness" in symptoms_lower:
-            base_prob += 15
-        if "chest pain" in symptoms_lower:
-            base_prob += 12
-        # Age vulnerability
-        if age > 60:
-            base_prob += 15
-        elif age < 5:
-            base_prob += 10
-        predictions["Respiratory Infection"] = min(base_prob, 90)
-    
-    # ========== GASTROENTERITIS ==========
-    gastro_symptoms = ["nausea", "vomiting", "diarrhea", "abdominal pain", "fever", "loss of appetite"]
-    gastro_match = sum(1 for s in symptoms_lower if s in gastro_symptoms)
-    if gastro_match >= 2:
-        base_prob = 35 + (gastro_match * 10)
-        # GI specific
-        if "vomiting" in symptoms_lower and "diarrhea" in symptoms_lower:
-            base_prob += 15
-        predictions["Gastroenteritis"] = min(base_prob, 88)
+    start = metrics.now() if metrics.ENABLED else 0
+    mask, repeats = symptom_mask(symptoms)
+    predictions = score_rules(mask, repeats, CITY_INDEX.risk_levels(city), age)
     
     # Sort by probability (highest first)
     predictions = dict(sorted(predictions.items(), key=lambda x: x[1], reverse=True))
     
+    if start:
+        metrics.record_rules([rule.name for rule in RULESET.rules if mask & rule.mask], list(predictions))
+        metrics.observe("predict_disease", metrics.now() - start)
+    
     return predictions
 
 
+# Risk points for critical symptoms; 20+ points also adds a risk factor
+CRITICAL_SYMPTOMS = {
+    "breathlessness": 25,
+    "chest pain": 25,
+    "jaundice": 20,
+    "vomiting": 10,
+    "diarrhea": 10
+}
+
+
+# ========== RISK COMPONENTS ==========
+# Each returns (points, factors) for one independent part of the risk score;
+# calculate_risk_score sums them in this order.
+
+def age_risk(age: int) -> tuple:
+    """Risk points and factors from the patient's age."""
+    if age >= 75:
+        return 35, ("Very Elderly (75+)",)
+    if age >= 65:
+        return 25, ("Elderly (65+)",)
+    if age >= 55:
+        return 15, ("Senior (55+)",)
+    if age <= 2:
+        return 30, ("Infant (0-2 years)",)
+    if age <= 5:
+        return 20, ("Young Child (2-5 years)",)
+    return 0, ()
+
+
+def symptom_risk(symptoms: list) -> tuple:
+    """Risk points and factors from the symptom count and critical symptoms."""
+    points = 0
+    factors = []
+    symptom_count = len(symptoms)
+    if symptom_count >= 6:
+        points += 30
+        factors.append(f"Many symptoms ({symptom_count})")
+    elif symptom_count >= 4:
+        points += 20
+        factors.append(f"Multiple symptoms ({symptom_count})")
+    elif symptom_count >= 2:
+        points += 10
+    
+    symptoms_lower = [s.lower() for s in symptoms]
+    for symptom, score in CRITICAL_SYMPTOMS.items():
+        if symptom in symptoms_lower:
+            points += score
+            if score >= 20:
+                factors.append(f"Critical: {symptom.title()}")
+    return points, factors
+
+
+def bp_risk(bp_systolic: int, bp_diastolic: int) -> tuple:
+    """Risk points and factors from blood pressure (0 = not recorded)."""
+    if bp_systolic > 0 and bp_diastolic > 0:
+        # Hypertensive crisis
+        if bp_systolic >= 180 or bp_diastolic >= 120:
+            return 35, ("⚠️ Hypertensive Crisis",)
+        # Stage 2 hypertension
+        if bp_systolic >= 140 or bp_diastolic >= 90:
+            return 18, ("High Blood Pressure",)
+        # Hypotension
+        if bp_systolic < 90 or bp_diastolic < 60:
+            return 22, ("Low Blood Pressure",)
+    return 0, ()
+
+
+def pulse_risk(pulse: int) -> tuple:
+    """Risk points and factors from heart rate (0 = not recorded)."""
+    if pulse > 0:
+        if pulse > 120:
+            return 18, ("Tachycardia (Rapid Heart)",)
+        if pulse > 100:
+            return 10, ("Elevated Heart Rate",)
+        if pulse < 50:
+            return 18, ("Bradycardia (Slow Heart)",)
+    return 0, ()
+
+
+def outbreak_risk(city: str) -> tuple:
+    """Risk points and factors from the number of HIGH-risk diseases in the city."""
+    high_risk_count = CITY_INDEX.high_risk_count(city)
+    if high_risk_count >= 4:
+        return 20, (f"City outbreak zone ({high_risk_count} diseases)",)
+    if high_risk_count >= 2:
+        return 12, ("City has active outbreaks",)
+    if high_risk_count >= 1:
+        return 6, ()
+    return 0, ()
+
+
+def prediction_risk(predictions: dict) -> tuple:
+    """Risk points and factors from the top disease prediction."""
+    if predictions:
+        top_disease, top_prob = next(iter(predictions.items()))
+        if top_prob >= 85:
+            return 25, (f"High probability: {top_disease}",)
+        if top_prob >= 70:
+            return 15, (f"Likely: {top_disease}",)
+        if top_prob >= 55:
+            return 8, ()
+    return 0, ()
+
+
+def risk_category(risk_score: int) -> str:
+    """Map a capped risk score to HIGH / MEDIUM / LOW."""
+    if risk_score >= 70:
+        return "HIGH"
+    if risk_score >= 40:
+        return "MEDIUM"
+    return "LOW"
+
+
 def calculate_risk_score(
     symptoms: list,
     age: int,
@@ -146,115 +357,29 @@ def calculate_risk_score(
     Returns:
         Dictionary with score, category, and risk factors
     """
+    start = metrics.now() if metrics.ENABLED else 0
     risk_score = 0
     risk_factors = []
     
-    # ========== AGE FACTOR ==========
-    if age >= 75:
-        risk_score += 35
-        risk_factors.append("Very Elderly (75+)")
-    elif age >= 65:
-        risk_score += 25
-        risk_factors.append("Elderly (65+)")
-    elif age >= 55:
-        risk_score += 15
-        risk_factors.append("Senior (55+)")
-    elif age <= 2:
-        risk_score += 30
-        risk_factors.append("Infant (0-2 years)")
-    elif age <= 5:
-        risk_score += 20
-        risk_factors.append("Young Child (2-5 years)")
-    
-    # ========== SYMPTOM COUNT ==========
-    symptom_count = len(symptoms)
-    if symptom_count >= 6:
-        risk_score += 30
-        risk_factors.append(f"Many symptoms ({symptom_count})")
-    elif symptom_count >= 4:
-        risk_score += 20
-        risk_factors.append(f"Multiple symptoms ({symptom_count})")
-    elif symptom_count >= 2:
-        risk_score += 10
-    
-    # ========== CRITICAL SYMPTOMS ==========
-    critical_symptoms = {
-        "breathlessness": 25,
-        "chest pain": 25,
-        "jaundice": 20,
-        "vomiting": 10,
-        "diarrhea": 10
-    }
-    symptoms_lower = [s.lower() for s in symptoms]
-    
-    for symptom, score in critical_symptoms.items():
-        if symptom in symptoms_lower:
-            risk_score += score
-            if score >= 20:
-                risk_factors.append(f"Critical: {symptom.title()}")
-    
-    # ========== VITAL SIGNS ==========
-    if bp_systolic > 0 and bp_diastolic > 0:
-        # Hypertensive crisis
-        if bp_systolic >= 180 or bp_diastolic >= 120:
-            risk_score += 35
-            risk_factors.append("⚠️ Hypertensive Crisis")
-        # Stage 2 hypertension
-        elif bp_systolic >= 140 or bp_diastolic >= 90:
-            risk_score += 18
-            risk_factors.append("High Blood Pressure")
-        # Hypotension
-        elif bp_systolic < 90 or bp_diastolic < 60:
-            risk_score += 22
-            risk_factors.append("Low Blood Pressure")
-    
-    if pulse > 0:
-        if pulse > 120:
-            risk_score += 18
-            risk_factors.append("Tachycardia (Rapid Heart)")
-        elif pulse > 100:
-            risk_score += 10
-            risk_factors.append("Elevated Heart Rate")
-        elif pulse < 50:
-            risk_score += 18
-            risk_factors.append("Bradycardia (Slow Heart)")
-    
-    # ========== CITY OUTBREAK FACTOR ==========
-    city_data = CITY_DISEASE_DATA.get(city, {}).get("diseases", {})
-    high_risk_count = sum(1 for d in city_data.values() if d.get("risk") == "HIGH")
-    
-    if high_risk_count >= 4:
-        risk_score += 20
-        risk_factors.append(f"City outbreak zone ({high_risk_count} diseases)")
-    elif high_risk_count >= 2:
-        risk_score += 12
-        risk_factors.append(f"City has active outbreaks")
-    elif high_risk_count >= 1:
-        risk_score += 6
-    
-    # ========== DISEASE PREDICTION SEVERITY ==========
-    if predictions:
-        top_prob = list(predictions.values())[0]
-        top_disease = list(predictions.keys())[0]
-        
-        if top_prob >= 85:
-            risk_score += 25
-            risk_factors.append(f"High probability: {top_disease}")
-        elif top_prob >= 70:
-            risk_score += 15
-            risk_factors.append(f"Likely: {top_disease}")
-        elif top_prob >= 55:
-            risk_score += 8
+    for points, factors in (
+        age_risk(age),
+        symptom_risk(symptoms),
+        bp_risk(bp_systolic, bp_diastolic),
+        pulse_risk(pulse),
+        outbreak_risk(city),
+        prediction_risk(predictions)
+    ):
+        if points:
+            risk_score += points
+            risk_factors.extend(factors)
     
     # ========== CALCULATE FINAL CATEGORY ==========
     risk_score = min(risk_score, 100)
+    category = risk_category(risk_score)
     
-    if risk_score >= 70:
-        category = "HIGH"
-    elif risk_score >= 40:
-        category = "MEDIUM"
-    else:
-        category = "LOW"
+    if start:
+        metrics.record_risk(risk_factors, category)
+        metrics.observe("calculate_risk_score", metrics.now() - start)
     
     return {
         "score": risk_score,
@@ -263,101 +388,26 @@ def calculate_risk_score(
     }
 
 
-def parse_voice_input(text: str, language: str = "English") -> dict:
+def parse_voice_input(text: str, language: str = "English", fuzzy: bool = False) -> dict:
     """
     Parse voice input to extract patient data.
     
     Args:
         text: Raw voice transcript
         language: Selected language
+        fuzzy: Also add symptoms found by FUZZY_INDEX (typos, Latin-script
+            Hindi/Gujarati, inflections) after the exact keyword matches
         
     Returns:
         Dictionary with extracted fields
     """
-    result = {
-        "name": "",
-        "age": 0,
-        "symptoms": [],
-        "bp": "",
-        "gender": "",
-        "bulk_mode": False,
-        "patient_range": None
-    }
-    
-    text_lower = text.lower()
-    
-    # ========== BULK MODE DETECTION ==========
-    bulk_patterns = [
-        r"patients?\s+(\d+)\s*(?:to|-)\s*(\d+)",
-        r"(\d+)\s*(?:to|-)\s*(\d+)\s*patients?"
-    ]
-    for pattern in bulk_patterns:
-        bulk_match = re.search(pattern, text_lower)
-        if bulk_match:
-            result["bulk_mode"] = True
-            result["patient_range"] = (int(bulk_match.group(1)), int(bulk_match.group(2)))
-            break
-    
-    # ========== NAME EXTRACTION ==========
-    name_patterns = [
-        r"(?:patient|name|naam|નામ|मरीज)\s+([a-zA-Z\u0900-\u097F\u0A80-\u0AFF]+)",
-        r"^([A-Z][a-z]+)\s+(?:age|has|is)"
-    ]
-    for pattern in name_patterns:
-        name_match = re.search(pattern, text, re.IGNORECASE)
-        if name_match:
-            result["name"] = name_match.group(1).strip().title()
-            break
-    
-    # ========== AGE EXTRACTION ==========
-    age_patterns = [
-        r"age\s+(\d+)",
-        r"(\d+)\s*(?:years?|yrs?|साल|વર્ષ)\s*old",
-        r"उम्र\s+(\d+)",
-        r"ઉંમર\s+(\d+)"
-    ]
-    for pattern in age_patterns:
-        age_match = re.search(pattern, text_lower)
-        if age_match:
-            result["age"] = int(age_match.group(1))
-            break
-    
-    # ========== GENDER EXTRACTION ==========
-    if any(g in text_lower for g in ["male", "man", "पुरुष", "પુરુષ"]):
-        result["gender"] = "M"
-    elif any(g in text_lower for g in ["female", "woman", "महिला", "સ્ત્રી"]):
-        result["gender"] = "F"
-    
-    # ========== BP EXTRACTION ==========
-    bp_patterns = [
-        r"bp\s+(\d+)[/\s]+(\d+)",
-        r"blood\s+pressure\s+(\d+)[/\s]+(\d+)",
-        r"(\d{2,3})[/](\d{2,3})"
-    ]
-    for pattern in bp_patterns:
-        bp_match = re.search(pattern, text_lower)
-        if bp_match:
-            result["bp"] = f"{bp_match.group(1)}/{bp_match.group(2)}"
-            break
-    
-    if "bp normal" in text_lower or "normal bp" in text_lower:
-        result["bp"] = "120/80"
-    
-    # ========== SYMPTOM EXTRACTION ==========
-    # Get language-specific patterns
-    lang_key = "english"
-    if "हिंदी" in language or "hindi" in language.lower():
-        lang_key = "hindi"
-    elif "ગુજરાતી" in language or "gujarati" in language.lower():
-        lang_key = "gujarati"
-    
-    # Check all languages for symptoms
-    for lang, patterns in VOICE_PATTERNS.items():
-        for keyword, symptom in patterns.get("symptoms", {}).items():
-            if keyword in text.lower() or keyword in text:
-                if symptom not in result["symptoms"]:
-                    result["symptoms"].append(symptom)
-    
+    start = metrics.now() if metrics.ENABLED else 0
+    result = VOICE_PARSER.parse(text)
+    if fuzzy:
+        extra = [s for s in FUZZY_INDEX.symptoms(text) if s not in result["symptoms"]]
+        result["symptoms"] += extra
+    if start:
+        metrics.observe("parse_voice_input", metrics.now() - start)
     return result
 
 
@@ -373,42 +423,10 @@ def generate_patient_summary(patient_data: dict, predictions: dict, risk: dict)
     Returns:
         Formatted string summary
     """
-    # Get top prediction
-    top_disease = "Assessment Needed"
-    top_prob = 0
-    if predictions:
-        top_disease = list(predictions.keys())[0]
-        top_prob = list(predictions.values())[0]
-    
-    # Risk emoji
-    risk_emoji = "🔴" if risk['category'] == "HIGH" else "🟡" if risk['category'] == "MEDIUM" else "🟢"
-    
-    # Format symptoms
-    symptoms_str = ", ".join(patient_data.get('symptoms', [])) or "Not recorded"
+    start = metrics.now() if metrics.ENABLED else 0
+    summary = RENDERERS["english"].render(patient_data, predictions, risk)
     
-    # Format risk factors
-    factors_str = "\n".join(f"  • {f}" for f in risk.get('factors', [])[:5]) or "  • None identified"
-    
-    summary = f"""🏥 *PATIENT ALERT - {risk['category']} RISK* {risk_emoji}
-
-👤 *Patient:* {patient_data.get('name', 'N/A')}
-📅 *Age/Gender:* {patient_data.get('age', 'N/A')} / {patient_data.get('gender', 'N/A')}
-📍 *City:* {patient_data.get('city', 'N/A')}
-
-🩺 *Symptoms:* {symptoms_str}
-💓 *Vitals:* BP {patient_data.get('bp', 'N/A')} | Pulse {patient_data.get('pulse', 'N/A')} bpm
-
-⚠️ *Predicted Condition:*
-   {top_disease} ({top_prob}% probability)
-
-📊 *Risk Score:* {risk['score']}/100 ({risk['category']})
-
-🚨 *Risk Factors:*
-{factors_str}
-
-📞 *Action Required:* Immediate medical attention recommended
-
-_Generated by Health Monitor System_
-_Time: {patient_data.get('timestamp', 'N/A')}_"""
+    if start:
+        metrics.observe("generate_patient_summary", metrics.now() - start)
     
     return summary
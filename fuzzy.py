@@ -0,0 +1,205 @@
+"""
+🔤 Fuzzy Symptom Lookup
+SymSpell-style deletion index over the multilingual symptom vocabulary
+"""
+
+import re
+from functools import lru_cache
+from typing import NamedTuple
+from data import SYMPTOM_LIST, SYMPTOM_SYNONYMS, VOICE_PATTERNS
+from snapshot import engine_part
+
+
+def allowed_distance(term_length: int) -> int:
+    """
+    Edits allowed against a vocabulary term of this length.
+
+    Short words ("cold", "fever", "cough") must match exactly or they
+    collide with ordinary words ("could", "never", "tough").
+    """
+    if term_length <= 5:
+        return 0
+    if term_length <= 7:
+        return 1
+    return 2
+
+
+MAX_DISTANCE = 2
+PREFIX_LENGTH = 7
+
+# Inflections tried when a token has no match of its own ("coughs", "rashes")
+_SUFFIXES = ("ing", "es", "ed", "s")
+_SUFFIX_CONFIDENCE = 0.9
+
+_TOKEN = re.compile(r"[^\s,.;:!?/()\[\]\"']+")
+
+
+class FuzzyMatch(NamedTuple):
+    symptom: str        # canonical symptom
+    term: str           # vocabulary entry that matched
+    distance: int       # edit distance between the text and term
+    confidence: float   # 1.0 = exact
+    start: int = 0      # span in the searched text (find() only)
+    end: int = 0
+
+
+def build_vocabulary(voice_patterns: dict = VOICE_PATTERNS, synonyms: dict = SYMPTOM_SYNONYMS) -> dict:
+    """Every known {term: canonical symptom}, lowercased, across languages."""
+    vocabulary = {symptom.lower(): symptom for symptom in SYMPTOM_LIST}
+    for patterns in voice_patterns.values():
+        for keyword, symptom in patterns.get("symptoms", {}).items():
+            vocabulary.setdefault(keyword.lower(), symptom)
+    for term, symptom in synonyms.items():
+        vocabulary.setdefault(term.lower(), symptom)
+    return vocabulary
+
+
+def _deletes(word: str, depth: int) -> set:
+    """word plus every string reachable from it by up to depth single-character deletions."""
+    found = {word}
+    frontier = [word]
+    for _ in range(depth):
+        nxt = []
+        for w in frontier:
+            for i in range(len(w)):
+                d = w[:i] + w[i + 1:]
+                if d not in found:
+                    found.add(d)
+                    nxt.append(d)
+        frontier = nxt
+    return found
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Optimal string alignment distance (adjacent transpositions count as one edit).
+
+    Returns:
+        The distance, or limit + 1 as soon as it must exceed limit
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev2 = None
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        row = [i] + [0] * len(b)
+        best = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(prev[j] + 1, row[j - 1] + 1, prev[j - 1] + cost)
+            if prev2 is not None and i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, prev2[j - 2] + 1)
+            row[j] = value
+            best = min(best, value)
+        if best > limit:
+            return limit + 1
+        prev2, prev = prev, row
+    return prev[-1]
+
+
+class FuzzySymptomIndex:
+    """
+    Bounded-edit-distance lookup from noisy tokens to canonical symptoms.
+
+    Every term's prefix is indexed under all of its deletions up to
+    MAX_DISTANCE at build time, so a lookup only generates the deletions of
+    the query and verifies the few terms they hit. Lookup cost depends on
+    the token length, not on the vocabulary size.
+    """
+
+    def __init__(self, vocabulary: dict = None, prefix_length: int = PREFIX_LENGTH, cache_size: int = 8192):
+        # Transcripts repeat the same filler words constantly; remember misses too
+        self.lookup = lru_cache(maxsize=cache_size)(self._lookup)
+        self.vocabulary = vocabulary if vocabulary is not None else build_vocabulary()
+        self.prefix_length = prefix_length
+        self.terms = list(self.vocabulary)
+        self._deletes = {}
+        for idx, term in enumerate(self.terms):
+            depth = allowed_distance(len(term))
+            if not depth:
+                continue
+            for variant in _deletes(term[:prefix_length], depth):
+                self._deletes.setdefault(variant, []).append(idx)
+
+    def __getstate__(self) -> dict:
+        # The lookup cache is a closure; keep only its size and start empty
+        state = dict(self.__dict__)
+        state["lookup"] = self.lookup.cache_parameters()["maxsize"]
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self.lookup = lru_cache(maxsize=state["lookup"])(self._lookup)
+
+    def _lookup(self, token: str) -> FuzzyMatch:
+        """
+        Best vocabulary match for a token or phrase.
+
+        Args:
+            token: Word or space-joined words (any case)
+
+        Returns:
+            FuzzyMatch, or None if no term is within its allowed distance
+        """
+        token = token.lower()
+        symptom = self.vocabulary.get(token)
+        if symptom is not None:
+            return FuzzyMatch(symptom, token, 0, 1.0)
+
+        best = None
+        seen = set()
+        for variant in _deletes(token[:self.prefix_length], MAX_DISTANCE):
+            for idx in self._deletes.get(variant, ()):
+                if idx in seen:
+                    continue
+                seen.add(idx)
+                term = self.terms[idx]
+                limit = allowed_distance(len(term))
+                distance = edit_distance(token, term, limit)
+                if distance <= limit and (best is None or distance < best[0]):
+                    best = (distance, term)
+        if best is not None:
+            distance, term = best
+            confidence = round(1 - distance / max(len(token), len(term)), 3)
+            return FuzzyMatch(self.vocabulary[term], term, distance, confidence)
+
+        for suffix in _SUFFIXES:
+            if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+                stem = self.vocabulary.get(token[:-len(suffix)])
+                if stem is not None:
+                    return FuzzyMatch(stem, token[:-len(suffix)], len(suffix), _SUFFIX_CONFIDENCE)
+        return None
+
+    def find(self, text: str, min_confidence: float = 0.75, max_words: int = 3) -> list:
+        """
+        Find symptom mentions in free text, preferring the longest phrase.
+
+        Args:
+            text: Transcript text
+            min_confidence: Drop matches below this confidence
+            max_words: Longest phrase (in words) to try as one term
+
+        Returns:
+            FuzzyMatch list with start/end spans, in text order
+        """
+        tokens = [(m.start(), m.end(), m.group()) for m in _TOKEN.finditer(text)]
+        matches = []
+        i = 0
+        while i < len(tokens):
+            for n in range(min(max_words, len(tokens) - i), 0, -1):
+                phrase = " ".join(t[2] for t in tokens[i:i + n])
+                match = self.lookup(phrase)
+                if match is not None and match.confidence >= min_confidence:
+                    matches.append(match._replace(start=tokens[i][0], end=tokens[i + n - 1][1]))
+                    i += n
+                    break
+            else:
+                i += 1
+        return matches
+
+    def symptoms(self, text: str, min_confidence: float = 0.75) -> list:
+        """Distinct canonical symptoms mentioned in text, in first-mention order."""
+        return list(dict.fromkeys(m.symptom for m in self.find(text, min_confidence)))
+
+
+FUZZY_INDEX = engine_part("fuzzy_index", FuzzySymptomIndex)
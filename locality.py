@@ -0,0 +1,405 @@
+"""
+🗺️ Locality Index
+State → city → ward hierarchy with aliases, prefix search and rolled-up outbreak levels
+
+Usage:
+    LOCALITY_INDEX.resolve("Vastrapur, Amdavad")     # -> ward Locality
+    LOCALITY_INDEX.search("and")                     # autocomplete
+    LOCALITY_INDEX.update_ward("Ahmedabad", "Naroda", "Dengue", "HIGH")
+    LOCALITY_INDEX.rollup("Gujarat")                 # {disease: worst level}
+    predict_disease(symptoms, "Bombay", 30)          # aliases resolve in CITY_INDEX
+"""
+
+import bisect
+import re
+from city_index import CITY_INDEX, CityRisk, CityRiskIndex
+from data import LOCALITIES, WARD_DISEASE_DATA
+from fuzzy import FuzzySymptomIndex
+
+LEVELS = ("LOW", "MEDIUM", "HIGH")
+_LEVEL_INDEX = {level: i for i, level in enumerate(LEVELS)}
+
+_SEPARATORS = re.compile(r"[\s,.;:!?/()\[\]\"'|_-]+")
+# Words that qualify a place name without being part of it ("Vastrapur area")
+_GENERIC_WORDS = frozenset({"area", "ward", "city", "district", "zone", "state", "the", "near"})
+# Longest run of words tried as one name
+_MAX_NAME_WORDS = 4
+# Resolved names kept per index version
+_CACHE_SIZE = 4096
+
+
+def normalize(name: str) -> str:
+    """Case-folded name with punctuation, extra spaces and generic words removed."""
+    return " ".join(w for w in _SEPARATORS.split(name.casefold()) if w and w not in _GENERIC_WORDS)
+
+
+class Locality:
+    """One node of the hierarchy."""
+
+    __slots__ = ("name", "kind", "parent", "children", "levels", "counts", "depth")
+
+    def __init__(self, name: str, kind: str, parent: "Locality" = None):
+        self.name = name
+        self.kind = kind
+        self.parent = parent
+        self.children = {}      # normalized name -> Locality
+        self.levels = {}        # disease -> level reported for this node itself (not cities)
+        self.counts = {}        # disease -> [LOW, MEDIUM, HIGH] reporting nodes in this subtree
+        self.depth = 0 if parent is None else parent.depth + 1
+
+    def __repr__(self) -> str:
+        return f"Locality({self.kind} {self.path_name!r})"
+
+    @property
+    def path(self) -> list:
+        """Nodes from the top-level state down to this one."""
+        nodes = []
+        node = self
+        while node.parent is not None:
+            nodes.append(node)
+            node = node.parent
+        return nodes[::-1]
+
+    @property
+    def path_name(self) -> str:
+        return " / ".join(node.name for node in self.path)
+
+    @property
+    def city(self) -> "Locality":
+        """The enclosing city node, if any."""
+        node = self
+        while node is not None and node.kind != "city":
+            node = node.parent
+        return node
+
+    def is_within(self, other: "Locality") -> bool:
+        node = self
+        while node is not None:
+            if node is other:
+                return True
+            node = node.parent
+        return False
+
+
+class LocalityIndex:
+    """
+    Name resolution and outbreak levels over the locality hierarchy.
+
+    City-level risk stays in CITY_INDEX (the single source that
+    surveillance updates); wards and states keep their own levels here.
+    The signal for a place is the most specific level known for each
+    disease on its path, found by walking at most depth nodes.
+
+    Every node also keeps, per disease, how many reporting nodes in its
+    subtree sit at each level. A level change adjusts those counts on the
+    changed node's ancestors only, so rollups are O(depth) to maintain and
+    O(1) to read.
+    """
+
+    def __init__(self, localities: dict = LOCALITIES, ward_data: dict = WARD_DISEASE_DATA,
+                 city_index: CityRiskIndex = CITY_INDEX):
+        self.city_index = city_index
+        self.root = Locality("", "country")
+        self._names = {}        # normalized name or alias -> [Locality]
+        self._sorted = None     # sorted normalized names, built on first search
+        self._fuzzy = None      # deletion index over normalized names, built on first miss
+        self._cache = {}
+        self._cache_version = None
+
+        for state, info in localities.items():
+            state_node = self.add(state, "state", aliases=info.get("aliases", ()))
+            for city, city_info in info.get("cities", {}).items():
+                city_node = self.add(city, "city", state_node, city_info.get("aliases", ()))
+                for ward, aliases in city_info.get("wards", {}).items():
+                    self.add(ward, "ward", city_node, aliases)
+        for city in list(city_index.city_data):
+            node = self._find(city, "city") or self.add(city, "city")
+            self._count(node, {}, city_index.exact(city).risk)
+        for city, wards in ward_data.items():
+            for ward, diseases in wards.items():
+                node = self._ward(city, ward)
+                for disease, level in diseases.items():
+                    self.set_level(node, disease, level, touch=False)
+        city_index.subscribe(self._on_city_rebuild)
+
+    # ---------- building ----------
+
+    def add(self, name: str, kind: str, parent: Locality = None, aliases: tuple = ()) -> Locality:
+        """
+        Add a locality (or return the existing one with that name under parent).
+
+        Args:
+            name: Display name; for cities, the CITY_DISEASE_DATA key
+            kind: "state", "city" or "ward"
+            parent: Enclosing locality (default: top level)
+            aliases: Other spellings that should resolve to it
+        """
+        parent = parent or self.root
+        key = normalize(name)
+        node = parent.children.get(key)
+        if node is None:
+            node = parent.children[key] = Locality(name, kind, parent)
+        for alias in (name, *aliases):
+            nodes = self._names.setdefault(normalize(alias), [])
+            if node not in nodes:
+                nodes.append(node)
+        self._sorted = None
+        self._fuzzy = None
+        return node
+
+    def _find(self, name: str, kind: str, within: str = None) -> Locality:
+        for node in self._names.get(normalize(name), ()):
+            if node.kind == kind and (within is None or (node.city and node.city.name == within)):
+                return node
+        return None
+
+    def _ward(self, city: str, ward: str) -> Locality:
+        """A city's ward node, adding the ward (and city) if new."""
+        node = self._find(ward, "ward", city)
+        if node is None:
+            node = self.add(ward, "ward", self._find(city, "city") or self.add(city, "city"))
+        return node
+
+    # ---------- levels and rollups ----------
+
+    def _count(self, node: Locality, old: dict, new: dict):
+        """Move node's per-disease levels from old to new in every ancestor's counts."""
+        for disease in old.keys() | new.keys():
+            before, after = _LEVEL_INDEX.get(old.get(disease)), _LEVEL_INDEX.get(new.get(disease))
+            if before == after:
+                continue
+            ancestor = node
+            while ancestor is not None:
+                counts = ancestor.counts.setdefault(disease, [0, 0, 0])
+                if before is not None:
+                    counts[before] -= 1
+                if after is not None:
+                    counts[after] += 1
+                ancestor = ancestor.parent
+
+    def _on_city_rebuild(self, city: str, old: dict, new: dict):
+        node = self._find(city, "city") or self.add(city, "city")
+        self._count(node, old, new)
+
+    def set_level(self, place, disease: str, level: str, touch: bool = True) -> int:
+        """
+        Report a disease level for a ward or state (cities go through CITY_INDEX).
+
+        Args:
+            place: Locality or name to resolve
+            disease: Disease name as used in CITY_DISEASE_DATA
+            level: "HIGH" / "MEDIUM" / "LOW", or None to clear
+            touch: Bump CITY_INDEX.version so cached lookups refresh
+
+        Returns:
+            The index version
+        """
+        node = self._node(place)
+        if node is None or node is self.root:
+            raise KeyError(f"unknown locality: {place!r}")
+        if node.kind == "city":
+            return self.city_index.update(node.name, disease, risk=level)
+        old = dict(node.levels)
+        if level is None:
+            node.levels.pop(disease, None)
+        else:
+            node.levels[disease] = level
+        self._count(node, old, node.levels)
+        return self.city_index.touch() if touch else self.city_index.version
+
+    def update_ward(self, city: str, ward: str, disease: str, level: str) -> int:
+        """Report a ward's level for one disease, adding the ward if it is new."""
+        return self.set_level(self._ward(city, ward), disease, level)
+
+    def risk_levels(self, place) -> dict:
+        """Most specific {disease: level} for a place: ward over city over state."""
+        node = self._node(place)
+        levels = {}
+        while node is not None:
+            own = node.levels
+            if node.kind == "city":
+                entry = self.city_index.exact(node.name)
+                own = entry.risk if entry is not None else {}
+            for disease, level in own.items():
+                levels.setdefault(disease, level)
+            node = node.parent
+        return levels
+
+    def _node(self, place) -> Locality:
+        if place is None:
+            return self.root
+        return place if isinstance(place, Locality) else self.resolve(place)
+
+    def rollup(self, place=None) -> dict:
+        """Worst level reported anywhere within a place (default: everywhere), per disease."""
+        node = self._node(place)
+        if node is None:
+            return {}
+        worst = {}
+        for disease, counts in node.counts.items():
+            for idx in (2, 1, 0):
+                if counts[idx]:
+                    worst[disease] = LEVELS[idx]
+                    break
+        return worst
+
+    def summary(self, place=None) -> dict:
+        """Per disease, how many reporting localities within a place are at each level."""
+        node = self._node(place)
+        if node is None:
+            return {}
+        return {
+            disease: dict(zip(LEVELS, counts))
+            for disease, counts in node.counts.items() if any(counts)
+        }
+
+    # ---------- resolution ----------
+
+    def _exact(self, key: str) -> list:
+        return self._names.get(key, [])
+
+    def _approximate(self, key: str) -> list:
+        if self._fuzzy is None:
+            self._fuzzy = FuzzySymptomIndex({name: name for name in self._names})
+        match = self._fuzzy.lookup(key)
+        return self._names[match.symptom] if match is not None and match.confidence >= 0.75 else []
+
+    @staticmethod
+    def _runs(words: list, lookup) -> tuple:
+        """Longest-first word runs that lookup() knows: (node groups, words left unmatched)."""
+        groups, unmatched = [], []
+        i = 0
+        while i < len(words):
+            for n in range(min(_MAX_NAME_WORDS, len(words) - i), 0, -1):
+                nodes = lookup(" ".join(words[i:i + n]))
+                if nodes:
+                    groups.append(nodes)
+                    i += n
+                    break
+            else:
+                unmatched.append(words[i])
+                i += 1
+        return groups, unmatched
+
+    def resolve(self, text: str, fuzzy: bool = False) -> Locality:
+        """
+        Most specific locality a free-text place name refers to.
+
+        Tries the whole name, then runs of up to four words ("Vastrapur
+        area, Ahmedabad"). Every word must belong to a known name or be a
+        generic qualifier ("area", "near", ...), so "Navi Mumbai" or
+        "Delhi Public School" resolve to None rather than to the city
+        they mention. Of the matched localities the deepest one
+        consistent with all the others wins; a name that stays ambiguous
+        (a ward name shared by two cities) resolves to what the candidates
+        have in common.
+
+        A ward only resolves when its city or state is named too: a bare
+        ward name may just as well be a place outside the hierarchy
+        ("Dwarka" is also a town in Gujarat), and a wrong locality is
+        worse than none.
+
+        Args:
+            text: Place name as entered
+            fuzzy: Also accept misspelled words, but only for localities
+                inside a place matched exactly ("Vastrapr, Ahmedabad"),
+                and ignore words that match nothing; off for scoring lookups
+
+        Returns:
+            Locality, or None for unknown or ambiguous places
+        """
+        key = normalize(text)
+        if not key:
+            return None
+        groups = [self._exact(key)]
+        if not groups[0]:
+            groups, unmatched = self._runs(key.split(), self._exact)
+            if not fuzzy and any(word not in _GENERIC_WORDS for word in unmatched):
+                # "Navi Mumbai" is not Mumbai; an unplaced word means an unknown place
+                return None
+            if fuzzy and groups and unmatched:
+                anchors = [node for nodes in groups for node in nodes]
+                for nodes in self._runs(unmatched, self._approximate)[0]:
+                    nodes = [node for node in nodes if any(node.is_within(a) and node is not a for a in anchors)]
+                    if nodes:
+                        groups.append(nodes)
+        node = self._pick(groups)
+        if node is not None and node.kind == "ward":
+            named = [n for nodes in groups for n in nodes if n.kind != "ward" and node.is_within(n)]
+            if not named:
+                return None
+        return node
+
+    @staticmethod
+    def _pick(groups: list) -> Locality:
+        # Keep candidates that every other group agrees with (lies on their path)
+        candidates = []
+        for nodes in groups:
+            for node in nodes:
+                if all(any(node.is_within(other) or other.is_within(node) for other in group) for group in groups):
+                    candidates.append(node)
+        if not candidates:
+            return None
+        deepest = max(node.depth for node in candidates)
+        chosen = {id(node): node for node in candidates if node.depth == deepest}
+        if len(chosen) == 1:
+            return next(iter(chosen.values()))
+        # Ambiguous: fall back to the common ancestor, if they share one below the root
+        paths = [node.path for node in chosen.values()]
+        common = None
+        for level in zip(*paths):
+            if all(node is level[0] for node in level):
+                common = level[0]
+            else:
+                break
+        return common
+
+    def search(self, prefix: str, limit: int = 10) -> list:
+        """
+        Localities whose name or alias starts with prefix (autocomplete).
+
+        Returns:
+            Up to limit Localities, shallower (states, cities) first
+        """
+        if self._sorted is None:
+            self._sorted = sorted(self._names)
+        key = normalize(prefix)
+        found = {}
+        idx = bisect.bisect_left(self._sorted, key)
+        while idx < len(self._sorted) and self._sorted[idx].startswith(key):
+            for node in self._names[self._sorted[idx]]:
+                found.setdefault(id(node), node)
+            idx += 1
+        return sorted(found.values(), key=lambda node: (node.depth, node.name))[:limit]
+
+    # ---------- CITY_INDEX lookups ----------
+
+    def locate(self, text: str) -> CityRisk:
+        """
+        CITY_INDEX entry for a name that is not an exact city key.
+
+        A plain city alias gets the city's own entry; a ward (or a state
+        with its own levels) gets a merged entry. Results are cached until
+        the index version moves.
+        """
+        if self._cache_version != self.city_index.version or len(self._cache) >= _CACHE_SIZE:
+            self._cache = {}
+            self._cache_version = self.city_index.version
+        if text in self._cache:
+            return self._cache[text]
+        node = self.resolve(text)
+        entry = None
+        if node is not None:
+            if node.kind == "city" and not node.levels:
+                entry = self.city_index.exact(node.name)
+            if entry is None:
+                risk = self.risk_levels(node)
+                if risk:
+                    high_count = sum(1 for level in risk.values() if level == "HIGH")
+                    entry = CityRisk(risk, high_count, self.city_index.version)
+        self._cache[text] = entry
+        return entry
+
+
+LOCALITY_INDEX = LocalityIndex()
+CITY_INDEX.locator = LOCALITY_INDEX.locate
@@ -0,0 +1,148 @@
+"""
+📈 Hot-Path Instrumentation
+Opt-in stage timers, rule-hit and risk-factor counters, Prometheus export
+
+The prediction functions check `metrics.ENABLED` once per call, so leaving
+the hooks in costs one attribute lookup while instrumentation is off.
+"""
+
+import bisect
+import re
+import threading
+import time
+
+ENABLED = False
+
+# Latency histogram bucket upper bounds, in seconds
+BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 1e-2)
+
+_lock = threading.Lock()
+_latency = {}        # stage -> [bucket counts..., +Inf count, sum_seconds]
+_rule_matches = {}   # disease -> calls with at least one of its symptoms
+_rule_fires = {}     # disease -> calls where it was predicted
+_risk_factors = {}   # factor label -> hits
+_categories = {}     # risk category -> hits
+
+# "(7)", "(75+)", "(4 diseases)" etc. would make one series per value
+_COUNT_SUFFIX = re.compile(r"\s*\(\d[^)]*\)")
+
+now = time.perf_counter
+
+
+def enable():
+    """Start recording."""
+    global ENABLED
+    ENABLED = True
+
+
+def disable():
+    """Stop recording (collected data is kept)."""
+    global ENABLED
+    ENABLED = False
+
+
+def reset():
+    """Drop everything recorded so far."""
+    with _lock:
+        for table in (_latency, _rule_matches, _rule_fires, _risk_factors, _categories):
+            table.clear()
+
+
+def observe(stage: str, seconds: float):
+    """Record one latency sample for a stage."""
+    with _lock:
+        row = _latency.get(stage)
+        if row is None:
+            row = _latency[stage] = [0] * (len(BUCKETS) + 1) + [0.0]
+        row[bisect.bisect_left(BUCKETS, seconds)] += 1
+        row[-1] += seconds
+
+
+def record_rules(matched: list, fired: list):
+    """Count the diseases whose rules were matched and fired for one patient."""
+    with _lock:
+        for name in matched:
+            _rule_matches[name] = _rule_matches.get(name, 0) + 1
+        for name in fired:
+            _rule_fires[name] = _rule_fires.get(name, 0) + 1
+
+
+def record_risk(factors: list, category: str):
+    """Count the risk factors and the category of one assessment."""
+    with _lock:
+        for factor in factors:
+            label = _COUNT_SUFFIX.sub("", factor)
+            _risk_factors[label] = _risk_factors.get(label, 0) + 1
+        _categories[category] = _categories.get(category, 0) + 1
+
+
+# ============================================================
+# 📤 EXPORT
+# ============================================================
+
+def snapshot() -> dict:
+    """
+    Return a copy of everything recorded.
+
+    Returns:
+        Dictionary with "latency" ({stage: {"buckets", "count", "sum"}}),
+        "rule_matches", "rule_fires", "risk_factors" and "risk_categories"
+    """
+    with _lock:
+        latency = {}
+        for stage, row in _latency.items():
+            counts = row[:-1]
+            latency[stage] = {
+                "buckets": dict(zip([*BUCKETS, float("inf")], counts)),
+                "count": sum(counts),
+                "sum": row[-1]
+            }
+        return {
+            "latency": latency,
+            "rule_matches": dict(_rule_matches),
+            "rule_fires": dict(_rule_fires),
+            "risk_factors": dict(_risk_factors),
+            "risk_categories": dict(_categories)
+        }
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def prometheus_text(prefix: str = "health") -> str:
+    """
+    Render the current snapshot in the Prometheus text exposition format.
+
+    Args:
+        prefix: Metric name prefix
+
+    Returns:
+        Exposition text, ready to serve from a /metrics endpoint
+    """
+    snap = snapshot()
+    lines = [
+        f"# HELP {prefix}_stage_latency_seconds Latency of each pipeline stage.",
+        f"# TYPE {prefix}_stage_latency_seconds histogram"
+    ]
+    for stage, hist in sorted(snap["latency"].items()):
+        cumulative = 0
+        for bound, count in hist["buckets"].items():
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f'{prefix}_stage_latency_seconds_bucket{{stage="{_label(stage)}",le="{le}"}} {cumulative}')
+        lines.append(f'{prefix}_stage_latency_seconds_sum{{stage="{_label(stage)}"}} {hist["sum"]!r}')
+        lines.append(f'{prefix}_stage_latency_seconds_count{{stage="{_label(stage)}"}} {hist["count"]}')
+
+    counters = [
+        ("rule_matches_total", "disease", "rule_matches", "Patients with at least one symptom of the disease rule."),
+        ("rule_fires_total", "disease", "rule_fires", "Patients for whom the disease was predicted."),
+        ("risk_factor_total", "factor", "risk_factors", "Risk factor hits in calculate_risk_score."),
+        ("risk_category_total", "category", "risk_categories", "Risk categories assigned.")
+    ]
+    for name, label, key, help_text in counters:
+        lines.append(f"# HELP {prefix}_{name} {help_text}")
+        lines.append(f"# TYPE {prefix}_{name} counter")
+        for value, count in sorted(snap[key].items()):
+            lines.append(f'{prefix}_{name}{{{label}="{_label(value)}"}} {count}')
+    return "\n".join(lines) + "\n"
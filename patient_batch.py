@@ -0,0 +1,330 @@
+"""
+🗃️ PatientBatch
+Struct-of-arrays storage for patients, predictions and risk results
+"""
+
+import math
+import re
+from enum import IntEnum
+import numpy as np
+from data import SYMPTOM_LIST
+from prediction import RULESET
+
+
+DISEASES = [rule.name for rule in RULESET.rules]
+GENDERS = ["", "M", "F"]
+CATEGORIES = ["LOW", "MEDIUM", "HIGH"]
+
+
+# ============================================================
+# 🏷️ RISK FACTOR CODES
+# ============================================================
+
+class RiskFactor(IntEnum):
+    VERY_ELDERLY = 1
+    ELDERLY = 2
+    SENIOR = 3
+    INFANT = 4
+    YOUNG_CHILD = 5
+    MANY_SYMPTOMS = 6          # arg: symptom count
+    MULTIPLE_SYMPTOMS = 7      # arg: symptom count
+    CRITICAL_SYMPTOM = 8       # arg: index into SYMPTOM_LIST
+    HYPERTENSIVE_CRISIS = 9
+    HIGH_BP = 10
+    LOW_BP = 11
+    TACHYCARDIA = 12
+    ELEVATED_HEART_RATE = 13
+    BRADYCARDIA = 14
+    CITY_OUTBREAK_ZONE = 15    # arg: number of HIGH-risk diseases
+    CITY_ACTIVE_OUTBREAKS = 16
+    HIGH_PROBABILITY = 17      # arg: index into DISEASES
+    LIKELY = 18                # arg: index into DISEASES
+    OTHER = 19                 # arg: index into the batch's extra strings
+
+
+# Rendering of each code, exactly as calculate_risk_score words it
+FACTOR_TEXT = {
+    RiskFactor.VERY_ELDERLY: "Very Elderly (75+)",
+    RiskFactor.ELDERLY: "Elderly (65+)",
+    RiskFactor.SENIOR: "Senior (55+)",
+    RiskFactor.INFANT: "Infant (0-2 years)",
+    RiskFactor.YOUNG_CHILD: "Young Child (2-5 years)",
+    RiskFactor.MANY_SYMPTOMS: "Many symptoms ({arg})",
+    RiskFactor.MULTIPLE_SYMPTOMS: "Multiple symptoms ({arg})",
+    RiskFactor.CRITICAL_SYMPTOM: "Critical: {symptom}",
+    RiskFactor.HYPERTENSIVE_CRISIS: "⚠️ Hypertensive Crisis",
+    RiskFactor.HIGH_BP: "High Blood Pressure",
+    RiskFactor.LOW_BP: "Low Blood Pressure",
+    RiskFactor.TACHYCARDIA: "Tachycardia (Rapid Heart)",
+    RiskFactor.ELEVATED_HEART_RATE: "Elevated Heart Rate",
+    RiskFactor.BRADYCARDIA: "Bradycardia (Slow Heart)",
+    RiskFactor.CITY_OUTBREAK_ZONE: "City outbreak zone ({arg} diseases)",
+    RiskFactor.CITY_ACTIVE_OUTBREAKS: "City has active outbreaks",
+    RiskFactor.HIGH_PROBABILITY: "High probability: {disease}",
+    RiskFactor.LIKELY: "Likely: {disease}"
+}
+
+_FIXED_FACTORS = {text: code for code, text in FACTOR_TEXT.items() if "{" not in text}
+_PATTERN_FACTORS = [
+    (re.compile(r"Many symptoms \((\d+)\)$"), RiskFactor.MANY_SYMPTOMS, int),
+    (re.compile(r"Multiple symptoms \((\d+)\)$"), RiskFactor.MULTIPLE_SYMPTOMS, int),
+    (re.compile(r"City outbreak zone \((\d+) diseases\)$"), RiskFactor.CITY_OUTBREAK_ZONE, int),
+    (re.compile(r"Critical: (.+)$"), RiskFactor.CRITICAL_SYMPTOM, None),
+    (re.compile(r"High probability: (.+)$"), RiskFactor.HIGH_PROBABILITY, None),
+    (re.compile(r"Likely: (.+)$"), RiskFactor.LIKELY, None)
+]
+
+_SYMPTOM_CODES = {s.lower(): i for i, s in enumerate(SYMPTOM_LIST)}
+_DISEASE_CODES = {name: i for i, name in enumerate(DISEASES)}
+
+
+# ============================================================
+# 🧵 COLUMNS
+# ============================================================
+
+class StringColumn:
+    """Variable-length strings packed into one UTF-8 buffer plus offsets."""
+
+    def __init__(self, values: list = ()):
+        encoded = [str(v).encode("utf-8") for v in values]
+        self.offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(e) for e in encoded], out=self.offsets[1:])
+        self.buffer = b"".join(encoded)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        return self.buffer[self.offsets[i]:self.offsets[i + 1]].decode("utf-8")
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.buffer) + self.offsets.nbytes
+
+
+class Interner:
+    """Maps repeated strings (cities, unknown symptoms) to small integer codes."""
+
+    def __init__(self, values: list = ()):
+        self.values = []
+        self.codes = {}
+        for v in values:
+            self.code(v)
+
+    def code(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+def _ragged(rows: list, dtype) -> tuple:
+    """Pack a list of int lists as (flat values, offsets)."""
+    offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum([len(r) for r in rows], out=offsets[1:])
+    flat = np.fromiter((v for r in rows for v in r), dtype=dtype, count=int(offsets[-1]))
+    return flat, offsets
+
+
+# ============================================================
+# 🗃️ BATCH
+# ============================================================
+
+class PatientBatch:
+    """
+    Column-oriented storage for a set of assessed patients.
+
+    Symptoms are uint16 codes into SYMPTOM_LIST (unknown free-text
+    symptoms are interned after it, so there can be thousands), vitals
+    live in small integer arrays (0 = not recorded), cities are interned,
+    predictions are a patients × DISEASES uint8 matrix (0 = not
+    predicted), and risk factors are (RiskFactor, arg) pairs that only
+    become strings when converted back to dicts.
+    """
+
+    def __init__(self):
+        self.names = StringColumn()
+        self.timestamps = StringColumn()
+        self.age = np.zeros(0, dtype=np.int16)
+        self.gender = np.zeros(0, dtype=np.uint8)
+        self.bp_systolic = np.zeros(0, dtype=np.int16)
+        self.bp_diastolic = np.zeros(0, dtype=np.int16)
+        self.pulse = np.zeros(0, dtype=np.int16)
+        self.city = np.zeros(0, dtype=np.uint16)
+        self.cities = Interner()
+        self.extra_symptoms = Interner()
+        self.extra_factors = Interner()
+        self.symptoms = np.zeros(0, dtype=np.uint16)
+        self.symptom_offsets = np.zeros(1, dtype=np.int64)
+        self.probabilities = np.zeros((0, len(DISEASES)), dtype=np.uint8)
+        self.risk_score = np.zeros(0, dtype=np.uint8)
+        self.risk_category = np.zeros(0, dtype=np.uint8)
+        self.factor_codes = np.zeros(0, dtype=np.uint8)
+        self.factor_args = np.zeros(0, dtype=np.int32)
+        self.factor_offsets = np.zeros(1, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.age)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the columns."""
+        arrays = (
+            self.age, self.gender, self.bp_systolic, self.bp_diastolic, self.pulse, self.city,
+            self.symptoms, self.symptom_offsets, self.probabilities, self.risk_score,
+            self.risk_category, self.factor_codes, self.factor_args, self.factor_offsets
+        )
+        return sum(a.nbytes for a in arrays) + self.names.nbytes + self.timestamps.nbytes
+
+    # ---------- encoding ----------
+
+    def _symptom_code(self, symptom: str) -> int:
+        code = _SYMPTOM_CODES.get(symptom.lower())
+        if code is None:
+            code = len(SYMPTOM_LIST) + self.extra_symptoms.code(symptom)
+        return code
+
+    def _factor_code(self, factor: str) -> tuple:
+        code = _FIXED_FACTORS.get(factor)
+        if code is not None:
+            return code, 0
+        for pattern, code, convert in _PATTERN_FACTORS:
+            match = pattern.match(factor)
+            if not match:
+                continue
+            value = match.group(1)
+            if convert is int:
+                return code, int(value)
+            if code == RiskFactor.CRITICAL_SYMPTOM and value.lower() in _SYMPTOM_CODES:
+                return code, _SYMPTOM_CODES[value.lower()]
+            if code != RiskFactor.CRITICAL_SYMPTOM and value in _DISEASE_CODES:
+                return code, _DISEASE_CODES[value]
+        return RiskFactor.OTHER, self.extra_factors.code(factor)
+
+    @classmethod
+    def from_dicts(cls, patients: list, predictions: list = None, risks: list = None) -> "PatientBatch":
+        """
+        Build a batch from the dict shapes used across the app.
+
+        Args:
+            patients: patient_data / parse_voice_input dicts (name, age,
+                gender, city, symptoms, bp "120/80", pulse, timestamp)
+            predictions: Matching predict_disease dicts, if scored
+            risks: Matching calculate_risk_score dicts, if scored
+
+        Returns:
+            PatientBatch
+        """
+        batch = cls()
+        n = len(patients)
+
+        def vital(value):
+            # Transcribed vitals may be digit strings ("80"); "N/A" and the like are not recorded
+            if isinstance(value, str):
+                value = value.strip()
+                return int(value) if value.isdigit() else 0
+            return int(value) if isinstance(value, (int, float)) and math.isfinite(value) else 0
+
+        systolic, diastolic = [], []
+        for p in patients:
+            parts = str(p.get("bp", "")).split("/")
+            ok = len(parts) == 2 and parts[0].isdigit() and parts[1].isdigit()
+            systolic.append(int(parts[0]) if ok else vital(p.get("bp_systolic")))
+            diastolic.append(int(parts[1]) if ok else vital(p.get("bp_diastolic")))
+
+        batch.names = StringColumn([p.get("name", "") for p in patients])
+        batch.timestamps = StringColumn([p.get("timestamp", "") for p in patients])
+        batch.age = np.array([vital(p.get("age")) for p in patients], dtype=np.int16)
+        batch.gender = np.array([GENDERS.index(p.get("gender", "")) if p.get("gender", "") in GENDERS else 0
+                                 for p in patients], dtype=np.uint8)
+        batch.bp_systolic = np.array(systolic, dtype=np.int16)
+        batch.bp_diastolic = np.array(diastolic, dtype=np.int16)
+        batch.pulse = np.array([vital(p.get("pulse")) for p in patients], dtype=np.int16)
+        batch.city = np.array([batch.cities.code(p.get("city", "")) for p in patients], dtype=np.uint16)
+        batch.symptoms, batch.symptom_offsets = _ragged(
+            [[batch._symptom_code(s) for s in p.get("symptoms", [])] for p in patients], np.uint16
+        )
+
+        batch.probabilities = np.zeros((n, len(DISEASES)), dtype=np.uint8)
+        for i, pred in enumerate(predictions or []):
+            for name, prob in pred.items():
+                batch.probabilities[i, _DISEASE_CODES[name]] = prob
+
+        risks = risks or []
+        batch.risk_score = np.array([r["score"] for r in risks] + [0] * (n - len(risks)), dtype=np.uint8)
+        batch.risk_category = np.array(
+            [CATEGORIES.index(r["category"]) for r in risks] + [0] * (n - len(risks)), dtype=np.uint8
+        )
+        factors = [[batch._factor_code(f) for f in r.get("factors", [])] for r in risks]
+        factors += [[]] * (n - len(risks))
+        batch.factor_codes, batch.factor_offsets = _ragged([[c for c, _ in row] for row in factors], np.uint8)
+        batch.factor_args, _ = _ragged([[a for _, a in row] for row in factors], np.int32)
+        return batch
+
+    # ---------- decoding ----------
+
+    def symptom_names(self, i: int) -> list:
+        codes = self.symptoms[self.symptom_offsets[i]:self.symptom_offsets[i + 1]].tolist()
+        base = len(SYMPTOM_LIST)
+        return [SYMPTOM_LIST[c] if c < base else self.extra_symptoms.values[c - base] for c in codes]
+
+    def patient(self, i: int) -> dict:
+        """Patient i as a patient_data dict (missing vitals come back as 0 / "")."""
+        systolic, diastolic = int(self.bp_systolic[i]), int(self.bp_diastolic[i])
+        return {
+            "name": self.names[i],
+            "age": int(self.age[i]),
+            "gender": GENDERS[self.gender[i]],
+            "city": self.cities.values[self.city[i]],
+            "symptoms": self.symptom_names(i),
+            "bp": f"{systolic}/{diastolic}" if systolic and diastolic else "",
+            "pulse": int(self.pulse[i]),
+            "timestamp": self.timestamps[i]
+        }
+
+    def predictions(self, i: int) -> dict:
+        """Patient i's predictions as a predict_disease-style sorted dict."""
+        row = self.probabilities[i].tolist()
+        pairs = [(name, prob) for name, prob in zip(DISEASES, row) if prob]
+        return dict(sorted(pairs, key=lambda x: x[1], reverse=True))
+
+    def factors(self, i: int) -> list:
+        """Patient i's risk factors rendered as strings."""
+        start, end = self.factor_offsets[i], self.factor_offsets[i + 1]
+        rendered = []
+        for code, arg in zip(self.factor_codes[start:end].tolist(), self.factor_args[start:end].tolist()):
+            if code == RiskFactor.OTHER:
+                rendered.append(self.extra_factors.values[arg])
+            elif code == RiskFactor.CRITICAL_SYMPTOM:
+                rendered.append(FACTOR_TEXT[code].format(symptom=SYMPTOM_LIST[arg].title()))
+            elif code in (RiskFactor.HIGH_PROBABILITY, RiskFactor.LIKELY):
+                rendered.append(FACTOR_TEXT[code].format(disease=DISEASES[arg]))
+            else:
+                rendered.append(FACTOR_TEXT[RiskFactor(code)].format(arg=arg))
+        return rendered
+
+    def risk(self, i: int) -> dict:
+        """Patient i's risk as a calculate_risk_score-style dict."""
+        return {
+            "score": int(self.risk_score[i]),
+            "category": CATEGORIES[self.risk_category[i]],
+            "factors": self.factors(i)
+        }
+
+    def to_dicts(self) -> tuple:
+        """Return (patients, predictions, risks) lists in the app's dict shapes."""
+        n = len(self)
+        return (
+            [self.patient(i) for i in range(n)],
+            [self.predictions(i) for i in range(n)],
+            [self.risk(i) for i in range(n)]
+        )
+
+    def symptom_matrix(self) -> np.ndarray:
+        """Patients × SYMPTOM_LIST boolean matrix, for the batch scorers."""
+        matrix = np.zeros((len(self), len(SYMPTOM_LIST)), dtype=bool)
+        rows = np.repeat(np.arange(len(self)), np.diff(self.symptom_offsets))
+        known = self.symptoms < len(SYMPTOM_LIST)
+        matrix[rows[known], self.symptoms[known]] = True
+        return matrix
@@ -0,0 +1,152 @@
+"""
+🏕️ Bulk Screening Pipeline
+Streams per-patient records out of a multi-patient camp dictation
+"""
+
+import itertools
+import re
+from prediction import (
+    calculate_risk_score,
+    generate_patient_summary,
+    parse_voice_input,
+    predict_disease
+)
+
+
+# ============================================================
+# ✂️ TRANSCRIPT SEGMENTATION
+# ============================================================
+# A new patient starts at "patient 3" / "patient number 3" / "मरीज 3" /
+# "next patient". The "patients 1 to 40" header is not a boundary. A
+# marker that ends the buffer only counts once the stream has ended, so a
+# number split across two chunks ("patient 1" + "2 ...") is not cut short.
+
+BOUNDARY_PATTERN = re.compile(
+    r"\b(?:next\s+patient|(?:patient|मरीज|દર્દી)\s*(?:no\.?|number|#)?\s*(\d+)(?!\s*(?:to|-)\s*\d))(?=\W|$)",
+    re.IGNORECASE
+)
+
+# Longest marker we expect, so a rescan can start just before new text
+_BOUNDARY_LOOKBACK = 48
+
+
+def segment_transcript(chunks):
+    """
+    Split a streaming camp dictation into per-patient segments.
+
+    Text before the first marker is a patient of its own, unless it is a
+    bulk header ("patients 1 to 40"), which only sets the numbering.
+
+    Args:
+        chunks: Iterable of transcript text chunks, in arrival order
+
+    Yields:
+        Dictionaries with "index" (patient number) and "text" (the segment
+        after its marker), each as soon as the next marker arrives
+    """
+    buffer = ""
+    scan_from = 0
+    current = None  # patient number of the open segment; None = before any marker
+    next_index = 1
+
+    # A final None pass lets a marker at the very end of the stream close its segment
+    for chunk in itertools.chain(chunks, [None]):
+        if chunk is not None:
+            buffer += chunk
+        body_start = 0  # where the open segment's text starts in buffer
+        for match in BOUNDARY_PATTERN.finditer(buffer, scan_from):
+            if chunk is not None and match.end() == len(buffer):
+                break  # the marker's number may go on in the next chunk
+            segment = buffer[body_start:match.start()].strip()
+            if current is None:
+                # Header: pick up the camp range so numbering starts there
+                header = parse_voice_input(segment)
+                if header["bulk_mode"]:
+                    next_index = header["patient_range"][0]
+                elif segment:
+                    yield {"index": next_index, "text": segment}
+                    next_index += 1
+            elif segment:
+                yield {"index": current, "text": segment}
+            current = int(match.group(1)) if match.group(1) else next_index
+            next_index = current + 1
+            body_start = match.end()
+        # Only the open segment is kept; rescan just its recent tail
+        buffer = buffer[body_start:]
+        scan_from = max(len(buffer) - _BOUNDARY_LOOKBACK, 0)
+
+    if buffer.strip():
+        # Without any marker the whole dictation is a single patient
+        yield {"index": current if current is not None else next_index, "text": buffer.strip()}
+
+
+# ============================================================
+# 🔄 STREAMING SCORING
+# ============================================================
+
+def parse_bp(bp: str) -> tuple:
+    """
+    Split a "120/80" reading into (systolic, diastolic); (0, 0) if missing.
+    """
+    parts = bp.split("/") if bp else []
+    if len(parts) == 2 and parts[0].isdigit() and parts[1].isdigit():
+        return int(parts[0]), int(parts[1])
+    return 0, 0
+
+
+def screen_transcript(chunks, city: str, timestamp: str = "N/A"):
+    """
+    Score each patient of a camp dictation as soon as their segment closes.
+
+    Args:
+        chunks: Iterable of transcript text chunks
+        city: Camp city, used for outbreak bonuses
+        timestamp: Timestamp to stamp on each summary
+
+    Yields:
+        Dictionaries with "index", "patient", "predictions", "risk" and "summary"
+    """
+    for segment in segment_transcript(chunks):
+        patient = parse_voice_input(segment["text"])
+        bp_systolic, bp_diastolic = parse_bp(patient["bp"])
+        patient.update({
+            "city": city,
+            "pulse": "N/A",
+            "timestamp": timestamp
+        })
+        if not patient["name"]:
+            patient["name"] = f"Patient {segment['index']}"
+
+        predictions = predict_disease(patient["symptoms"], city, patient["age"])
+        risk = calculate_risk_score(
+            patient["symptoms"],
+            patient["age"],
+            bp_systolic,
+            bp_diastolic,
+            0,
+            city,
+            predictions
+        )
+        yield {
+            "index": segment["index"],
+            "patient": patient,
+            "predictions": predictions,
+            "risk": risk,
+            "summary": generate_patient_summary(patient, predictions, risk)
+        }
+
+
+def high_risk_alerts(records, categories: tuple = ("HIGH",)):
+    """
+    Pass through only the records whose risk category needs an alert.
+
+    Args:
+        records: Records from screen_transcript
+        categories: Risk categories that should alert
+
+    Yields:
+        Matching records, without waiting for the rest of the stream
+    """
+    for record in records:
+        if record["risk"]["category"] in categories:
+            yield record
@@ -0,0 +1,207 @@
+"""
+⚡ Quick Triage
+Fast path for "how urgent, and what is it most likely": top-k diseases and the risk category
+
+Usage:
+    result = quick_triage(["Fever", "Headache"], 34, 130, 85, 96, "Ahmedabad")
+    if result.category == "HIGH":
+        send_alert(result.top[0])
+    result.risk          # full calculate_risk_score output, computed on demand
+"""
+
+import bisect
+import heapq
+from functools import cached_property, lru_cache
+from city_index import CITY_INDEX
+from prediction import (
+    CRITICAL_SYMPTOMS,
+    RULESET,
+    age_cuts,
+    age_risk,
+    bp_risk,
+    calculate_risk_score,
+    outbreak_risk,
+    predict_disease,
+    prediction_risk,
+    pulse_risk,
+    risk_category,
+    score_rules,
+    symptom_mask,
+    symptom_risk
+)
+
+AGE_CUTS = age_cuts()
+# One age per band; every age in a band gets the same rule age modifiers
+_BAND_AGES = [AGE_CUTS[0] - 1 if AGE_CUTS else 0] + AGE_CUTS
+
+# Critical symptom points by symptom bit, so symptom points come straight from the mask
+_CRITICAL_BITS = tuple(
+    (1 << RULESET.symptom_bits[symptom], points)
+    for symptom, points in CRITICAL_SYMPTOMS.items()
+    if symptom in RULESET.symptom_bits
+)
+_CRITICAL_NAMES = tuple(
+    (symptom, points) for symptom, points in CRITICAL_SYMPTOMS.items()
+    if symptom not in RULESET.symptom_bits
+)
+
+# Thresholds read off the live risk functions, so changing those changes these
+# The most the prediction component can add (prediction_risk's top tier)
+_MAX_PREDICTION_POINTS = max(prediction_risk({"": prob})[0] for prob in range(101))
+# Lowest score risk_category calls HIGH; no component subtracts points
+_HIGH_SCORE = min(score for score in range(101) if risk_category(score) == "HIGH")
+
+
+@lru_cache(maxsize=256)
+def _count_points(symptom_count: int) -> int:
+    """symptom_risk's points for the symptom count alone (no critical symptoms)."""
+    return symptom_risk([""] * symptom_count)[0]
+
+
+def top_k(predictions: dict, k: int) -> list:
+    """
+    The k most likely diseases, in predict_disease order.
+
+    Args:
+        predictions: {disease: probability} in rule order (score_rules output)
+        k: How many to keep
+
+    Returns:
+        List of (disease, probability), highest first, ties in rule order
+    """
+    if k == 1:
+        return [max(predictions.items(), key=lambda x: x[1])] if predictions else []
+    return heapq.nlargest(k, predictions.items(), key=lambda x: x[1])
+
+
+@lru_cache(maxsize=16384)
+def _cached_top(mask: int, repeats: tuple, city: str, city_version: int, age_band: int, k: int) -> tuple:
+    predictions = score_rules(mask, list(repeats), CITY_INDEX.risk_levels(city), _BAND_AGES[age_band])
+    return tuple(top_k(predictions, k))
+
+
+def top_diseases(symptoms: list, city: str, age: int, k: int = 1) -> list:
+    """
+    The first k entries of predict_disease(symptoms, city, age), without building the rest.
+
+    Results are memoized per (symptom set, city data version, age band),
+    which kiosk traffic repeats constantly; a city update in CITY_INDEX
+    gives that city fresh entries.
+    """
+    mask, repeats, _ = _encode(tuple(symptoms))
+    return list(_top_for_mask(mask, repeats, city, age, k))
+
+
+def _top_for_mask(mask: int, repeats: tuple, city: str, age: int, k: int) -> tuple:
+    return _cached_top(mask, repeats, city, CITY_INDEX.get(city).version, bisect.bisect_right(AGE_CUTS, age), k)
+
+
+def symptom_points(symptom_count: int, mask: int, symptoms: list = ()) -> int:
+    """symptom_risk's points, reading critical symptoms from the mask."""
+    points = _count_points(symptom_count)
+    for bit, score in _CRITICAL_BITS:
+        if mask & bit:
+            points += score
+    if _CRITICAL_NAMES:
+        lowered = [s.lower() for s in symptoms]
+        points += sum(score for symptom, score in _CRITICAL_NAMES if symptom in lowered)
+    return points
+
+
+@lru_cache(maxsize=16384)
+def _encode(symptoms: tuple) -> tuple:
+    """(mask, repeats, symptom points) for a symptom list, memoized."""
+    mask, repeats = symptom_mask(symptoms)
+    return mask, tuple(repeats), symptom_points(len(symptoms), mask, symptoms)
+
+
+class QuickTriage:
+    """
+    Triage answer with the full explanation deferred.
+
+    `category` and `top` are computed up front; `predictions`, `risk`,
+    `score` and `factors` are the full predict_disease and
+    calculate_risk_score outputs, computed the first time they are read.
+    """
+
+    def __init__(self, category: str, top: list, inputs: tuple):
+        self.category = category
+        self.top = top
+        self._inputs = inputs   # (symptoms, age, bp_systolic, bp_diastolic, pulse, city)
+
+    def __repr__(self) -> str:
+        return f"QuickTriage(category={self.category!r}, top={self.top!r})"
+
+    @property
+    def high(self) -> bool:
+        return self.category == "HIGH"
+
+    @property
+    def top_disease(self) -> str:
+        return self.top[0][0] if self.top else None
+
+    @cached_property
+    def predictions(self) -> dict:
+        symptoms, age, _, _, _, city = self._inputs
+        return predict_disease(symptoms, city, age)
+
+    @cached_property
+    def risk(self) -> dict:
+        symptoms, age, bp_systolic, bp_diastolic, pulse, city = self._inputs
+        return calculate_risk_score(symptoms, age, bp_systolic, bp_diastolic, pulse, city, self.predictions)
+
+    @property
+    def score(self) -> int:
+        return self.risk["score"]
+
+    @property
+    def factors(self) -> list:
+        return self.risk["factors"]
+
+
+def quick_triage(
+    symptoms: list,
+    age: int,
+    bp_systolic: int,
+    bp_diastolic: int,
+    pulse: int,
+    city: str,
+    k: int = 1
+) -> QuickTriage:
+    """
+    Risk category and top-k diseases, as predict_disease + calculate_risk_score would give them.
+
+    Risk components are added cheapest first without building factor text,
+    and the category is returned as soon as the score reaches the HIGH
+    threshold, since no component subtracts points. The disease ranking
+    only selects the top k instead of sorting every prediction. Symptom
+    encodings and rankings are memoized, so repeat presentations skip the
+    rule engine entirely.
+
+    Args:
+        symptoms: List of symptoms
+        age: Patient age
+        bp_systolic: Systolic blood pressure
+        bp_diastolic: Diastolic blood pressure
+        pulse: Heart rate
+        city: Patient city
+        k: Number of top diseases to return (0 skips them unless the
+           category depends on the top prediction)
+
+    Returns:
+        QuickTriage with category and top filled in
+    """
+    inputs = (symptoms, age, bp_systolic, bp_diastolic, pulse, city)
+    mask, repeats, points = _encode(tuple(symptoms))
+    top = list(_top_for_mask(mask, repeats, city, age, k)) if k else []
+
+    score = age_risk(age)[0] + bp_risk(bp_systolic, bp_diastolic)[0] + pulse_risk(pulse)[0] + points
+    if score < _HIGH_SCORE:
+        score += outbreak_risk(city)[0]
+    # The top prediction only matters if its points could still change the category
+    # (risk_category only compares against thresholds below the 100 cap)
+    category = risk_category(score)
+    if category != risk_category(score + _MAX_PREDICTION_POINTS):
+        best = top[:1] or _top_for_mask(mask, repeats, city, age, 1)
+        category = risk_category(score + prediction_risk(dict(best))[0])
+    return QuickTriage(category, top, inputs)
@@ -0,0 +1,306 @@
+"""
+📨 Batch Summary Renderer
+Per-language WhatsApp templates and SMS-segment-aware compact alerts
+"""
+
+import math
+import unicodedata
+
+
+# ============================================================
+# 🌐 TEMPLATES
+# ============================================================
+# {placeholders} are filled per patient; generate_patient_summary renders
+# through the English full template.
+
+TEMPLATES = {
+    "english": {
+        "full": """🏥 *PATIENT ALERT - {category} RISK* {emoji}
+
+👤 *Patient:* {name}
+📅 *Age/Gender:* {age} / {gender}
+📍 *City:* {city}
+
+🩺 *Symptoms:* {symptoms}
+💓 *Vitals:* BP {bp} | Pulse {pulse} bpm
+
+⚠️ *Predicted Condition:*
+   {top_disease} ({top_prob}% probability)
+
+📊 *Risk Score:* {score}/100 ({category})
+
+🚨 *Risk Factors:*
+{factors}
+
+📞 *Action Required:* Immediate medical attention recommended
+
+_Generated by Health Monitor System_
+_Time: {timestamp}_""",
+        "compact": "{category} RISK {score}/100: {name} {age}{gender} {city}. {top_disease} {top_prob}%.",
+        "compact_vitals": " BP {bp} P {pulse}.",
+        "compact_symptoms": " Sx: {symptoms}.",
+        "compact_factors": " RF: {factors}.",
+        "assessment_needed": "Assessment Needed",
+        "not_recorded": "Not recorded",
+        "no_factors": "None identified"
+    },
+    "hindi": {
+        "full": """🏥 *मरीज अलर्ट - {category} जोखिम* {emoji}
+
+👤 *मरीज:* {name}
+📅 *उम्र/लिंग:* {age} / {gender}
+📍 *शहर:* {city}
+
+🩺 *लक्षण:* {symptoms}
+💓 *जांच:* BP {bp} | पल्स {pulse} bpm
+
+⚠️ *संभावित बीमारी:*
+   {top_disease} ({top_prob}% संभावना)
+
+📊 *जोखिम स्कोर:* {score}/100 ({category})
+
+🚨 *जोखिम कारक:*
+{factors}
+
+📞 *आवश्यक कार्रवाई:* तुरंत डॉक्टर को दिखाएं
+
+_हेल्थ मॉनिटर सिस्टम द्वारा तैयार_
+_समय: {timestamp}_""",
+        "compact": "{category} जोखिम {score}/100: {name} {age}{gender} {city}. {top_disease} {top_prob}%.",
+        "compact_vitals": " BP {bp} पल्स {pulse}.",
+        "compact_symptoms": " लक्षण: {symptoms}.",
+        "compact_factors": " कारक: {factors}.",
+        "assessment_needed": "जांच आवश्यक",
+        "not_recorded": "दर्ज नहीं",
+        "no_factors": "कोई नहीं"
+    },
+    "gujarati": {
+        "full": """🏥 *દર્દી એલર્ટ - {category} જોખમ* {emoji}
+
+👤 *દર્દી:* {name}
+📅 *ઉંમર/જાતિ:* {age} / {gender}
+📍 *શહેર:* {city}
+
+🩺 *લક્ષણો:* {symptoms}
+💓 *તપાસ:* BP {bp} | પલ્સ {pulse} bpm
+
+⚠️ *સંભવિત રોગ:*
+   {top_disease} ({top_prob}% શક્યતા)
+
+📊 *જોખમ સ્કોર:* {score}/100 ({category})
+
+🚨 *જોખમ પરિબળો:*
+{factors}
+
+📞 *જરૂરી પગલાં:* તાત્કાલિક ડૉક્ટરને બતાવો
+
+_હેલ્થ મોનિટર સિસ્ટમ દ્વારા તૈયાર_
+_સમય: {timestamp}_""",
+        "compact": "{category} જોખમ {score}/100: {name} {age}{gender} {city}. {top_disease} {top_prob}%.",
+        "compact_vitals": " BP {bp} પલ્સ {pulse}.",
+        "compact_symptoms": " લક્ષણો: {symptoms}.",
+        "compact_factors": " પરિબળો: {factors}.",
+        "assessment_needed": "તપાસ જરૂરી",
+        "not_recorded": "નોંધાયેલ નથી",
+        "no_factors": "કોઈ નથી"
+    }
+}
+
+RISK_EMOJI = {"HIGH": "🔴", "MEDIUM": "🟡"}
+
+
+def language_key(language: str) -> str:
+    """Map a UI language label ("हिंदी", "Gujarati", ...) to a TEMPLATES key."""
+    if "हिंदी" in language or "hindi" in language.lower():
+        return "hindi"
+    if "ગુજરાતી" in language or "gujarati" in language.lower():
+        return "gujarati"
+    return "english"
+
+
+# ============================================================
+# 📏 SMS SEGMENTS
+# ============================================================
+# GSM 03.38 text fits 160 septets (153 per part when split); anything else
+# is sent as UCS-2 with 70 UTF-16 units (67 per part).
+
+GSM7_BASIC = set(
+    "@£$¥èéùìòÇ\nØø\rÅåΔ_ΦΓΛΩΠΨΣΘΞÆæßÉ !\"#¤%&'()*+,-./0123456789:;<=>?"
+    "¡ABCDEFGHIJKLMNOPQRSTUVWXYZÄÖÑÜ§¿abcdefghijklmnopqrstuvwxyzäöñüà"
+)
+GSM7_EXTENDED = set("^{}\\[~]|€\f")
+
+
+def is_gsm7(text: str) -> bool:
+    """True if text can be sent in the GSM 7-bit alphabet."""
+    return all(ch in GSM7_BASIC or ch in GSM7_EXTENDED for ch in text)
+
+
+def sms_segments(text: str) -> int:
+    """Number of billed SMS segments for text."""
+    if is_gsm7(text):
+        septets = len(text) + sum(1 for ch in text if ch in GSM7_EXTENDED)
+        return 1 if septets <= 160 else math.ceil(septets / 153)
+    units = len(text.encode("utf-16-le")) // 2
+    return 1 if units <= 70 else math.ceil(units / 67)
+
+
+def _gsm_safe(text: str) -> str:
+    """
+    Drop symbols (emoji etc.) that would force a GSM message into UCS-2.
+
+    Letters outside GSM-7 (a Devanagari or Gujarati name) are kept; the
+    alert then goes out as UCS-2 rather than without the patient's name.
+    """
+    return "".join(
+        ch for ch in text
+        if ch in GSM7_BASIC or ch in GSM7_EXTENDED
+        or (unicodedata.category(ch)[0] in "LMN" and not "\ufe00" <= ch <= "\ufe0f")
+    ).strip()
+
+
+# ============================================================
+# 🖨️ RENDERER
+# ============================================================
+
+class SummaryRenderer:
+    """
+    Renders patient alerts from a language's precompiled templates.
+
+    The language's fixed strings are resolved once here, so each render
+    only formats the per-patient fields.
+    """
+
+    def __init__(self, language: str = "english", max_factors: int = 5):
+        self.language = language_key(language)
+        self.max_factors = max_factors
+        t = TEMPLATES[self.language]
+        self._full = t["full"]
+        self._compact = t["compact"]
+        self._compact_optional = (t["compact_vitals"], t["compact_symptoms"], t["compact_factors"])
+        self._assessment_needed = t["assessment_needed"]
+        self._not_recorded = t["not_recorded"]
+        self._no_factors = f"  • {t['no_factors']}"
+        self._gsm = self.language == "english"
+
+    def _fields(self, patient_data: dict, predictions: dict, risk: dict) -> dict:
+        top_disease, top_prob = next(iter(predictions.items()), (self._assessment_needed, 0))
+        return {
+            "category": risk["category"],
+            "emoji": RISK_EMOJI.get(risk["category"], "🟢"),
+            "name": patient_data.get("name", "N/A"),
+            "age": patient_data.get("age", "N/A"),
+            "gender": patient_data.get("gender", "N/A"),
+            "city": patient_data.get("city", "N/A"),
+            "symptoms": ", ".join(patient_data.get("symptoms", [])) or self._not_recorded,
+            "bp": patient_data.get("bp", "N/A"),
+            "pulse": patient_data.get("pulse", "N/A"),
+            "top_disease": top_disease,
+            "top_prob": top_prob,
+            "score": risk["score"],
+            "timestamp": patient_data.get("timestamp", "N/A")
+        }
+
+    def render(self, patient_data: dict, predictions: dict, risk: dict) -> str:
+        """
+        Full WhatsApp-style summary.
+
+        Args:
+            patient_data: Patient information dictionary
+            predictions: Disease predictions
+            risk: Risk assessment results
+
+        Returns:
+            Formatted string summary
+        """
+        fields = self._fields(patient_data, predictions, risk)
+        fields["factors"] = "\n".join(
+            f"  • {f}" for f in risk.get("factors", [])[:self.max_factors]
+        ) or self._no_factors
+        return self._full.format_map(fields)
+
+    def render_compact(self, patient_data: dict, predictions: dict, risk: dict, max_segments: int = 1) -> str:
+        """
+        Short SMS alert that stays within a segment budget.
+
+        The headline (risk, patient, top disease) is always included; vitals,
+        symptoms and risk factors are added in that order while they still
+        fit in max_segments. English alerts drop emoji and symbols so they
+        stay GSM-7 and bill at 160 characters per segment instead of 70,
+        unless a name or place is written in another script.
+
+        Args:
+            patient_data: Patient information dictionary
+            predictions: Disease predictions
+            risk: Risk assessment results
+            max_segments: Segment budget
+
+        Returns:
+            Compact alert text
+        """
+        fields = self._fields(patient_data, predictions, risk)
+        factors = [_gsm_safe(f) if self._gsm else f for f in risk.get("factors", [])[:3]]
+        fields["factors"] = ", ".join(f for f in factors if f)
+        if self._gsm:
+            fields = {key: _gsm_safe(str(value)) for key, value in fields.items()}
+
+        text = self._compact.format_map(fields)
+        for part, key in zip(self._compact_optional, ("bp", "symptoms", "factors")):
+            if not fields[key] or fields[key] in ("N/A", self._not_recorded):
+                continue
+            candidate = text + part.format_map(fields)
+            if sms_segments(candidate) <= max_segments:
+                text = candidate
+        return text
+
+    def render_batch(self, records: list, compact: bool = False, max_segments: int = 1) -> list:
+        """
+        Render many alerts.
+
+        Args:
+            records: (patient_data, predictions, risk) tuples
+            compact: Render SMS compact variants instead of full summaries
+            max_segments: Segment budget for compact variants
+
+        Returns:
+            List of rendered alerts, in input order
+        """
+        if compact:
+            return [self.render_compact(p, pr, r, max_segments) for p, pr, r in records]
+        return [self.render(p, pr, r) for p, pr, r in records]
+
+    def write_batch(self, records: list, out, separator: str = "\n\n", compact: bool = False, max_segments: int = 1) -> int:
+        """
+        Render many alerts straight into a caller-owned buffer.
+
+        Pass the same io.StringIO (after truncate(0)/seek(0)) or file for
+        every batch to avoid building a list of strings per batch.
+
+        Args:
+            records: (patient_data, predictions, risk) tuples
+            out: Writable text buffer
+            separator: Written after each alert
+            compact: Render SMS compact variants instead of full summaries
+            max_segments: Segment budget for compact variants
+
+        Returns:
+            Number of alerts written
+        """
+        write = out.write
+        count = 0
+        for patient_data, predictions, risk in records:
+            if compact:
+                write(self.render_compact(patient_data, predictions, risk, max_segments))
+            else:
+                write(self.render(patient_data, predictions, risk))
+            write(separator)
+            count += 1
+        return count
+
+
+RENDERERS = {key: SummaryRenderer(key) for key in TEMPLATES}
+
+
+def render_batch(records: list, language: str = "english", compact: bool = False, max_segments: int = 1) -> list:
+    """Render a batch of alerts with the shared renderer for a language."""
+    return RENDERERS[language_key(language)].render_batch(records, compact, max_segments)
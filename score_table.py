@@ -0,0 +1,223 @@
+"""
+📦 Precomputed Score Table
+Every predict_disease output, enumerated by (city profile, age band, symptom mask)
+"""
+
+import bisect
+import hashlib
+import inspect
+import json
+import sys
+import numpy as np
+from batch import DISEASE_NAMES, calculate_risk_score_batch, compile_batch_rules, predict_disease_batch
+from city_index import CITY_INDEX
+from data import DISEASE_RULES
+from prediction import (
+    CRITICAL_SYMPTOMS,
+    RULESET,
+    age_cuts,
+    age_risk,
+    bp_risk,
+    calculate_risk_score,
+    compile_rules,
+    outbreak_risk,
+    prediction_risk,
+    predict_disease,
+    pulse_risk,
+    risk_category,
+    score_rules,
+    symptom_mask,
+    symptom_risk
+)
+
+
+# ========== FILE FORMAT ==========
+# MAGIC | uint32 header length | JSON header | padding to 64 bytes | uint8 data
+# Data shape is (profiles, age bands, 2 ** symptoms, diseases + 1). The last
+# column is the risk points from symptoms, city and prediction severity,
+# capped at 100 (capping early does not change min(total, 100)).
+# The fingerprint includes the source of the rule compiler and scorer and of
+# the risk functions whose points are baked in, so a change to how rules are
+# matched or a threshold change invalidates old tables by itself; age, vitals
+# and the category cutoffs are applied live at lookup.
+
+MAGIC = b"HMSCORE\x00"
+TABLE_FORMAT = 1
+_ALIGN = 64
+# Age that earns no age points in calculate_risk_score
+_NEUTRAL_RISK_AGE = 30
+
+
+# Functions whose thresholds end up in the table's risk column
+_BAKED_RISK = (symptom_risk, outbreak_risk, prediction_risk, calculate_risk_score_batch)
+# Functions that turn DISEASE_RULES into the table's probability columns
+_BAKED_ENGINE = (compile_rules, score_rules, compile_batch_rules, predict_disease_batch)
+
+
+def rules_fingerprint() -> str:
+    """Hash of everything the table bakes in apart from city data."""
+    payload = json.dumps(
+        {
+            "format": TABLE_FORMAT,
+            "rules": DISEASE_RULES,
+            "critical": CRITICAL_SYMPTOMS,
+            "engine": [inspect.getsource(fn) for fn in _BAKED_ENGINE],
+            "risk": [inspect.getsource(fn) for fn in _BAKED_RISK]
+        },
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def city_profile(city: str) -> list:
+    """The parts of a city's data that affect the table: rule city bonuses and HIGH count."""
+    entry = CITY_INDEX.get(city)
+    return [[rule.city_bonus.get(entry.risk.get(rule.city_disease), 0) for rule in RULESET.rules], entry.high_count]
+
+
+def build_score_table(path: str) -> dict:
+    """
+    Enumerate every prediction into a binary table file.
+
+    Args:
+        path: Output file path
+
+    Returns:
+        The table header
+    """
+    width = len(RULESET.symptom_bits)
+    cuts = age_cuts()
+    band_ages = [cuts[0] - 1 if cuts else 0] + cuts
+
+    # Cities that share a profile share a slice; "" stands for unknown cities
+    profiles, cities = [], {}
+    for city in [""] + sorted(CITY_INDEX.city_data):
+        profile = city_profile(city)
+        if profile not in profiles:
+            profiles.append(profile)
+        cities[city] = profiles.index(profile)
+
+    masks = np.arange(2 ** width, dtype=np.int64)
+    matrix = ((masks[:, None] >> np.arange(width)) & 1).astype(np.int32)
+    data = np.zeros((len(profiles), len(band_ages), len(masks), len(DISEASE_NAMES) + 1), dtype=np.uint8)
+    for slot in range(len(profiles)):
+        city = next(name for name, s in cities.items() if s == slot)
+        for band, age in enumerate(band_ages):
+            probs = predict_disease_batch(matrix, city, np.full(len(masks), age))
+            risk = calculate_risk_score_batch(
+                matrix, np.full(len(masks), _NEUTRAL_RISK_AGE), 0, 0, 0, city, probs
+            )
+            data[slot, band, :, :-1] = probs
+            data[slot, band, :, -1] = risk["score"]
+
+    header = {
+        "fingerprint": rules_fingerprint(),
+        "shape": list(data.shape),
+        "diseases": DISEASE_NAMES,
+        "age_cuts": cuts,
+        "cities": cities,
+        "profiles": profiles
+    }
+    encoded = json.dumps(header).encode()
+    prefix = len(MAGIC) + 4 + len(encoded)
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(len(encoded).to_bytes(4, "little"))
+        f.write(encoded)
+        f.write(b"\0" * (-prefix % _ALIGN))
+        f.write(data.tobytes())
+    return header
+
+
+class ScoreTable:
+    """
+    Memory-mapped score table with live-engine fallback.
+
+    The file is mapped read-only, so worker processes share its pages.
+    Lookups fall back to predict_disease / calculate_risk_score when the
+    rules changed since the build, when a city's data changed (checked
+    whenever CITY_INDEX.version moves), for cities not in the table, and
+    for symptom lists with duplicates or unknown entries.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a score table")
+            size = int.from_bytes(f.read(4), "little")
+            self.header = json.loads(f.read(size))
+        prefix = len(MAGIC) + 4 + size
+        offset = prefix + (-prefix % _ALIGN)
+        self.data = np.memmap(path, dtype=np.uint8, mode="r", offset=offset, shape=tuple(self.header["shape"]))
+        self.diseases = self.header["diseases"]
+        self.cuts = self.header["age_cuts"]
+        self.valid = self.header["fingerprint"] == rules_fingerprint()
+        self._city_version = None
+        self._cities = {}
+        self._revalidate()
+
+    def _revalidate(self):
+        """Drop cities whose live profile no longer matches the table."""
+        self._city_version = CITY_INDEX.version
+        profiles = self.header["profiles"]
+        self._cities = {
+            city: slot for city, slot in self.header["cities"].items()
+            if city_profile(city) == profiles[slot]
+        }
+        self._unknown = self._cities.get("")
+
+    def _key(self, symptoms: list, city: str, age: int):
+        """Return (profile slot, age band, mask), or None to use the live engine."""
+        if not self.valid:
+            return None
+        if self._city_version != CITY_INDEX.version:
+            self._revalidate()
+        slot = self._cities.get(city)
+        if slot is None:
+            # Aliases and wards resolve to real outbreak data, not the unknown-city slice
+            if city in CITY_INDEX.city_data or CITY_INDEX.get(city).risk or self._unknown is None:
+                return None
+            slot = self._unknown
+        mask, repeats = symptom_mask(symptoms)
+        if repeats or mask.bit_count() != len(symptoms):
+            return None
+        return slot, bisect.bisect_right(self.cuts, age), mask
+
+    def predict(self, symptoms: list, city: str, age: int) -> dict:
+        """
+        Same result as predict_disease, served from the table when possible.
+        """
+        key = self._key(symptoms, city, age)
+        if key is None:
+            return predict_disease(symptoms, city, age)
+        row = self.data[key][:-1].tolist()
+        predictions = {name: prob for name, prob in zip(self.diseases, row) if prob}
+        return dict(sorted(predictions.items(), key=lambda x: x[1], reverse=True))
+
+    def risk(self, symptoms: list, age: int, bp_systolic: int, bp_diastolic: int, pulse: int, city: str) -> dict:
+        """
+        Risk score and category as calculate_risk_score would give them.
+
+        Factors are not stored; call calculate_risk_score for the explanation.
+        """
+        key = self._key(symptoms, city, age)
+        if key is None:
+            predictions = predict_disease(symptoms, city, age)
+            risk = calculate_risk_score(symptoms, age, bp_systolic, bp_diastolic, pulse, city, predictions)
+            return {"score": risk["score"], "category": risk["category"]}
+        # Age and vitals points come from the live components
+        live = age_risk(age)[0] + bp_risk(bp_systolic, bp_diastolic)[0] + pulse_risk(pulse)[0]
+        score = min(int(self.data[key][-1]) + live, 100)
+        return {"score": score, "category": risk_category(score)}
+
+
+def load_score_table(path: str) -> ScoreTable:
+    """Map a table file built by build_score_table."""
+    return ScoreTable(path)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        sys.exit("usage: python score_table.py OUTPUT_PATH")
+    built = build_score_table(sys.argv[1])
+    print(f"Wrote {sys.argv[1]}: shape {built['shape']}, {len(built['profiles'])} city profiles")
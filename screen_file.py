@@ -0,0 +1,334 @@
+"""
+🗂️ Bulk File Screening
+Score large CSV / JSON-lines patient files in parallel chunks
+
+Usage:
+    python screen_file.py patients.csv -o scored.csv
+    python screen_file.py patients.jsonl -o scored.jsonl --workers 8 --chunk-size 5000
+
+Files are CSV, JSON lines (.jsonl / .ndjson, streamed) or a JSON array
+(.json, read whole). Input rows need "symptoms" (a list, or a string split on --symptom-sep),
+"age", "city", and either "bp" ("120/80") or "bp_systolic"/"bp_diastolic",
+plus an optional "pulse". Every other column is passed through to the output.
+A row that cannot be read or scored is written with an "error" column
+instead of stopping the run.
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pipeline import parse_bp
+from prediction import calculate_risk_score, predict_disease
+from snapshot import prepare_fork
+
+RESULT_COLUMNS = ["top_disease", "top_probability", "predictions", "risk_score", "risk_category", "risk_factors"]
+ERROR_COLUMN = "error"
+
+
+# ============================================================
+# 📥 READING
+# ============================================================
+
+FORMATS = ("csv", "jsonl", "json")
+
+
+def file_format(path: str, fmt: str = None) -> str:
+    """
+    "csv", "jsonl" or "json" for a file.
+
+    Args:
+        path: File path ("-" for stdin / stdout)
+        fmt: Explicit format, which wins over the extension
+    """
+    if fmt:
+        return fmt
+    lower = path.lower()
+    if lower.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    if lower.endswith(".json"):
+        return "json"
+    return "csv"
+
+
+class UnreadableRow(dict):
+    """Placeholder for an input row that could not be parsed; holds only the error."""
+
+
+def _checked(row, where: str) -> dict:
+    if isinstance(row, dict):
+        return row
+    return UnreadableRow({ERROR_COLUMN: f"{where}: expected an object, got {type(row).__name__}"})
+
+
+def read_rows(f, fmt: str):
+    """
+    Yield input rows as dicts; CSV and JSON lines are read one line at a time.
+
+    A JSON line that does not parse (or is not an object) is yielded as an
+    UnreadableRow, so one bad line does not stop the file.
+    """
+    if fmt == "jsonl":
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as exc:
+                yield UnreadableRow({ERROR_COLUMN: f"line {number}: invalid JSON ({exc})"})
+                continue
+            yield _checked(row, f"line {number}")
+    elif fmt == "json":
+        rows = json.load(f)
+        if not isinstance(rows, list):
+            raise ValueError("a .json patient file must hold an array of rows")
+        for number, row in enumerate(rows):
+            yield _checked(row, f"item {number}")
+    else:
+        yield from csv.DictReader(f)
+
+
+def read_chunks(rows, chunk_size: int):
+    """Group an iterable of rows into lists of up to chunk_size."""
+    rows = iter(rows)
+    while True:
+        chunk = list(itertools.islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# ============================================================
+# 🧮 SCORING (runs in worker processes)
+# ============================================================
+
+def _int(value, default: int = 0) -> int:
+    try:
+        return int(float(value))
+    except (TypeError, ValueError, OverflowError):
+        # OverflowError: "inf" parses as a float but has no integer value
+        return default
+
+
+def parse_row(row: dict, symptom_sep: str = ";") -> tuple:
+    """
+    Read the engine inputs from one input row.
+
+    Args:
+        row: Input row (see module docstring)
+        symptom_sep: Separator for string symptom columns
+
+    Returns:
+        (symptoms, age, bp_systolic, bp_diastolic, pulse, city)
+    """
+    symptoms = row.get("symptoms") or []
+    if isinstance(symptoms, str):
+        symptoms = [s.strip() for s in symptoms.split(symptom_sep) if s.strip()]
+    age = _int(row.get("age"))
+    if row.get("bp"):
+        bp_systolic, bp_diastolic = parse_bp(str(row["bp"]))
+    else:
+        bp_systolic, bp_diastolic = _int(row.get("bp_systolic")), _int(row.get("bp_diastolic"))
+    return symptoms, age, bp_systolic, bp_diastolic, _int(row.get("pulse")), row.get("city") or ""
+
+
+def score_row(row: dict, symptom_sep: str = ";") -> dict:
+    """
+    Score one input row.
+
+    Args:
+        row: Input row (see module docstring)
+        symptom_sep: Separator for string symptom columns
+
+    Returns:
+        The row plus RESULT_COLUMNS; rows that cannot be read or scored get
+        empty results and an ERROR_COLUMN message instead
+    """
+    try:
+        if isinstance(row, UnreadableRow):
+            raise ValueError(row[ERROR_COLUMN])
+        symptoms, age, bp_systolic, bp_diastolic, pulse, city = parse_row(row, symptom_sep)
+        predictions = predict_disease(symptoms, city, age)
+        risk = calculate_risk_score(symptoms, age, bp_systolic, bp_diastolic, pulse, city, predictions)
+    except Exception as exc:
+        result = {} if isinstance(row, UnreadableRow) else dict(row)
+        result.update({
+            "top_disease": "",
+            "top_probability": None,
+            "predictions": {},
+            "risk_score": None,
+            "risk_category": "",
+            "risk_factors": [],
+            ERROR_COLUMN: str(exc) if isinstance(row, UnreadableRow) else f"{type(exc).__name__}: {exc}"
+        })
+        return result
+    top_disease, top_prob = next(iter(predictions.items()), ("", 0))
+
+    result = dict(row)
+    result.update({
+        "top_disease": top_disease,
+        "top_probability": top_prob,
+        "predictions": predictions,
+        "risk_score": risk["score"],
+        "risk_category": risk["category"],
+        "risk_factors": risk["factors"]
+    })
+    return result
+
+
+def score_chunk(rows: list, symptom_sep: str = ";") -> list:
+    """Score a chunk of rows (the unit of work sent to each process)."""
+    return [score_row(row, symptom_sep) for row in rows]
+
+
+def screen_chunks(chunks, workers: int = None, symptom_sep: str = ";"):
+    """
+    Score chunks across a process pool, yielding results in input order.
+
+    At most 2 × workers chunks are in flight, so memory stays bounded no
+    matter how large the input is.
+
+    Args:
+        chunks: Iterable of row lists
+        workers: Process count (default: CPU count); 1 scores in-process
+        symptom_sep: Separator for string symptom columns
+
+    Yields:
+        Scored chunks, in the order they were read
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for chunk in chunks:
+            yield score_chunk(chunk, symptom_sep)
+        return
+
+    prepare_fork()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = deque()
+        for chunk in chunks:
+            in_flight.append(pool.submit(score_chunk, chunk, symptom_sep))
+            if len(in_flight) >= 2 * workers:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+# ============================================================
+# 📤 WRITING
+# ============================================================
+
+class ResultWriter:
+    """
+    Writes scored rows as CSV (nested values JSON-encoded), JSON lines or one JSON array.
+
+    A CSV header has to list every column before the first row, but rows
+    may bring new passthrough columns at any point, so CSV rows are spooled
+    to a temporary file and written out under the union of their columns
+    on close().
+    """
+
+    def __init__(self, f, fmt: str):
+        self.f = f
+        self.fmt = fmt
+        self._spool = None
+        self._columns = {}      # passthrough columns in first-seen order
+        self._started = False
+
+    def write(self, rows: list):
+        if self.fmt == "jsonl":
+            self.f.write("".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows))
+            return
+        if self.fmt == "json":
+            for row in rows:
+                self.f.write(",\n" if self._started else "[\n")
+                self.f.write(json.dumps(row, ensure_ascii=False))
+                self._started = True
+            return
+        if self._spool is None:
+            self._spool = tempfile.TemporaryFile("w+", encoding="utf-8")
+        for row in rows:
+            # csv.DictReader files cells beyond the header under None; there is no name to keep them by
+            row = {k: v for k, v in row.items() if k is not None}
+            self._columns.update(dict.fromkeys(k for k in row if k not in RESULT_COLUMNS))
+            self._spool.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    def close(self):
+        """Finish the output (writes the spooled CSV, closes the JSON array)."""
+        if self.fmt == "json":
+            self.f.write("\n]\n" if self._started else "[]\n")
+        if self.fmt != "csv" or self._spool is None:
+            return
+        error = [ERROR_COLUMN] if ERROR_COLUMN in self._columns else []
+        fields = [k for k in self._columns if k != ERROR_COLUMN] + RESULT_COLUMNS + error
+        writer = csv.DictWriter(self.f, fieldnames=fields)
+        writer.writeheader()
+        self._spool.seek(0)
+        for line in self._spool:
+            row = json.loads(line)
+            row["predictions"] = json.dumps(row["predictions"], ensure_ascii=False)
+            row["risk_factors"] = "; ".join(row["risk_factors"])
+            if isinstance(row.get("symptoms"), list):
+                row["symptoms"] = ";".join(row["symptoms"])
+            writer.writerow(row)
+        self._spool.close()
+        self._spool = None
+
+
+# ============================================================
+# 🚀 CLI
+# ============================================================
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Screen a CSV / JSON-lines patient file in parallel")
+    parser.add_argument("input", help="patient file, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    parser.add_argument("--input-format", choices=FORMATS, help="default: from the file extension")
+    parser.add_argument("--output-format", choices=FORMATS, help="default: from the file extension")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("-c", "--chunk-size", type=int, default=2000, help="rows per work unit")
+    parser.add_argument("--symptom-sep", default=";", help="separator inside CSV symptom cells")
+    parser.add_argument("--progress", type=int, default=0, metavar="N", help="report throughput every N chunks")
+    args = parser.parse_args(argv)
+
+    fmt_in = file_format(args.input, args.input_format)
+    fmt_out = file_format(args.output, args.output_format) if args.output != "-" or args.output_format else fmt_in
+    source = sys.stdin if args.input == "-" else open(args.input, newline="", encoding="utf-8")
+    sink = sys.stdout if args.output == "-" else open(args.output, "w", newline="", encoding="utf-8")
+
+    start = time.perf_counter()
+    rows = errors = 0
+    try:
+        writer = ResultWriter(sink, fmt_out)
+        chunks = read_chunks(read_rows(source, fmt_in), args.chunk_size)
+        for n, scored in enumerate(screen_chunks(chunks, args.workers, args.symptom_sep), 1):
+            writer.write(scored)
+            rows += len(scored)
+            errors += sum(1 for row in scored if not row["risk_category"])
+            if args.progress and n % args.progress == 0:
+                elapsed = time.perf_counter() - start
+                print(f"{rows:,} rows in {elapsed:.1f}s ({rows / elapsed:,.0f} rows/s)", file=sys.stderr)
+        writer.close()
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"Screened {rows:,} rows in {elapsed:.2f}s "
+        f"({rows / elapsed if elapsed else 0:,.0f} rows/s, {args.workers} workers, chunks of {args.chunk_size})"
+        + (f"; {errors:,} rows had errors (see the {ERROR_COLUMN} column)" if errors else ""),
+        file=sys.stderr
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,491 @@
+"""
+🌐 Scoring Service
+ASGI app that micro-batches concurrent parse/predict/risk/summary requests
+
+Usage:
+    uvicorn service:app --workers 1
+    python service.py --port 8000 --max-batch 64 --max-wait-ms 2
+
+Endpoints:
+    POST /parse     {"text", "fuzzy"?}                          -> parse_voice_input result
+    POST /predict   {"symptoms", "city", "age"}                 -> predictions
+    POST /risk      {..., "bp_systolic", "bp_diastolic", "pulse", "predictions"?} -> risk
+    POST /summary   {"patient", "predictions", "risk"}          -> {"summary"}
+    POST /assess    patient fields                              -> predictions, risk, summary
+    GET  /health, /latency, /metrics
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import metrics
+from batch import DISEASE_NAMES, predict_disease_batch, symptom_matrix
+from prediction import (
+    calculate_risk_score,
+    generate_patient_summary,
+    parse_voice_input,
+    predict_disease
+)
+from snapshot import prepare_fork
+
+MAX_BODY = 64 * 1024
+
+
+# ============================================================
+# 🧮 BATCH FUNCTIONS (run on the worker pool)
+# ============================================================
+
+def predict_batch(items: list) -> list:
+    """predict_disease for many {"symptoms", "city", "age"} items, vectorized."""
+    results = [None] * len(items)
+    vector = [i for i, item in enumerate(items)
+              if len({s.lower() for s in item["symptoms"]}) == len(item["symptoms"])]
+    if vector:
+        probs = predict_disease_batch(
+            symptom_matrix([items[i]["symptoms"] for i in vector]),
+            [items[i]["city"] for i in vector],
+            [items[i]["age"] for i in vector]
+        )
+        for row, i in zip(probs.tolist(), vector):
+            # Same order as predict_disease: by probability, ties in rule order
+            pairs = [(name, p) for name, p in zip(DISEASE_NAMES, row) if p]
+            results[i] = dict(sorted(pairs, key=lambda x: x[1], reverse=True))
+    # Repeated symptoms count twice in the rules; the matrix can't express that
+    for i, item in enumerate(items):
+        if results[i] is None:
+            results[i] = predict_disease(item["symptoms"], item["city"], item["age"])
+    return results
+
+
+def risk_batch(items: list) -> list:
+    """calculate_risk_score for many items, predicting first where not given."""
+    missing = [item for item in items if item.get("predictions") is None]
+    predicted = iter(predict_batch(missing))
+    results = []
+    for item in items:
+        predictions = item["predictions"] if item.get("predictions") is not None else next(predicted)
+        results.append(calculate_risk_score(
+            item["symptoms"], item["age"], item["bp_systolic"], item["bp_diastolic"],
+            item["pulse"], item["city"], predictions
+        ))
+    return results
+
+
+def parse_batch(items: list) -> list:
+    return [parse_voice_input(item["text"], fuzzy=item["fuzzy"]) for item in items]
+
+
+def summary_batch(items: list) -> list:
+    return [{"summary": generate_patient_summary(i["patient"], i["predictions"], i["risk"])} for i in items]
+
+
+def assess_batch(items: list) -> list:
+    """Full assessment: predictions, risk and summary per patient."""
+    predictions = predict_batch(items)
+    results = []
+    for item, pred in zip(items, predictions):
+        risk = calculate_risk_score(
+            item["symptoms"], item["age"], item["bp_systolic"], item["bp_diastolic"],
+            item["pulse"], item["city"], pred
+        )
+        patient = dict(item["patient"])
+        patient.update({"symptoms": item["symptoms"], "age": item["age"], "city": item["city"]})
+        patient.setdefault("bp", f"{item['bp_systolic']}/{item['bp_diastolic']}")
+        patient.setdefault("pulse", item["pulse"])
+        results.append({
+            "predictions": pred,
+            "risk": risk,
+            "summary": generate_patient_summary(patient, pred, risk)
+        })
+    return results
+
+
+# ============================================================
+# ✅ REQUEST VALIDATION
+# ============================================================
+
+def _int(body: dict, key: str, default: int = 0) -> int:
+    value = body.get(key, default)
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise ValueError(f"{key} must be a finite number")
+    return int(value)
+
+
+def _strings(value, key: str) -> list:
+    if not isinstance(value, list) or not all(isinstance(s, str) for s in value):
+        raise ValueError(f"{key} must be a list of strings")
+    return value
+
+
+def _predictions(value) -> dict:
+    if not isinstance(value, dict) or not all(
+        isinstance(name, str) and isinstance(p, (int, float)) and not isinstance(p, bool)
+        for name, p in value.items()
+    ):
+        raise ValueError("predictions must map disease names to numbers")
+    return value
+
+
+def _patient_fields(body: dict) -> dict:
+    """The display-only patient fields, type-checked."""
+    fields = {}
+    for key in ("name", "gender", "bp", "timestamp"):
+        if key in body:
+            if not isinstance(body[key], str):
+                raise ValueError(f"{key} must be a string")
+            fields[key] = body[key]
+    if "pulse" in body:
+        fields["pulse"] = _int(body, "pulse")
+    return fields
+
+
+def _patient(body: dict) -> dict:
+    symptoms = _strings(body.get("symptoms", []), "symptoms")
+    city = body.get("city", "")
+    if not isinstance(city, str):
+        raise ValueError("city must be a string")
+    predictions = body.get("predictions")
+    return {
+        "symptoms": symptoms,
+        "city": city,
+        "age": _int(body, "age"),
+        "bp_systolic": _int(body, "bp_systolic"),
+        "bp_diastolic": _int(body, "bp_diastolic"),
+        "pulse": _int(body, "pulse"),
+        "predictions": None if predictions is None else _predictions(predictions),
+        "patient": _patient_fields(body)
+    }
+
+
+def _parse_request(body: dict) -> dict:
+    if not isinstance(body.get("text"), str):
+        raise ValueError("text must be a string")
+    return {"text": body["text"], "fuzzy": bool(body.get("fuzzy", False))}
+
+
+def _summary_request(body: dict) -> dict:
+    for key in ("patient", "predictions", "risk"):
+        if not isinstance(body.get(key), dict):
+            raise ValueError(f"{key} must be an object")
+    risk = body["risk"]
+    if not isinstance(risk.get("score"), (int, float)) or not isinstance(risk.get("category"), str):
+        raise ValueError("risk needs a numeric score and a category")
+    _strings(risk.get("factors", []), "risk.factors")
+    _predictions(body["predictions"])
+    patient = body["patient"]
+    _strings(patient.get("symptoms", []), "patient.symptoms")
+    _patient_fields(patient)
+    for key in ("age", "city"):
+        if key in patient and not isinstance(patient[key], (str, int, float)):
+            raise ValueError(f"patient.{key} must be a string or number")
+    return body
+
+
+# path -> (validator, batch function)
+ROUTES = {
+    "/parse": (_parse_request, parse_batch),
+    "/predict": (_patient, predict_batch),
+    "/risk": (_patient, risk_batch),
+    "/summary": (_summary_request, summary_batch),
+    "/assess": (_patient, assess_batch)
+}
+
+
+# ============================================================
+# 📦 MICRO-BATCHING
+# ============================================================
+
+def one_by_one(fn, items: list) -> list:
+    """
+    Run a batch function on each item alone.
+
+    Used after a batch raised, so one bad item fails only its own request.
+
+    Returns:
+        List of (result, exception), one of them None, per item
+    """
+    outcomes = []
+    for item in items:
+        try:
+            outcomes.append((fn([item])[0], None))
+        except Exception as exc:
+            outcomes.append((None, exc))
+    return outcomes
+
+
+class Overloaded(Exception):
+    """The batch queue is full (or shutting down); the client should back off."""
+
+
+def _refuse(batch: list):
+    """Fail the futures of (item, future) pairs that never ran."""
+    for _, future in batch:
+        if not future.done():
+            future.set_exception(Overloaded())
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent submissions into batches for one batch function.
+
+    A batch closes when it reaches `max_batch` items or `max_wait` seconds
+    after its first item arrived, then runs on the executor. Up to
+    `concurrency` batches run at once. Submissions beyond `max_queue`
+    waiting items are refused with Overloaded instead of queueing forever,
+    and so is anything still queued when the batcher stops.
+    """
+
+    def __init__(self, fn, executor, max_batch: int = 64, max_wait: float = 0.002,
+                 max_queue: int = 4096):
+        self.fn = fn
+        self.executor = executor
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.max_queue = max_queue
+        self.batches = 0
+        self.items = 0
+        self._queue = None
+        self._slots = None
+        self._task = None
+        self._runs = set()
+
+    def start(self, concurrency: int = 1):
+        self._queue = asyncio.Queue(self.max_queue)
+        self._slots = asyncio.Semaphore(concurrency)
+        self._task = asyncio.create_task(self._collect())
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    async def submit(self, item):
+        if self._task is None:
+            raise Overloaded()
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((item, future))
+        except asyncio.QueueFull:
+            raise Overloaded() from None
+        return await future
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            try:
+                deadline = loop.time() + self.max_wait
+                while len(batch) < self.max_batch:
+                    if not queue.empty():
+                        batch.append(queue.get_nowait())
+                        continue
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+                await self._slots.acquire()
+            except asyncio.CancelledError:
+                _refuse(batch)
+                raise
+            task = asyncio.create_task(self._run(batch))
+            self._runs.add(task)
+            task.add_done_callback(self._runs.discard)
+
+    async def _run(self, batch: list):
+        loop = asyncio.get_running_loop()
+        items = [item for item, _ in batch]
+        try:
+            try:
+                outcomes = [(result, None) for result in await loop.run_in_executor(self.executor, self.fn, items)]
+            except Exception:
+                # Retry item by item so only the failing request gets the error
+                outcomes = await loop.run_in_executor(self.executor, one_by_one, self.fn, items)
+        except Exception as exc:
+            outcomes = [(None, exc)] * len(batch)
+        try:
+            for (_, future), (result, exc) in zip(batch, outcomes):
+                if future.done():
+                    continue
+                if exc is None:
+                    future.set_result(result)
+                else:
+                    future.set_exception(exc)
+        finally:
+            self.batches += 1
+            self.items += len(batch)
+            self._slots.release()
+
+    async def stop(self):
+        """Let running batches finish and refuse everything still queued."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await asyncio.gather(*self._runs, return_exceptions=True)
+        waiting = []
+        while self._queue is not None and not self._queue.empty():
+            waiting.append(self._queue.get_nowait())
+        _refuse(waiting)
+
+
+# ============================================================
+# 🌐 ASGI APP
+# ============================================================
+
+class ScoringService:
+    """
+    Framework-free ASGI application over the prediction pipeline.
+
+    Use processes > 0 to score on a process pool (city data updates made in
+    this process are then not seen by the workers); the default single
+    worker thread keeps scoring off the event loop.
+    """
+
+    def __init__(self, max_batch: int = 64, max_wait: float = 0.002, max_queue: int = 4096,
+                 workers: int = 1, processes: int = 0):
+        if processes:
+            prepare_fork()
+            self.executor = ProcessPoolExecutor(processes)
+            self.concurrency = processes
+        else:
+            self.executor = ThreadPoolExecutor(workers)
+            self.concurrency = workers
+        self.batchers = {
+            path: MicroBatcher(fn, self.executor, max_batch, max_wait, max_queue)
+            for path, (_, fn) in ROUTES.items()
+        }
+        self.latency = {path: deque(maxlen=4096) for path in ROUTES}
+        self.rejected = 0
+        self.errors = 0
+        self.started = None
+
+    async def startup(self):
+        if self.started is None:
+            self.started = time.time()
+            for batcher in self.batchers.values():
+                batcher.start(self.concurrency)
+
+    async def shutdown(self):
+        for batcher in self.batchers.values():
+            await batcher.stop()
+        self.executor.shutdown(wait=False)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await self.startup()
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await self.shutdown()
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] != "http":
+            return
+        await self.startup()
+
+        path, method = scope["path"], scope["method"]
+        if method == "GET" and path == "/health":
+            return await _respond(send, 200, self.health())
+        if method == "GET" and path == "/latency":
+            return await _respond(send, 200, self.latency_report())
+        if method == "GET" and path == "/metrics":
+            return await _respond(send, 200, metrics.prometheus_text(), content_type=b"text/plain; version=0.0.4")
+        if path not in ROUTES:
+            return await _respond(send, 404, {"error": "not found"})
+        if method != "POST":
+            return await _respond(send, 405, {"error": "use POST"})
+
+        start = time.perf_counter()
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if len(body) > MAX_BODY:
+                return await _respond(send, 413, {"error": "body too large"})
+            if not message.get("more_body"):
+                break
+        try:
+            item = ROUTES[path][0](json.loads(body or b"{}"))
+        except (ValueError, TypeError, AttributeError, OverflowError) as exc:
+            return await _respond(send, 400, {"error": str(exc)})
+
+        try:
+            result = await self.batchers[path].submit(item)
+        except Overloaded:
+            self.rejected += 1
+            return await _respond(send, 503, {"error": "overloaded"}, headers=[(b"retry-after", b"1")])
+        except Exception as exc:
+            self.errors += 1
+            return await _respond(send, 500, {"error": f"{type(exc).__name__}: {exc}"})
+        elapsed = time.perf_counter() - start
+        self.latency[path].append(elapsed)
+        if metrics.ENABLED:
+            metrics.observe(f"http{path}", elapsed)
+        await _respond(send, 200, result)
+
+    def health(self) -> dict:
+        return {
+            "status": "ok",
+            "uptime_s": round(time.time() - self.started, 1) if self.started else 0,
+            "queued": {path: b.depth for path, b in self.batchers.items()},
+            "rejected": self.rejected,
+            "errors": self.errors
+        }
+
+    def latency_report(self) -> dict:
+        """Recent per-endpoint latency percentiles (ms) and mean batch sizes."""
+        report = {}
+        for path, samples in self.latency.items():
+            batcher = self.batchers[path]
+            ordered = sorted(samples)
+            entry = {"requests": len(ordered), "mean_batch": round(batcher.items / batcher.batches, 2) if batcher.batches else 0}
+            for pct in (50, 90, 99):
+                if ordered:
+                    entry[f"p{pct}_ms"] = round(ordered[min(len(ordered) - 1, len(ordered) * pct // 100)] * 1000, 3)
+            report[path] = entry
+        return report
+
+
+async def _respond(send, status: int, payload, headers: list = (), content_type: bytes = b"application/json"):
+    body = payload.encode() if isinstance(payload, str) else json.dumps(payload, ensure_ascii=False).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", content_type), (b"content-length", str(len(body)).encode()), *headers]
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+app = ScoringService()
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the micro-batching scoring service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    parser.add_argument("--max-queue", type=int, default=4096, help="waiting requests per endpoint before 503")
+    parser.add_argument("--processes", type=int, default=0, help="score on a process pool of this size")
+    args = parser.parse_args(argv)
+    try:
+        import uvicorn
+    except ImportError:
+        sys.exit("service.py needs an ASGI server: pip install uvicorn")
+    service = ScoringService(args.max_batch, args.max_wait_ms / 1000, args.max_queue, processes=args.processes)
+    uvicorn.run(service, host=args.host, port=args.port, log_level="warning")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,237 @@
+"""
+✏️ Assessment Session
+Incremental re-scoring of one patient as the intake form is edited
+"""
+
+from city_index import CITY_INDEX
+from prediction import (
+    RULESET,
+    RuleSet,
+    age_risk,
+    bp_risk,
+    outbreak_risk,
+    prediction_risk,
+    pulse_risk,
+    risk_category,
+    score_rules,
+    symptom_mask,
+    symptom_risk
+)
+
+
+# ========== RULE DEPENDENCIES ==========
+# Sub-rulesets of the rules each input can change. Every rule in a subset
+# is a candidate (always = all), so score_rules rescoring a subset gives
+# the same per-rule results as scoring the full set.
+
+def _subset(indices: list) -> RuleSet:
+    rules = tuple(RULESET.rules[i] for i in indices)
+    return RuleSet(rules, RULESET.symptom_bits, (0,) * len(RULESET.symptom_bits), (1 << len(rules)) - 1)
+
+
+def _touches(rule, bit: int) -> bool:
+    combos = 0
+    for combo_mask, _, _ in rule.combos:
+        combos |= combo_mask
+    return bool((rule.mask | rule.require_mask | combos) & bit)
+
+
+RULES_BY_SYMPTOM = tuple(
+    _subset([i for i, rule in enumerate(RULESET.rules) if _touches(rule, 1 << bit)])
+    for bit in range(len(RULESET.symptom_bits))
+)
+RULES_BY_AGE = _subset([i for i, rule in enumerate(RULESET.rules) if rule.age])
+RULES_BY_CITY = _subset([i for i, rule in enumerate(RULESET.rules) if rule.city_bonus])
+
+# Risk components in calculate_risk_score order
+COMPONENTS = ("age", "symptoms", "bp", "pulse", "city", "prediction")
+
+
+class AssessmentSession:
+    """
+    One patient's live assessment, updated one field at a time.
+
+    Each edit rescores only the disease rules and risk components that
+    depend on the edited field and returns what changed:
+
+        {"predictions": {disease: (old, new)}, "score": (old, new),
+         "category": (old, new), "factors_added": [...], "factors_removed": [...]}
+
+    Only changed keys are present; an empty dict means nothing changed.
+    `predictions` and `risk` always match what predict_disease and
+    calculate_risk_score would return for the current inputs. City data
+    changes in CITY_INDEX are picked up on the next edit (or refresh()).
+    """
+
+    def __init__(
+        self,
+        symptoms: list = (),
+        age: int = 0,
+        bp_systolic: int = 0,
+        bp_diastolic: int = 0,
+        pulse: int = 0,
+        city: str = ""
+    ):
+        self.symptoms = list(symptoms)
+        self._lower = [s.lower() for s in self.symptoms]
+        self.age = age
+        self.bp_systolic = bp_systolic
+        self.bp_diastolic = bp_diastolic
+        self.pulse = pulse
+        self.city = city
+        self._mask, self._repeats = symptom_mask(self.symptoms)
+        self._city_entry = CITY_INDEX.get(city)
+        self._probs = score_rules(self._mask, self._repeats, self._city_entry.risk, age)
+        self._parts = {
+            "age": age_risk(age),
+            "symptoms": symptom_risk(self._lower),
+            "bp": bp_risk(bp_systolic, bp_diastolic),
+            "pulse": pulse_risk(pulse),
+            "city": outbreak_risk(city)
+        }
+        self.predictions = {}
+        self.risk = {}
+        self._stale = True
+        self._update_predictions()
+
+    # ---------- edits ----------
+
+    def add_symptom(self, symptom: str) -> dict:
+        """Add a symptom (duplicates count, as in a raw symptom list)."""
+        before = self._begin()
+        lowered = symptom.lower()
+        self.symptoms.append(symptom)
+        self._lower.append(lowered)
+        bit = RULESET.symptom_bits.get(lowered)
+        if bit is not None:
+            if self._mask & (1 << bit):
+                self._repeats.append(1 << bit)
+            else:
+                self._mask |= 1 << bit
+            self._rescore(RULES_BY_SYMPTOM[bit])
+        self._parts["symptoms"] = symptom_risk(self._lower)
+        return self._finish(before)
+
+    def remove_symptom(self, symptom: str) -> dict:
+        """Remove one occurrence of a symptom (case-insensitive); no-op if absent."""
+        lowered = symptom.lower()
+        if lowered not in self._lower:
+            return {}
+        before = self._begin()
+        i = self._lower.index(lowered)
+        del self.symptoms[i]
+        del self._lower[i]
+        bit = RULESET.symptom_bits.get(lowered)
+        if bit is not None:
+            if (1 << bit) in self._repeats:
+                self._repeats.remove(1 << bit)
+            else:
+                self._mask &= ~(1 << bit)
+            self._rescore(RULES_BY_SYMPTOM[bit])
+        self._parts["symptoms"] = symptom_risk(self._lower)
+        return self._finish(before)
+
+    def toggle_symptom(self, symptom: str) -> dict:
+        """Checkbox semantics: remove the symptom if present, else add it."""
+        if symptom.lower() in self._lower:
+            return self.remove_symptom(symptom)
+        return self.add_symptom(symptom)
+
+    def set_age(self, age: int) -> dict:
+        before = self._begin()
+        self.age = age
+        self._rescore(RULES_BY_AGE)
+        self._parts["age"] = age_risk(age)
+        return self._finish(before)
+
+    def set_bp(self, bp_systolic: int, bp_diastolic: int) -> dict:
+        before = self._begin()
+        self.bp_systolic, self.bp_diastolic = bp_systolic, bp_diastolic
+        self._parts["bp"] = bp_risk(bp_systolic, bp_diastolic)
+        return self._finish(before)
+
+    def set_pulse(self, pulse: int) -> dict:
+        before = self._begin()
+        self.pulse = pulse
+        self._parts["pulse"] = pulse_risk(pulse)
+        return self._finish(before)
+
+    def set_city(self, city: str) -> dict:
+        before = self._begin()
+        self.city = city
+        self._refresh_city()
+        return self._finish(before)
+
+    def refresh(self) -> dict:
+        """Pick up CITY_INDEX changes for the current city without an edit."""
+        return self._finish(self._begin())
+
+    # ---------- internals ----------
+
+    def _begin(self) -> tuple:
+        before = (self.predictions, self.risk)
+        if CITY_INDEX.get(self.city) is not self._city_entry:
+            self._refresh_city()
+        return before
+
+    def _refresh_city(self):
+        self._city_entry = CITY_INDEX.get(self.city)
+        self._rescore(RULES_BY_CITY)
+        self._parts["city"] = outbreak_risk(self.city)
+
+    def _rescore(self, subset: RuleSet):
+        probs = self._probs
+        fresh = score_rules(self._mask, self._repeats, self._city_entry.risk, self.age, subset)
+        for rule in subset.rules:
+            prob = fresh.get(rule.name)
+            if probs.get(rule.name) != prob:
+                self._stale = True
+                if prob is None:
+                    del probs[rule.name]
+                else:
+                    probs[rule.name] = prob
+
+    def _update_predictions(self):
+        if self._stale:
+            # Rule order first, so ties sort exactly as in predict_disease
+            probs = self._probs
+            ordered = [(rule.name, probs[rule.name]) for rule in RULESET.rules if rule.name in probs]
+            self.predictions = dict(sorted(ordered, key=lambda x: x[1], reverse=True))
+            self._parts["prediction"] = prediction_risk(self.predictions)
+            self._stale = False
+
+        score = 0
+        factors = []
+        for name in COMPONENTS:
+            points, part_factors = self._parts[name]
+            score += points
+            factors.extend(part_factors)
+        score = min(score, 100)
+        self.risk = {"score": score, "category": risk_category(score), "factors": factors}
+
+    def _finish(self, before: tuple) -> dict:
+        old_predictions, old_risk = before
+        self._update_predictions()
+        diff = {}
+        if self.predictions is not old_predictions:
+            new_predictions = self.predictions
+            changed = {
+                name: (old_predictions.get(name), new_predictions.get(name))
+                for name in old_predictions.keys() | new_predictions.keys()
+                if old_predictions.get(name) != new_predictions.get(name)
+            }
+            if changed:
+                diff["predictions"] = changed
+        risk = self.risk
+        if old_risk["score"] != risk["score"]:
+            diff["score"] = (old_risk["score"], risk["score"])
+        if old_risk["category"] != risk["category"]:
+            diff["category"] = (old_risk["category"], risk["category"])
+        if old_risk["factors"] != risk["factors"]:
+            added = [f for f in risk["factors"] if f not in old_risk["factors"]]
+            removed = [f for f in old_risk["factors"] if f not in risk["factors"]]
+            if added:
+                diff["factors_added"] = added
+            if removed:
+                diff["factors_removed"] = removed
+        return diff
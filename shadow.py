@@ -0,0 +1,538 @@
+"""
+🪞 Shadow Rule Evaluation
+Replay recorded assessments through the current engine and a candidate rule version, side by side
+
+Usage:
+    python shadow.py health.db --candidate dengue_bonus_v2.json
+    python shadow.py patients.csv --candidate bp_cutoffs.py --workers 16 --progress 50 --json
+
+A candidate is either a JSON file holding a DISEASE_RULES-format list (or
+{"rules": [...]}), or a Python file defining any of DISEASE_RULES, the risk
+components (age_risk, symptom_risk, bp_risk, pulse_risk, outbreak_risk,
+prediction_risk) and risk_category; anything it leaves out is the current
+version. Both engines read the same live city data, so only the rule change
+shows up in the diff.
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from city_index import CITY_INDEX
+from prediction import (
+    RULESET,
+    age_risk,
+    bp_risk,
+    compile_rules,
+    outbreak_risk,
+    prediction_risk,
+    pulse_risk,
+    risk_category,
+    score_rules,
+    symptom_mask,
+    symptom_risk
+)
+from screen_file import FORMATS, UnreadableRow, file_format, parse_row, read_chunks, read_rows
+from snapshot import prepare_fork
+from store import AssessmentStore
+
+RISK_COMPONENTS = {
+    "age_risk": age_risk,
+    "symptom_risk": symptom_risk,
+    "bp_risk": bp_risk,
+    "pulse_risk": pulse_risk,
+    "outbreak_risk": outbreak_risk,
+    "prediction_risk": prediction_risk
+}
+SIDES = ("baseline", "candidate")
+CATEGORIES = ("LOW", "MEDIUM", "HIGH")
+STORE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+
+# ============================================================
+# ⚙️ ENGINES
+# ============================================================
+
+class Engine:
+    """
+    One rule version: compiled disease rules, risk components and category cutoffs.
+
+    Engine() is the live version; assess() gives what predict_disease +
+    calculate_risk_score would with this version's rules swapped in.
+    """
+
+    def __init__(self, name: str = "current", rules: list = None, **overrides):
+        unknown = set(overrides) - set(RISK_COMPONENTS) - {"risk_category"}
+        if unknown:
+            raise ValueError(f"Unknown engine parts: {', '.join(sorted(unknown))}")
+        self.name = name
+        self.ruleset = RULESET if rules is None else compile_rules(rules)
+        self.components = [(stage, overrides.get(stage) or fn) for stage, fn in RISK_COMPONENTS.items()]
+        for stage, fn in self.components:
+            setattr(self, stage, fn)
+        self.risk_category = overrides.get("risk_category") or risk_category
+
+    def __repr__(self) -> str:
+        return f"Engine({self.name!r})"
+
+    def predict(self, symptoms: list, city: str, age: int) -> dict:
+        """predict_disease under this version's rules."""
+        mask, repeats = symptom_mask(symptoms, self.ruleset.symptom_bits)
+        predictions = score_rules(mask, repeats, CITY_INDEX.risk_levels(city), age, self.ruleset)
+        return dict(sorted(predictions.items(), key=lambda x: x[1], reverse=True))
+
+    def assess(self, symptoms: list, age: int, bp_systolic: int, bp_diastolic: int, pulse: int, city: str) -> tuple:
+        """
+        Score one patient.
+
+        Returns:
+            (predictions, score, category)
+        """
+        predictions = self.predict(symptoms, city, age)
+        score = min(
+            self.age_risk(age)[0]
+            + self.symptom_risk(symptoms)[0]
+            + self.bp_risk(bp_systolic, bp_diastolic)[0]
+            + self.pulse_risk(pulse)[0]
+            + self.outbreak_risk(city)[0]
+            + self.prediction_risk(predictions)[0],
+            100
+        )
+        return predictions, score, self.risk_category(score)
+
+    def timed_assess(
+        self,
+        symptoms: list,
+        age: int,
+        bp_systolic: int,
+        bp_diastolic: int,
+        pulse: int,
+        city: str,
+        latency: Counter
+    ) -> tuple:
+        """assess(), adding each stage's nanoseconds to latency[stage]."""
+        clock = time.perf_counter_ns
+        start = clock()
+        predictions = self.predict(symptoms, city, age)
+        latency["predict_disease"] += clock() - start
+        args = {
+            "age_risk": (age,),
+            "symptom_risk": (symptoms,),
+            "bp_risk": (bp_systolic, bp_diastolic),
+            "pulse_risk": (pulse,),
+            "outbreak_risk": (city,),
+            "prediction_risk": (predictions,)
+        }
+        score = 0
+        for stage, fn in self.components:
+            start = clock()
+            score += fn(*args[stage])[0]
+            latency[stage] += clock() - start
+        score = min(score, 100)
+        start = clock()
+        category = self.risk_category(score)
+        latency["risk_category"] += clock() - start
+        return predictions, score, category
+
+
+def load_engine(path: str = None) -> Engine:
+    """
+    Load a rule version from a JSON or Python file (see module docstring).
+
+    Args:
+        path: Candidate file; None is the current version
+
+    Returns:
+        Engine named after the file
+    """
+    if not path:
+        return Engine()
+    name = os.path.basename(path)
+    if path.lower().endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            spec = json.load(f)
+        return Engine(name, spec if isinstance(spec, list) else spec["rules"])
+
+    module_spec = importlib.util.spec_from_file_location(f"shadow_{os.path.splitext(name)[0]}", path)
+    if module_spec is None:
+        raise ValueError(f"Not a JSON or Python rule file: {path}")
+    module = importlib.util.module_from_spec(module_spec)
+    module_spec.loader.exec_module(module)
+    overrides = {
+        part: getattr(module, part)
+        for part in list(RISK_COMPONENTS) + ["risk_category"]
+        if callable(getattr(module, part, None))
+    }
+    return Engine(name, getattr(module, "DISEASE_RULES", None), **overrides)
+
+
+# ============================================================
+# 📊 DIFF REPORT
+# ============================================================
+
+class ShadowReport:
+    """
+    Aggregated differences between the two engines.
+
+    Reports from separate chunks merge(), so workers only ship counters
+    back to the parent, never per-patient results.
+    """
+
+    def __init__(self, max_examples: int = 5):
+        self.patients = 0
+        self.distinct = 0                                    # inputs actually scored (repeats share one)
+        self.categories = Counter()                          # (baseline, candidate) -> patients
+        self.top_changes = Counter()                         # (baseline top, candidate top) -> patients
+        self.score_shift = Counter()                         # candidate - baseline score -> patients
+        self.fired = {side: Counter() for side in SIDES}     # disease -> patients it was predicted for
+        self.latency = {side: Counter() for side in SIDES}   # stage -> total ns over sampled inputs
+        self.latency_samples = 0
+        self.max_examples = max_examples
+        self.examples = []                                   # first few category flips, with inputs
+
+    def add(self, inputs: tuple, baseline: tuple, candidate: tuple, count: int = 1):
+        """Record `count` patients with the same inputs and the two (predictions, score, category) results."""
+        base_predictions, base_score, base_category = baseline
+        cand_predictions, cand_score, cand_category = candidate
+        self.patients += count
+        self.distinct += 1
+        self.categories[base_category, cand_category] += count
+        self.score_shift[cand_score - base_score] += count
+        base_top = next(iter(base_predictions), None)
+        cand_top = next(iter(cand_predictions), None)
+        if base_top != cand_top:
+            self.top_changes[base_top, cand_top] += count
+        for side, predictions in zip(SIDES, (base_predictions, cand_predictions)):
+            fired = self.fired[side]
+            for disease in predictions:
+                fired[disease] += count
+        if base_category != cand_category and len(self.examples) < self.max_examples:
+            symptoms, age, bp_systolic, bp_diastolic, pulse, city = inputs
+            self.examples.append({
+                "symptoms": list(symptoms),
+                "age": age,
+                "bp": f"{bp_systolic}/{bp_diastolic}",
+                "pulse": pulse,
+                "city": city,
+                "baseline": {"score": base_score, "category": base_category, "top_disease": base_top},
+                "candidate": {"score": cand_score, "category": cand_category, "top_disease": cand_top}
+            })
+
+    def merge(self, other: "ShadowReport") -> "ShadowReport":
+        """Fold another report into this one."""
+        self.patients += other.patients
+        self.distinct += other.distinct
+        self.categories.update(other.categories)
+        self.top_changes.update(other.top_changes)
+        self.score_shift.update(other.score_shift)
+        for side in SIDES:
+            self.fired[side].update(other.fired[side])
+            self.latency[side].update(other.latency[side])
+        self.latency_samples += other.latency_samples
+        self.examples.extend(other.examples[:self.max_examples - len(self.examples)])
+        return self
+
+    @property
+    def flips(self) -> Counter:
+        """(baseline, candidate) category pairs that differ."""
+        return Counter({pair: n for pair, n in self.categories.items() if pair[0] != pair[1]})
+
+    def latency_us(self) -> dict:
+        """Mean microseconds per scored input, {side: {stage: us}}."""
+        samples = self.latency_samples or 1
+        return {
+            side: {stage: ns / samples / 1000 for stage, ns in self.latency[side].items()}
+            for side in SIDES
+        }
+
+    def to_dict(self) -> dict:
+        """JSON-friendly form of the report."""
+        matrix = {base: {cand: 0 for cand in CATEGORIES} for base in CATEGORIES}
+        for (base, cand), n in self.categories.items():
+            matrix.setdefault(base, {})[cand] = n
+        return {
+            "patients": self.patients,
+            "distinct_inputs": self.distinct,
+            "category_flips": sum(self.flips.values()),
+            "categories": matrix,
+            "top_disease_changes": [
+                {"baseline": base, "candidate": cand, "patients": n}
+                for (base, cand), n in self.top_changes.most_common()
+            ],
+            "score_shift": {str(shift): n for shift, n in sorted(self.score_shift.items())},
+            "rule_fires": {
+                disease: {side: self.fired[side][disease] for side in SIDES}
+                for disease in sorted(set(self.fired["baseline"]) | set(self.fired["candidate"]))
+            },
+            "latency_us": self.latency_us(),
+            "latency_samples": self.latency_samples,
+            "examples": self.examples
+        }
+
+    def summary_line(self) -> str:
+        """One-line running total, for progress output."""
+        flips = sum(self.flips.values())
+        changes = sum(self.top_changes.values())
+        total = self.patients or 1
+        mean_shift = sum(shift * n for shift, n in self.score_shift.items()) / total
+        return (
+            f"{self.patients:,} patients: {flips:,} category flips ({flips / total:.2%}), "
+            f"{changes:,} top-disease changes ({changes / total:.2%}), mean score shift {mean_shift:+.2f}"
+        )
+
+    def format(self, baseline: str = "current", candidate: str = "candidate", top: int = 10) -> str:
+        """Plain-text report."""
+        total = self.patients or 1
+        lines = [f"Shadow replay: {baseline} vs {candidate}", self.summary_line(), ""]
+
+        lines.append("Category flips (baseline → candidate):")
+        flips = self.flips.most_common()
+        lines += [f"  {base:>6} → {cand:<6} {n:>12,}  {n / total:.2%}" for (base, cand), n in flips] or ["  none"]
+
+        lines += ["", "Top-disease changes:"]
+        lines += [
+            f"  {base or '-'} → {cand or '-'}  {n:,}" for (base, cand), n in self.top_changes.most_common(top)
+        ] or ["  none"]
+
+        lines += ["", "Score shift (candidate - baseline):"]
+        lines += self._histogram()
+
+        lines += ["", f"{'Rule fires':<28}{'baseline':>12}{'candidate':>12}{'change':>10}"]
+        for disease, n in sorted(
+            (self.fired["baseline"] + self.fired["candidate"]).items(),
+            key=lambda x: -abs(self.fired["candidate"][x[0]] - self.fired["baseline"][x[0]])
+        )[:top]:
+            base, cand = self.fired["baseline"][disease], self.fired["candidate"][disease]
+            lines.append(f"{disease:<28}{base:>12,}{cand:>12,}{cand - base:>+10,}")
+
+        latency = self.latency_us()
+        lines += ["", f"{'Latency (us per patient)':<28}{'baseline':>12}{'candidate':>12}"]
+        for stage in ["predict_disease"] + list(RISK_COMPONENTS) + ["risk_category"]:
+            lines.append(
+                f"{stage:<28}{latency['baseline'].get(stage, 0):>12.2f}{latency['candidate'].get(stage, 0):>12.2f}"
+            )
+        lines.append(f"  ({self.latency_samples:,} sampled inputs)")
+        return "\n".join(lines)
+
+    def _histogram(self, width: int = 40) -> list:
+        if not self.score_shift:
+            return ["  none"]
+        shifts = sorted(self.score_shift)
+        # Exact shifts when there are few of them, 5-point bins otherwise
+        size = 1 if shifts[-1] - shifts[0] <= 20 else 5
+        bins = Counter()
+        for shift, n in self.score_shift.items():
+            bins[shift // size * size] += n
+        peak = max(bins.values())
+        lines = []
+        for start in sorted(bins):
+            label = f"{start:+d}" if size == 1 else f"{start:+d}..{start + size - 1:+d}"
+            bar = "█" * max(1, round(bins[start] / peak * width))
+            lines.append(f"  {label:>9} {bar} {bins[start]:,}")
+        return lines
+
+
+# ============================================================
+# 🧮 REPLAY (runs in worker processes)
+# ============================================================
+
+_ENGINES = None         # (baseline, candidate), loaded once per worker
+_SAMPLE_EVERY = 10
+
+
+def _init_worker(baseline_path: str, candidate_path: str, sample_every: int):
+    global _ENGINES, _SAMPLE_EVERY
+    _ENGINES = (load_engine(baseline_path), load_engine(candidate_path))
+    _SAMPLE_EVERY = sample_every
+
+
+def shadow_chunk(rows: list, symptom_sep: str = ";", max_examples: int = 5) -> ShadowReport:
+    """
+    Score a chunk through both engines and aggregate the differences.
+
+    Identical inputs (common in kiosk and camp traffic) are scored once and
+    counted by multiplicity; every _SAMPLE_EVERY-th distinct input is timed
+    stage by stage for the latency table.
+    """
+    baseline, candidate = _ENGINES
+    report = ShadowReport(max_examples)
+    inputs = Counter()
+    for row in rows:
+        if isinstance(row, UnreadableRow):
+            continue    # no inputs to compare
+        symptoms, age, bp_systolic, bp_diastolic, pulse, city = parse_row(row, symptom_sep)
+        inputs[tuple(symptoms), age, bp_systolic, bp_diastolic, pulse, city] += 1
+
+    for i, (key, count) in enumerate(inputs.items()):
+        if _SAMPLE_EVERY and i % _SAMPLE_EVERY == 0:
+            # Alternate which engine goes first so neither always pays for cold caches
+            if report.latency_samples % 2:
+                cand = candidate.timed_assess(*key, report.latency["candidate"])
+                base = baseline.timed_assess(*key, report.latency["baseline"])
+            else:
+                base = baseline.timed_assess(*key, report.latency["baseline"])
+                cand = candidate.timed_assess(*key, report.latency["candidate"])
+            report.latency_samples += 1
+        else:
+            base = baseline.assess(*key)
+            cand = candidate.assess(*key)
+        report.add(key, base, cand, count)
+    return report
+
+
+def shadow_chunks(
+    chunks,
+    candidate: str,
+    baseline: str = None,
+    workers: int = None,
+    symptom_sep: str = ";",
+    sample_every: int = 10,
+    max_examples: int = 5
+):
+    """
+    Replay chunks through both engines across a process pool.
+
+    Like screen_chunks, at most 2 × workers chunks are in flight; each
+    comes back as a small ShadowReport rather than scored rows.
+
+    Args:
+        chunks: Iterable of row lists
+        candidate: Candidate rule file
+        baseline: Baseline rule file (default: the current version)
+        workers: Process count (default: CPU count); 1 replays in-process
+        symptom_sep: Separator for string symptom columns
+        sample_every: Time one in this many distinct inputs (0 disables timing)
+        max_examples: Category flips to keep with their inputs, per chunk
+
+    Yields:
+        One ShadowReport per chunk, in input order
+    """
+    workers = workers or os.cpu_count() or 1
+    # Load once up front so a broken candidate fails before any work is queued
+    _init_worker(baseline, candidate, sample_every)
+    if workers == 1:
+        for chunk in chunks:
+            yield shadow_chunk(chunk, symptom_sep, max_examples)
+        return
+
+    prepare_fork()
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(baseline, candidate, sample_every)
+    ) as pool:
+        in_flight = deque()
+        for chunk in chunks:
+            in_flight.append(pool.submit(shadow_chunk, chunk, symptom_sep, max_examples))
+            if len(in_flight) >= 2 * workers:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+def replay(chunks, candidate: str, baseline: str = None, workers: int = None, every: int = 1, **options):
+    """
+    Running totals of a shadow replay.
+
+    Args:
+        chunks: Iterable of row lists
+        candidate: Candidate rule file
+        baseline: Baseline rule file (default: the current version)
+        workers: Process count
+        every: Yield the running report after every this many chunks
+        **options: Passed to shadow_chunks
+
+    Yields:
+        The same ShadowReport, updated, every `every` chunks and once at the end
+    """
+    report = ShadowReport(options.get("max_examples", 5))
+    n = 0
+    for n, part in enumerate(shadow_chunks(chunks, candidate, baseline, workers, **options), 1):
+        report.merge(part)
+        if every and n % every == 0:
+            yield report
+    if n == 0 or not every or n % every:
+        yield report
+
+
+# ============================================================
+# 🚀 CLI
+# ============================================================
+
+def corpus_chunks(path: str, chunk_size: int, input_format: str = None, **filters):
+    """
+    Row chunks from an AssessmentStore database or a CSV / JSON patient file (see screen_file.file_format).
+
+    Args:
+        path: .db/.sqlite file, patient file, or - for stdin
+        chunk_size: Rows per chunk
+        input_format: "csv", "jsonl" or "json" (default: from the extension)
+        **filters: city / since / until, for store databases
+    """
+    if path.lower().endswith(STORE_SUFFIXES):
+        store = AssessmentStore(path)
+        try:
+            yield from store.replay(chunk_size=chunk_size, **filters)
+        finally:
+            store.close()
+        return
+    source = sys.stdin if path == "-" else open(path, newline="", encoding="utf-8")
+    try:
+        yield from read_chunks(read_rows(source, file_format(path, input_format)), chunk_size)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay recorded assessments through a candidate rule version")
+    parser.add_argument("corpus", help="assessment store (.db) or CSV / JSON patient file, or - for stdin")
+    parser.add_argument("--candidate", required=True, help="candidate rules (.json or .py)")
+    parser.add_argument("--baseline", help="baseline rules (default: the current version)")
+    parser.add_argument("--input-format", choices=FORMATS, help="default: from the file extension")
+    parser.add_argument("--city", help="store only: replay one city")
+    parser.add_argument("--since", type=float, help="store only: earliest recorded_at (epoch seconds)")
+    parser.add_argument("--until", type=float, help="store only: latest recorded_at, exclusive")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("-c", "--chunk-size", type=int, default=5000, help="rows per work unit")
+    parser.add_argument("--symptom-sep", default=";", help="separator inside CSV symptom cells")
+    parser.add_argument("--sample-every", type=int, default=10, help="time one in N distinct inputs (0: off)")
+    parser.add_argument("--examples", type=int, default=5, help="category flips to show with their inputs")
+    parser.add_argument("--progress", type=int, default=0, metavar="N", help="print running diffs every N chunks")
+    parser.add_argument("--json", action="store_true", help="print the final report as JSON")
+    args = parser.parse_args(argv)
+
+    filters = {k: v for k, v in (("city", args.city), ("since", args.since), ("until", args.until)) if v is not None}
+    if filters and not args.corpus.lower().endswith(STORE_SUFFIXES):
+        parser.error("--city, --since and --until need an assessment store corpus")
+
+    start = time.perf_counter()
+    chunks = corpus_chunks(args.corpus, args.chunk_size, args.input_format, **filters)
+    for report in replay(
+        chunks, args.candidate, args.baseline, args.workers, every=args.progress,
+        symptom_sep=args.symptom_sep, sample_every=args.sample_every, max_examples=args.examples
+    ):
+        if args.progress:
+            elapsed = time.perf_counter() - start
+            print(f"{report.summary_line()} ({report.patients / elapsed:,.0f} rows/s)", file=sys.stderr)
+
+    if args.json:
+        print(json.dumps(report.to_dict(), ensure_ascii=False, indent=2))
+    else:
+        print(report.format(load_engine(args.baseline).name, os.path.basename(args.candidate)))
+        for example in report.examples:
+            print(f"  e.g. {json.dumps(example, ensure_ascii=False)}")
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"Replayed {report.patients:,} patients ({report.distinct:,} distinct) in {elapsed:.2f}s "
+        f"({report.patients / elapsed if elapsed else 0:,.0f} rows/s, {args.workers} workers)",
+        file=sys.stderr
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
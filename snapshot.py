@@ -0,0 +1,183 @@
+"""
+🧊 Engine Snapshot
+On-disk cache of the compiled engine structures, keyed by a source fingerprint
+
+The modules that build derived structures at import (the symptom keyword
+automaton, the fuzzy index) get them through engine_part(), which restores
+the snapshotted copy when the snapshot matches the current source files
+and builds it otherwise. Only the command below writes the snapshot, so
+importing the engine never touches the filesystem (read-only installs
+simply build at import). Parts are stored as plain containers with
+marshal, which is built in, so a warm start imports nothing extra.
+
+Usage:
+    python snapshot.py            # rebuild the snapshot
+    python snapshot.py --check    # report whether it is current
+    HEALTH_ENGINE_SNAPSHOT=off    # disable; or set a path to relocate it
+"""
+
+import argparse
+import gc
+import importlib.util
+import marshal
+import os
+import sys
+
+SNAPSHOT_FORMAT = 1
+ENV_VAR = "HEALTH_ENGINE_SNAPSHOT"
+
+# Modules whose source (code or data literals) shapes the snapshotted parts
+SOURCE_MODULES = ("data", "voice", "fuzzy", "snapshot")
+
+_state = {"loaded": False, "recording": False, "fingerprint": None, "parts": {}}
+
+
+def snapshot_path() -> str:
+    """Snapshot file location, or None when snapshots are disabled."""
+    path = os.environ.get(ENV_VAR)
+    if path is not None:
+        return None if path.lower() in ("", "0", "off") else path
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), "__pycache__", "engine-snapshot.bin")
+
+
+def source_fingerprint(modules: tuple = SOURCE_MODULES) -> str:
+    """
+    Size and modification time of the source files the engine is built from.
+
+    The same check Python uses to invalidate cached bytecode: cheap enough
+    to run on every start, and any edit to the data literals or the code
+    that compiles them changes it.
+    """
+    parts = [f"{SNAPSHOT_FORMAT}", "%d.%d" % sys.version_info[:2]]
+    for name in modules:
+        spec = importlib.util.find_spec(name)
+        try:
+            stat = os.stat(spec.origin)
+            parts.append(f"{name}:{stat.st_size}:{stat.st_mtime_ns}")
+        except (AttributeError, TypeError, OSError):
+            parts.append(f"{name}:missing")
+    return ";".join(parts)
+
+
+def load_snapshot(path: str) -> dict:
+    """
+    Read a snapshot file.
+
+    Returns:
+        {"format", "fingerprint", "parts": {name: state}}, or None if unreadable
+    """
+    try:
+        with open(path, "rb") as f:
+            snapshot = marshal.loads(f.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(snapshot, dict) or snapshot.get("format") != SNAPSHOT_FORMAT:
+        return None
+    return snapshot
+
+
+def save_snapshot(path: str, fingerprint: str, parts: dict):
+    """Write a snapshot atomically, so concurrent workers never read half a file."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(marshal.dumps({"format": SNAPSHOT_FORMAT, "fingerprint": fingerprint, "parts": parts}))
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def _load():
+    _state["loaded"] = True
+    path = snapshot_path()
+    if path is None:
+        return
+    _state["fingerprint"] = source_fingerprint()
+    snapshot = load_snapshot(path)
+    if snapshot is not None and snapshot.get("fingerprint") == _state["fingerprint"]:
+        _state["parts"] = snapshot["parts"]
+
+
+def engine_part(name: str, cls: type, build=None):
+    """
+    Return a prepared cls instance, restored from the snapshot when it is current.
+
+    The snapshot is read on the first call. A part missing from it, or any
+    part once the sources changed, is built from source; `python
+    snapshot.py` records the built parts and writes the file.
+    cls's __getstate__ must return plain containers (dicts, lists,
+    tuples, strings, numbers); restoring skips __init__ and hands that
+    state to __setstate__, or to the instance __dict__ if there is none.
+
+    Args:
+        name: Part name, unique per structure
+        cls: Class of the part
+        build: Zero-argument function building it from source (default: cls)
+
+    Returns:
+        The structure
+    """
+    if not _state["loaded"]:
+        _load()
+    state = _state["parts"].get(name)
+    if state is not None:
+        value = cls.__new__(cls)
+        if hasattr(value, "__setstate__"):
+            value.__setstate__(state)
+        else:
+            value.__dict__.update(state)
+        return value
+
+    value = (build or cls)()
+    if _state["recording"]:
+        _state["parts"][name] = value.__getstate__()
+    return value
+
+
+def prepare_fork():
+    """
+    Call before forking workers so they share the engine copy-on-write.
+
+    Moves everything allocated so far out of the garbage collector's
+    generations; otherwise the first collection in each child writes to
+    every object header and un-shares the pages holding the engine.
+    """
+    gc.collect()
+    gc.freeze()
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Build or check the engine snapshot")
+    parser.add_argument("--check", action="store_true", help="only report whether the snapshot is current")
+    args = parser.parse_args(argv)
+
+    path = snapshot_path()
+    if path is None:
+        print(f"snapshots disabled by {ENV_VAR}")
+        return 1
+    fingerprint = source_fingerprint()
+    snapshot = load_snapshot(path)
+    current = snapshot is not None and snapshot.get("fingerprint") == fingerprint
+    if args.check:
+        print(f"{path}: {'current' if current else 'stale or missing'}")
+        return 0 if current else 1
+
+    # Build every part from source and record it, ignoring the old file
+    _state.update(loaded=True, recording=True, fingerprint=fingerprint, parts={})
+    import prediction  # noqa: F401  (importing the engine builds every part)
+    try:
+        save_snapshot(path, fingerprint, _state["parts"])
+    except (OSError, ValueError) as exc:
+        print(f"could not write {path}: {exc}", file=sys.stderr)
+        return 1
+    print(path)
+    for name, state in sorted(_state["parts"].items()):
+        print(f"  {name:<16}{len(marshal.dumps(state)):>8,} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
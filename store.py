@@ -0,0 +1,355 @@
+"""
+💾 Assessment Store
+Append-only SQLite (WAL) persistence for scored patients and dashboard queries
+
+Usage:
+    with AssessmentStore("health.db") as store:
+        for record in screen_transcript(chunks, "Delhi"):
+            store.add(record)
+        store.flush()
+        store.query(city="Delhi", disease="Dengue", category="HIGH", since=time.time() - 86400)
+"""
+
+import json
+import pathlib
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS assessments (
+    id INTEGER PRIMARY KEY,
+    recorded_at REAL NOT NULL,
+    city TEXT NOT NULL,
+    name TEXT,
+    age INTEGER,
+    gender TEXT,
+    symptoms TEXT,
+    bp TEXT,
+    pulse INTEGER,
+    top_disease TEXT,
+    top_probability INTEGER,
+    predictions TEXT,
+    risk_score INTEGER,
+    risk_category TEXT NOT NULL,
+    risk_factors TEXT,
+    summary TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_time ON assessments (recorded_at);
+CREATE INDEX IF NOT EXISTS idx_city_time ON assessments (city, recorded_at);
+CREATE INDEX IF NOT EXISTS idx_category_time ON assessments (risk_category, recorded_at);
+CREATE INDEX IF NOT EXISTS idx_disease_time ON assessments (top_disease, recorded_at);
+CREATE INDEX IF NOT EXISTS idx_city_disease_category_time
+    ON assessments (city, top_disease, risk_category, recorded_at);
+"""
+
+COLUMNS = (
+    "recorded_at", "city", "name", "age", "gender", "symptoms", "bp", "pulse", "top_disease",
+    "top_probability", "predictions", "risk_score", "risk_category", "risk_factors", "summary"
+)
+_INSERT = f"INSERT INTO assessments ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+
+# Filters the query helpers accept, in index-friendly order
+_FILTERS = (("city", "city = ?"), ("disease", "top_disease = ?"), ("category", "risk_category = ?"))
+GROUP_FIELDS = {"city": "city", "disease": "top_disease", "category": "risk_category"}
+
+
+def _connect(path: str, readonly: bool = False) -> sqlite3.Connection:
+    if readonly and path != ":memory:":
+        # as_uri() percent-encodes "?", "#" and "%", which would otherwise end the file name
+        uri = pathlib.Path(path).resolve().as_uri() + "?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+    else:
+        conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA busy_timeout = 5000")
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+class AssessmentStore:
+    """
+    Durable log of assessments with batched writes and indexed reads.
+
+    Writes are buffered and committed in one transaction per `batch_size`
+    rows, or by a background timer at most `flush_interval` seconds after a
+    row was queued, so the tail of a burst reaches readers even when ingest
+    goes quiet. The database runs in WAL mode, so readers on other
+    connections never wait for the writer.
+
+    Filters (city, then disease, then category) and time ranges are served
+    from the composite indexes, and query() without filters walks the time
+    index newest first. count() and counts_by() without any filter or
+    `since` still visit every row; pass a time range on large stores.
+    """
+
+    def __init__(self, path: str, batch_size: int = 500, flush_interval: float = 1.0):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._write = _connect(path)
+        self._write.execute("PRAGMA journal_mode = WAL")
+        # WAL + NORMAL stays consistent on power loss; only the last commits can be lost
+        self._write.execute("PRAGMA synchronous = NORMAL")
+        self._write.executescript(SCHEMA)
+        self._pending = []
+        self._last_flush = time.monotonic()
+        self._timer = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._readers = []      # every thread's read connection, closed by close()
+
+    # ---------- writing ----------
+
+    def add_assessment(
+        self,
+        patient: dict,
+        predictions: dict,
+        risk: dict,
+        summary: str = None,
+        recorded_at: float = None
+    ):
+        """
+        Queue one assessment for writing.
+
+        Args:
+            patient: patient_data dict (city, name, age, gender, symptoms, bp, pulse)
+            predictions: predict_disease result
+            risk: calculate_risk_score result
+            summary: generate_patient_summary text, if rendered
+            recorded_at: Epoch seconds (default: now)
+        """
+        top_disease, top_prob = next(iter(predictions.items()), (None, None))
+        pulse = patient.get("pulse")
+        row = (
+            time.time() if recorded_at is None else recorded_at,
+            patient.get("city", ""),
+            patient.get("name"),
+            patient.get("age"),
+            patient.get("gender"),
+            json.dumps(patient.get("symptoms", []), ensure_ascii=False),
+            patient.get("bp"),
+            pulse if isinstance(pulse, int) else None,
+            top_disease,
+            top_prob,
+            json.dumps(predictions, ensure_ascii=False),
+            risk["score"],
+            risk["category"],
+            json.dumps(risk.get("factors", []), ensure_ascii=False),
+            summary
+        )
+        with self._lock:
+            self._pending.append(row)
+            due = time.monotonic() - self._last_flush >= self.flush_interval
+            if len(self._pending) >= self.batch_size or due:
+                self._flush_locked()
+            elif self._timer is None and self.flush_interval > 0:
+                self._timer = threading.Timer(self.flush_interval, self._flush_on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def add(self, record: dict, recorded_at: float = None):
+        """Queue a screen_transcript record ({"patient", "predictions", "risk", "summary"})."""
+        self.add_assessment(
+            record["patient"], record["predictions"], record["risk"], record.get("summary"), recorded_at
+        )
+
+    def add_many(self, records, recorded_at: float = None) -> int:
+        """Queue an iterable of records; returns how many were queued."""
+        count = 0
+        for record in records:
+            self.add(record, recorded_at)
+            count += 1
+        return count
+
+    def _flush_locked(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._pending:
+            with self._write:
+                self._write.executemany(_INSERT, self._pending)
+            self._pending = []
+        self._last_flush = time.monotonic()
+
+    def _flush_on_timer(self):
+        with self._lock:
+            # A flush or close since the timer was armed already cleared it
+            if self._timer is not None:
+                self._timer = None
+                self._flush_locked()
+
+    def flush(self):
+        """Commit everything queued so far."""
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        """Flush, then close the writer and every thread's reader."""
+        self.flush()
+        with self._lock:
+            readers, self._readers = self._readers, []
+        for conn in readers:
+            if conn is not self._write:
+                conn.close()
+        self._write.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ---------- reading ----------
+
+    def _reader(self) -> sqlite3.Connection:
+        """Per-thread read connection, so dashboards never share the writer's."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._write if self.path == ":memory:" else _connect(self.path, readonly=True)
+            with self._lock:
+                self._readers.append(conn)
+        return conn
+
+    @staticmethod
+    def _where(city: str, disease: str, category: str, since: float, until: float) -> tuple:
+        clauses, params = [], []
+        for (name, clause), value in zip(_FILTERS, (city, disease, category)):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        if since is not None:
+            clauses.append("recorded_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("recorded_at < ?")
+            params.append(until)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def query(
+        self,
+        city: str = None,
+        disease: str = None,
+        category: str = None,
+        since: float = None,
+        until: float = None,
+        limit: int = 100
+    ) -> list:
+        """
+        Most recent assessments matching every given filter.
+
+        Args:
+            city: City name
+            disease: Top predicted disease
+            category: Risk category
+            since: Earliest recorded_at (epoch seconds)
+            until: Latest recorded_at, exclusive
+            limit: Maximum rows
+
+        Returns:
+            List of dicts with the stored columns (JSON fields decoded)
+        """
+        where, params = self._where(city, disease, category, since, until)
+        rows = self._reader().execute(
+            f"SELECT * FROM assessments{where} ORDER BY recorded_at DESC LIMIT ?", params + [limit]
+        ).fetchall()
+        results = []
+        for row in rows:
+            item = dict(row)
+            for key in ("symptoms", "predictions", "risk_factors"):
+                item[key] = json.loads(item[key]) if item[key] else []
+            results.append(item)
+        return results
+
+    def count(
+        self,
+        city: str = None,
+        disease: str = None,
+        category: str = None,
+        since: float = None,
+        until: float = None
+    ) -> int:
+        """Number of assessments matching every given filter."""
+        where, params = self._where(city, disease, category, since, until)
+        return self._reader().execute(f"SELECT COUNT(*) FROM assessments{where}", params).fetchone()[0]
+
+    def counts_by(
+        self,
+        field: str,
+        city: str = None,
+        disease: str = None,
+        category: str = None,
+        since: float = None,
+        until: float = None
+    ) -> dict:
+        """
+        Assessment counts grouped by "city", "disease" or "category".
+
+        Returns:
+            {value: count}, largest first
+        """
+        column = GROUP_FIELDS[field]
+        where, params = self._where(city, disease, category, since, until)
+        rows = self._reader().execute(
+            f"SELECT {column}, COUNT(*) AS n FROM assessments{where} GROUP BY {column} ORDER BY n DESC", params
+        ).fetchall()
+        return {row[0]: row[1] for row in rows}
+
+    def hourly_counts(self, city: str = None, disease: str = None, category: str = None, hours: int = 24) -> list:
+        """
+        Per-hour counts for the last `hours` hours, oldest first.
+
+        Returns:
+            List of (hour start epoch, count), including empty hours
+        """
+        now = time.time()
+        start = (int(now) // 3600 - hours + 1) * 3600
+        where, params = self._where(city, disease, category, start, None)
+        rows = self._reader().execute(
+            f"SELECT CAST(recorded_at / 3600 AS INTEGER) * 3600 AS hour, COUNT(*) "
+            f"FROM assessments{where} GROUP BY hour",
+            params
+        ).fetchall()
+        counts = {row[0]: row[1] for row in rows}
+        return [(hour, counts.get(hour, 0)) for hour in range(start, start + hours * 3600, 3600)]
+
+    def replay(self, city: str = None, since: float = None, until: float = None, chunk_size: int = 5000):
+        """
+        Stored patient inputs, oldest first, in chunks (for re-scoring history under new rules).
+
+        Pages on (recorded_at, id) rather than OFFSET, so each chunk resumes
+        with a seek in the time index (idx_city_time with a city, idx_time
+        without) and is read in index order, with no sort.
+
+        Yields:
+            Lists of dicts with id, recorded_at, city, age, symptoms (decoded), bp and pulse
+        """
+        where, params = self._where(city, None, None, since, until)
+        where += " AND (recorded_at, id) > (?, ?)" if where else " WHERE (recorded_at, id) > (?, ?)"
+        sql = (
+            f"SELECT id, recorded_at, city, age, symptoms, bp, pulse FROM assessments{where} "
+            f"ORDER BY recorded_at, id LIMIT ?"
+        )
+        conn = self._reader()
+        last = (float("-inf"), 0)
+        while True:
+            rows = conn.execute(sql, params + [*last, chunk_size]).fetchall()
+            if not rows:
+                return
+            last = (rows[-1]["recorded_at"], rows[-1]["id"])
+            chunk = []
+            for row in rows:
+                item = dict(row)
+                item["symptoms"] = json.loads(item["symptoms"]) if item["symptoms"] else []
+                chunk.append(item)
+            yield chunk
+
+    def query_plan(self, **filters) -> list:
+        """SQLite's plan for query(**filters), to check it uses an index."""
+        where, params = self._where(
+            filters.get("city"), filters.get("disease"), filters.get("category"),
+            filters.get("since"), filters.get("until")
+        )
+        rows = self._reader().execute(
+            f"EXPLAIN QUERY PLAN SELECT * FROM assessments{where} ORDER BY recorded_at DESC", params
+        ).fetchall()
+        return [row[-1] for row in rows]
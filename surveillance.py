@@ -0,0 +1,234 @@
+"""
+🛰️ Live Surveillance
+Sliding-window disease counts from scored patients, republished to CITY_INDEX
+"""
+
+import threading
+import time
+from case_store import RISK_THRESHOLDS, format_trend, risk_level
+from city_index import CITY_INDEX
+from prediction import RULESET
+
+
+# Prediction names as CITY_DISEASE_DATA reports them; rules with a
+# city_disease use that, anything else keeps its own name
+REPORTED_AS = {"Tuberculosis (TB)": "TB", "Viral Flu": "Flu"}
+REPORTED_AS.update({rule.name: rule.city_disease for rule in RULESET.rules if rule.city_disease})
+
+_RISK_RANK = {"LOW": 0, "MEDIUM": 1, "HIGH": 2}
+
+
+class WindowCounter:
+    """
+    Event count over the last `buckets` time buckets and the window before it.
+
+    The ring holds two windows so the trend (this window vs. the previous
+    one) is read off two running totals. Adding an event is O(1); moving
+    forward costs one step per elapsed bucket, at most the ring size.
+    """
+
+    __slots__ = ("width", "buckets", "counts", "head", "recent", "older")
+
+    def __init__(self, width: float, buckets: int):
+        self.width = width
+        self.buckets = buckets
+        self.counts = [0] * (2 * buckets)
+        self.head = None
+        self.recent = 0
+        self.older = 0
+
+    def advance(self, now: float):
+        """Slide the windows forward to the bucket containing `now`."""
+        bucket = int(now // self.width)
+        if self.head is None or bucket - self.head >= len(self.counts):
+            if self.head is None or bucket > self.head:
+                self.counts = [0] * len(self.counts)
+                self.recent = self.older = 0
+                self.head = bucket
+            return
+        counts, size, n = self.counts, len(self.counts), self.buckets
+        while self.head < bucket:
+            self.head += 1
+            slot = self.head % size
+            # The bucket two windows back expires; the one a window back ages
+            self.older -= counts[slot]
+            counts[slot] = 0
+            moved = counts[(self.head - n) % size]
+            self.recent -= moved
+            self.older += moved
+
+    def add(self, when: float, n: int = 1) -> bool:
+        """Count n events at time `when`; False if it is older than both windows."""
+        self.advance(when)
+        bucket = int(when // self.width)
+        age = self.head - bucket
+        if age >= len(self.counts):
+            return False
+        self.counts[bucket % len(self.counts)] += n
+        if age < self.buckets:
+            self.recent += n
+        else:
+            self.older += n
+        return True
+
+    def trend(self) -> float:
+        """Percent change of this window over the previous one (0 with no history)."""
+        return (self.recent - self.older) / self.older * 100 if self.older else 0.0
+
+
+class SurveillanceAggregator:
+    """
+    Rolls scored patients up into per-city, per-disease sliding windows.
+
+    Each event counts toward its top predicted disease. Defaults give a
+    one-week window in hourly buckets, matching the weekly "current" and
+    week-over-week "trend" of CITY_DISEASE_DATA. A risk level change is
+    pushed to the index straight away; count and trend changes are batched
+    per city and pushed at most every `publish_interval` seconds (or on
+    publish()).
+
+    Screened patients are a sample of a city's cases, so they are published
+    as their own "screened" and "screened_trend" fields; the city-wide
+    "current" and "trend" are left alone. The sample raises the risk level
+    once `screened * scale` (or its trend, after two full windows) crosses
+    the thresholds, but never below the level the index had when the
+    disease was first seen. Only diseases the city already reports are
+    published; other predictions are counted for snapshot() only.
+    """
+
+    def __init__(
+        self,
+        index=CITY_INDEX,
+        window: float = 7 * 24 * 3600,
+        buckets: int = 168,
+        min_probability: int = 50,
+        thresholds: tuple = RISK_THRESHOLDS,
+        publish_interval: float = 60.0,
+        scale: float = 1.0
+    ):
+        self.index = index
+        self.window = window
+        self.width = window / buckets
+        self.buckets = buckets
+        self.min_probability = min_probability
+        self.thresholds = thresholds
+        self.publish_interval = publish_interval
+        self.scale = scale      # city-wide cases per screened patient
+        self.counters = {}      # (city, disease) -> WindowCounter
+        self._seeds = {}        # (city, disease) -> [first event time, seeded risk level or None]
+        self._published = {}    # (city, disease) -> last published risk level
+        self._dirty = {}        # city -> set of diseases changed since publish
+        self._last_publish = None
+        self._lock = threading.Lock()
+
+    def observe(self, city: str, predictions: dict, when: float = None) -> bool:
+        """
+        Count one scored patient.
+
+        Args:
+            city: Patient's city
+            predictions: predict_disease result (sorted, top first)
+            when: Event time in epoch seconds (default: now)
+
+        Returns:
+            False if the patient had no prediction worth counting
+        """
+        top = next(iter(predictions.items()), None)
+        if top is None or top[1] < self.min_probability:
+            return False
+        when = time.time() if when is None else when
+        disease = REPORTED_AS.get(top[0], top[0])
+        key = (city, disease)
+        with self._lock:
+            counter = self.counters.get(key)
+            if counter is None:
+                counter = self.counters[key] = WindowCounter(self.width, self.buckets)
+                seed = self.index.city_data.get(city, {}).get("diseases", {}).get(disease)
+                self._seeds[key] = [when, seed.get("risk", "LOW") if seed else None]
+                if seed:
+                    self._published[key] = seed.get("risk")
+            if not counter.add(when):
+                return False
+            self._seeds[key][0] = min(self._seeds[key][0], when)
+            if self._seeds[key][1] is None:
+                return True
+            self._dirty.setdefault(city, set()).add(disease)
+            level = self._fields(key, counter, when)["risk"]
+            changed = self._published.get(key) != level
+            due = self._last_publish is None or when - self._last_publish >= self.publish_interval
+        if changed or due:
+            self.publish(when)
+        return True
+
+    def observe_record(self, record: dict, when: float = None) -> bool:
+        """Count a screen_transcript record ({"patient", "predictions", ...})."""
+        return self.observe(record["patient"].get("city", ""), record["predictions"], when)
+
+    def snapshot(self, now: float = None) -> dict:
+        """
+        Current windowed values without publishing.
+
+        Returns:
+            {city: {disease: {"screened", "screened_trend", "risk"}}}
+        """
+        now = time.time() if now is None else now
+        result = {}
+        with self._lock:
+            for (city, disease), counter in self.counters.items():
+                counter.advance(now)
+                result.setdefault(city, {})[disease] = self._fields((city, disease), counter, now)
+        return result
+
+    def _fields(self, key: tuple, counter: WindowCounter, now: float) -> dict:
+        started, seeded = self._seeds[key]
+        trend = counter.trend()
+        # Until the counter spans two windows the previous window is undercounted
+        full = now - started >= 2 * self.window
+        level = risk_level(counter.recent * self.scale, trend if full else 0.0, self.thresholds)
+        if seeded is not None and _RISK_RANK.get(seeded, 0) > _RISK_RANK[level]:
+            level = seeded
+        return {"screened": counter.recent, "screened_trend": format_trend(trend), "risk": level}
+
+    def publish(self, now: float = None) -> int:
+        """
+        Push every city with changes since the last publish to the index.
+
+        Args:
+            now: Time to slide the windows to (default: now)
+
+        Returns:
+            The index version afterwards
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            dirty, self._dirty = self._dirty, {}
+            self._last_publish = now
+            updates = {}
+            for city, diseases in dirty.items():
+                for disease in diseases:
+                    counter = self.counters[(city, disease)]
+                    counter.advance(now)
+                    fields = updates.setdefault(city, {})[disease] = self._fields((city, disease), counter, now)
+                    self._published[(city, disease)] = fields["risk"]
+        version = self.index.version
+        for city, diseases in updates.items():
+            version = self.index.update_city(city, diseases)
+        return version
+
+    def expire(self, now: float = None) -> int:
+        """
+        Slide every window to `now` and republish counts that decayed.
+
+        Call periodically so quiet cities drop back down without new events.
+
+        Returns:
+            The index version afterwards
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            for (city, disease), counter in self.counters.items():
+                before = (counter.recent, counter.older)
+                counter.advance(now)
+                if (counter.recent, counter.older) != before and self._seeds[(city, disease)][1] is not None:
+                    self._dirty.setdefault(city, set()).add(disease)
+        return self.publish(now)
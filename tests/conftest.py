@@ -0,0 +1,38 @@
+"""
+🧪 Test setup
+Makes the engine modules importable under the names the rest of the code uses
+"""
+
+import copy
+import importlib.util
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# The data and engine modules ship as "file (1).py" and "file.py";
+# everything else imports them as `data` and `prediction`.
+for name, filename in (("data", "file (1).py"), ("prediction", "file.py")):
+    if name in sys.modules or os.path.exists(os.path.join(ROOT, f"{name}.py")):
+        continue
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, filename))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+
+
+@pytest.fixture
+def city_data():
+    """CITY_DISEASE_DATA, restored (and the index rebuilt) after the test."""
+    from city_index import CITY_INDEX
+    saved = copy.deepcopy(CITY_INDEX.city_data)
+    yield CITY_INDEX.city_data
+    for city, entry in saved.items():
+        CITY_INDEX.city_data[city] = entry
+    for city in list(CITY_INDEX.city_data):
+        if city not in saved:
+            del CITY_INDEX.city_data[city]
+        CITY_INDEX.refresh(city)
@@ -0,0 +1,264 @@
+"""
+🔬 Reference Engine
+The original predict_disease and calculate_risk_score, kept verbatim so the
+optimized engine can be checked against them
+"""
+
+from data import CITY_DISEASE_DATA
+
+
+def predict_disease(symptoms: list, city: str, age: int) -> dict:
+    """
+    Predict diseases based on symptoms, city trends, and age.
+    
+    Args:
+        symptoms: List of symptom strings
+        city: Patient's city
+        age: Patient's age
+        
+    Returns:
+        Dictionary of {disease_name: probability_percentage}
+    """
+    predictions = {}
+    symptoms_lower = [s.lower() for s in symptoms]
+    city_data = CITY_DISEASE_DATA.get(city, {}).get("diseases", {})
+    
+    # ========== DENGUE DETECTION ==========
+    dengue_symptoms = ["fever", "rash", "headache", "body pain", "joint pain", "fatigue"]
+    dengue_match = sum(1 for s in symptoms_lower if s in dengue_symptoms)
+    if dengue_match >= 2:
+        base_prob = 35 + (dengue_match * 12)
+        # City outbreak bonus
+        if city_data.get("Dengue", {}).get("risk") == "HIGH":
+            base_prob += 20
+        elif city_data.get("Dengue", {}).get("risk") == "MEDIUM":
+            base_prob += 10
+        # Characteristic combination
+        if "fever" in symptoms_lower and "rash" in symptoms_lower:
+            base_prob += 15
+        predictions["Dengue"] = min(base_prob, 95)
+    
+    # ========== TB DETECTION ==========
+    tb_symptoms = ["cough", "night sweats", "weight loss", "fever", "fatigue", "loss of appetite", "chest pain"]
+    tb_match = sum(1 for s in symptoms_lower if s in tb_symptoms)
+    if tb_match >= 2:
+        base_prob = 25 + (tb_match * 10)
+        # Chronic cough indicator
+        if "cough" in symptoms_lower:
+            base_prob += 15
+            if tb_match >= 3:
+                base_prob += 10
+        # Age factor
+        if age > 50:
+            base_prob += 8
+        predictions["Tuberculosis (TB)"] = min(base_prob, 90)
+    
+    # ========== MALARIA DETECTION ==========
+    malaria_symptoms = ["fever", "cold", "headache", "nausea", "vomiting", "fatigue", "body pain"]
+    malaria_match = sum(1 for s in symptoms_lower if s in malaria_symptoms)
+    if malaria_match >= 2 and "fever" in symptoms_lower:
+        base_prob = 30 + (malaria_match * 10)
+        # Cyclic fever pattern
+        if "cold" in symptoms_lower and "fever" in symptoms_lower:
+            base_prob += 15
+        # City outbreak
+        if city_data.get("Malaria", {}).get("risk") == "HIGH":
+            base_prob += 15
+        predictions["Malaria"] = min(base_prob, 88)
+    
+    # ========== TYPHOID DETECTION ==========
+    typhoid_symptoms = ["fever", "abdominal pain", "headache", "loss of appetite", "diarrhea", "fatigue"]
+    typhoid_match = sum(1 for s in symptoms_lower if s in typhoid_symptoms)
+    if typhoid_match >= 2:
+        base_prob = 28 + (typhoid_match * 11)
+        # Characteristic pattern
+        if "fever" in symptoms_lower and "abdominal pain" in symptoms_lower:
+            base_prob += 15
+        # City factor
+        if city_data.get("Typhoid", {}).get("risk") == "HIGH":
+            base_prob += 18
+        predictions["Typhoid"] = min(base_prob, 85)
+    
+    # ========== VIRAL FLU DETECTION ==========
+    flu_symptoms = ["fever", "cough", "cold", "headache", "body pain", "fatigue", "nausea"]
+    flu_match = sum(1 for s in symptoms_lower if s in flu_symptoms)
+    if flu_match >= 2:
+        base_prob = 40 + (flu_match * 8)
+        # Common combination
+        if "fever" in symptoms_lower and "cough" in symptoms_lower:
+            base_prob += 10
+        predictions["Viral Flu"] = min(base_prob, 92)
+    
+    # ========== RESPIRATORY INFECTION ==========
+    resp_symptoms = ["cough", "breathlessness", "chest pain", "fever", "cold", "fatigue"]
+    resp_match = sum(1 for s in symptoms_lower if s in resp_symptoms)
+    if resp_match >= 2:
+        base_prob = 30 + (resp_match * 12)
+        # Severity indicators
+        if "breathlessness" in symptoms_lower:
+            base_prob += 15
+        if "chest pain" in symptoms_lower:
+            base_prob += 12
+        # Age vulnerability
+        if age > 60:
+            base_prob += 15
+        elif age < 5:
+            base_prob += 10
+        predictions["Respiratory Infection"] = min(base_prob, 90)
+    
+    # ========== GASTROENTERITIS ==========
+    gastro_symptoms = ["nausea", "vomiting", "diarrhea", "abdominal pain", "fever", "loss of appetite"]
+    gastro_match = sum(1 for s in symptoms_lower if s in gastro_symptoms)
+    if gastro_match >= 2:
+        base_prob = 35 + (gastro_match * 10)
+        # GI specific
+        if "vomiting" in symptoms_lower and "diarrhea" in symptoms_lower:
+            base_prob += 15
+        predictions["Gastroenteritis"] = min(base_prob, 88)
+    
+    # Sort by probability (highest first)
+    predictions = dict(sorted(predictions.items(), key=lambda x: x[1], reverse=True))
+    
+    return predictions
+
+
+def calculate_risk_score(
+    symptoms: list,
+    age: int,
+    bp_systolic: int,
+    bp_diastolic: int,
+    pulse: int,
+    city: str,
+    predictions: dict
+) -> dict:
+    """
+    Calculate comprehensive risk score and category.
+    
+    Args:
+        symptoms: List of symptoms
+        age: Patient age
+        bp_systolic: Systolic blood pressure
+        bp_diastolic: Diastolic blood pressure
+        pulse: Heart rate
+        city: Patient city
+        predictions: Disease predictions dict
+        
+    Returns:
+        Dictionary with score, category, and risk factors
+    """
+    risk_score = 0
+    risk_factors = []
+    
+    # ========== AGE FACTOR ==========
+    if age >= 75:
+        risk_score += 35
+        risk_factors.append("Very Elderly (75+)")
+    elif age >= 65:
+        risk_score += 25
+        risk_factors.append("Elderly (65+)")
+    elif age >= 55:
+        risk_score += 15
+        risk_factors.append("Senior (55+)")
+    elif age <= 2:
+        risk_score += 30
+        risk_factors.append("Infant (0-2 years)")
+    elif age <= 5:
+        risk_score += 20
+        risk_factors.append("Young Child (2-5 years)")
+    
+    # ========== SYMPTOM COUNT ==========
+    symptom_count = len(symptoms)
+    if symptom_count >= 6:
+        risk_score += 30
+        risk_factors.append(f"Many symptoms ({symptom_count})")
+    elif symptom_count >= 4:
+        risk_score += 20
+        risk_factors.append(f"Multiple symptoms ({symptom_count})")
+    elif symptom_count >= 2:
+        risk_score += 10
+    
+    # ========== CRITICAL SYMPTOMS ==========
+    critical_symptoms = {
+        "breathlessness": 25,
+        "chest pain": 25,
+        "jaundice": 20,
+        "vomiting": 10,
+        "diarrhea": 10
+    }
+    symptoms_lower = [s.lower() for s in symptoms]
+    
+    for symptom, score in critical_symptoms.items():
+        if symptom in symptoms_lower:
+            risk_score += score
+            if score >= 20:
+                risk_factors.append(f"Critical: {symptom.title()}")
+    
+    # ========== VITAL SIGNS ==========
+    if bp_systolic > 0 and bp_diastolic > 0:
+        # Hypertensive crisis
+        if bp_systolic >= 180 or bp_diastolic >= 120:
+            risk_score += 35
+            risk_factors.append("⚠️ Hypertensive Crisis")
+        # Stage 2 hypertension
+        elif bp_systolic >= 140 or bp_diastolic >= 90:
+            risk_score += 18
+            risk_factors.append("High Blood Pressure")
+        # Hypotension
+        elif bp_systolic < 90 or bp_diastolic < 60:
+            risk_score += 22
+            risk_factors.append("Low Blood Pressure")
+    
+    if pulse > 0:
+        if pulse > 120:
+            risk_score += 18
+            risk_factors.append("Tachycardia (Rapid Heart)")
+        elif pulse > 100:
+            risk_score += 10
+            risk_factors.append("Elevated Heart Rate")
+        elif pulse < 50:
+            risk_score += 18
+            risk_factors.append("Bradycardia (Slow Heart)")
+    
+    # ========== CITY OUTBREAK FACTOR ==========
+    city_data = CITY_DISEASE_DATA.get(city, {}).get("diseases", {})
+    high_risk_count = sum(1 for d in city_data.values() if d.get("risk") == "HIGH")
+    
+    if high_risk_count >= 4:
+        risk_score += 20
+        risk_factors.append(f"City outbreak zone ({high_risk_count} diseases)")
+    elif high_risk_count >= 2:
+        risk_score += 12
+        risk_factors.append(f"City has active outbreaks")
+    elif high_risk_count >= 1:
+        risk_score += 6
+    
+    # ========== DISEASE PREDICTION SEVERITY ==========
+    if predictions:
+        top_prob = list(predictions.values())[0]
+        top_disease = list(predictions.keys())[0]
+        
+        if top_prob >= 85:
+            risk_score += 25
+            risk_factors.append(f"High probability: {top_disease}")
+        elif top_prob >= 70:
+            risk_score += 15
+            risk_factors.append(f"Likely: {top_disease}")
+        elif top_prob >= 55:
+            risk_score += 8
+    
+    # ========== CALCULATE FINAL CATEGORY ==========
+    risk_score = min(risk_score, 100)
+    
+    if risk_score >= 70:
+        category = "HIGH"
+    elif risk_score >= 40:
+        category = "MEDIUM"
+    else:
+        category = "LOW"
+    
+    return {
+        "score": risk_score,
+        "category": category,
+        "factors": risk_factors
+    }
+
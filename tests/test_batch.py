@@ -0,0 +1,57 @@
+"""Vectorized scoring agrees with the per-patient engine."""
+
+import random
+
+import numpy as np
+
+from batch import (
+    DISEASE_NAMES,
+    calculate_risk_score_batch,
+    predict_disease_batch,
+    symptom_matrix,
+    top_predictions
+)
+from data import CITY_DISEASE_DATA, SYMPTOM_LIST
+from prediction import calculate_risk_score, predict_disease
+
+
+def test_batch_matches_per_patient_engine():
+    rng = random.Random(11)
+    n = 500
+    symptoms = [rng.sample(SYMPTOM_LIST, rng.randint(0, 8)) for _ in range(n)]
+    cities = [rng.choice(list(CITY_DISEASE_DATA) + ["Pune"]) for _ in range(n)]
+    ages = np.array([rng.randint(0, 95) for _ in range(n)])
+    systolic = np.array([rng.choice([0, rng.randint(80, 200)]) for _ in range(n)])
+    diastolic = np.array([rng.choice([0, rng.randint(50, 130)]) for _ in range(n)])
+    pulse = np.array([rng.choice([0, rng.randint(40, 150)]) for _ in range(n)])
+
+    matrix = symptom_matrix(symptoms)
+    probabilities = predict_disease_batch(matrix, cities, ages)
+    risk = calculate_risk_score_batch(matrix, ages, systolic, diastolic, pulse, cities, probabilities)
+    top, top_prob = top_predictions(probabilities)
+
+    for i in range(n):
+        predictions = predict_disease(symptoms[i], cities[i], int(ages[i]))
+        row = {DISEASE_NAMES[j]: int(p) for j, p in enumerate(probabilities[i]) if p}
+        assert row == predictions
+        if predictions:
+            assert (DISEASE_NAMES[top[i]], int(top_prob[i])) == next(iter(predictions.items()))
+        else:
+            assert top[i] == -1
+        expected = calculate_risk_score(
+            symptoms[i], int(ages[i]), int(systolic[i]), int(diastolic[i]), int(pulse[i]), cities[i], predictions
+        )
+        assert (int(risk["score"][i]), risk["category"][i]) == (expected["score"], expected["category"])
+
+
+def test_symptom_matrix_ignores_case_and_unknown_symptoms():
+    matrix = symptom_matrix([["FEVER", "rash"], ["Itching"], []])
+    assert matrix.shape[0] == 3
+    assert matrix[0].sum() == 2
+    assert not matrix[1].any() and not matrix[2].any()
+
+
+def test_one_city_for_everyone():
+    matrix = symptom_matrix([["Fever", "Rash"], ["Cough", "Night Sweats", "Weight Loss"]])
+    probabilities = predict_disease_batch(matrix, "Ahmedabad", [30, 60])
+    assert probabilities[0, DISEASE_NAMES.index("Dengue")] == predict_disease(["Fever", "Rash"], "Ahmedabad", 30)["Dengue"]
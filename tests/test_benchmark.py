@@ -0,0 +1,25 @@
+"""Regression gating against saved baselines."""
+
+import json
+
+from benchmark import compare, main, meta_mismatches, run_meta
+
+
+def test_compare_flags_slowdowns_only():
+    baseline = {"a": {"p50_us": 10.0}, "b": {"p50_us": 10.0}, "c": {"p50_us": 0}}
+    results = {"a": {"p50_us": 10.5}, "b": {"p50_us": 12.0}, "c": {"p50_us": 5.0}, "d": {"p50_us": 1.0}}
+    assert [name for name, *_ in compare(results, baseline, 0.10)] == ["b"]
+
+
+def test_meta_mismatches():
+    meta = run_meta(100, 0)
+    assert meta_mismatches(meta, run_meta(100, 0)) == []
+    assert meta_mismatches(meta, run_meta(200, 0)) == [("n", 100, 200)]
+    assert meta_mismatches(dict(meta, machine="other"), meta) == [("machine", "other", meta["machine"])]
+
+
+def test_refuses_baseline_from_another_workload(tmp_path, capsys):
+    path = tmp_path / "baseline.json"
+    path.write_text(json.dumps({"meta": run_meta(50, 1), "results": {}}))
+    assert main(["-n", "20", "--repeat", "1", "--compare", str(path)]) == 2
+    assert "WARNING baseline n=50" in capsys.readouterr().out
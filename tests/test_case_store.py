@@ -0,0 +1,47 @@
+"""Weekly case grid: derived levels, growth and persistence."""
+
+import numpy as np
+
+from case_store import CaseStore, risk_level
+from data import CITY_DISEASE_DATA
+
+
+def test_summary_reproduces_seeded_levels():
+    summary = CaseStore.from_city_data(CITY_DISEASE_DATA).summary()
+    checked = 0
+    for city, entry in CITY_DISEASE_DATA.items():
+        for disease, derived in summary[city].items():
+            assert derived["risk"] == entry["diseases"][disease]["risk"], (city, disease, derived)
+            checked += 1
+    assert checked
+
+
+def test_thresholds_reproduce_hand_entered_levels():
+    for entry in CITY_DISEASE_DATA.values():
+        for record in entry["diseases"].values():
+            trend = float(record["trend"].rstrip("%"))
+            assert risk_level(record["current"], trend) == record["risk"]
+
+
+def test_append_week_grows_and_keeps_history():
+    store = CaseStore.from_city_data(CITY_DISEASE_DATA)
+    before = store.counts.copy()
+    for week in range(20):
+        store.append_week({"Ahmedabad": {"Dengue": 100 + week}, "Pune": {"Cholera": week}})
+    assert store.counts.shape == (len(CITY_DISEASE_DATA) + 1, before.shape[1] + 1, before.shape[2] + 20)
+    np.testing.assert_array_equal(store.counts[:before.shape[0], :before.shape[1], :before.shape[2]], before)
+    assert store.series("Ahmedabad", "Dengue")[-1] == 119
+    assert np.isnan(store.series("Ahmedabad", "TB")[-1])
+    assert store.weekly_cases("Pune")[f"Week {store.last_week}"] == {"Cholera": 19}
+
+
+def test_saved_store_round_trips_and_appends(tmp_path):
+    path = str(tmp_path / "cases.bin")
+    store = CaseStore.from_city_data(CITY_DISEASE_DATA)
+    store.append_week({"Delhi": {"Dengue": 250}})
+    store.save(path)
+    loaded = CaseStore.load(path)
+    np.testing.assert_array_equal(loaded.counts, store.counts)
+    loaded.append_week({"Delhi": {"Dengue": 260}})
+    assert loaded.series("Delhi", "Dengue")[-2:].tolist() == [250, 260]
+    assert CaseStore.load(path).weeks == store.weeks
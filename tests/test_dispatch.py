@@ -0,0 +1,65 @@
+"""Alert delivery: batching, retries, and no resends of maybe-delivered alerts."""
+
+import asyncio
+
+import pytest
+
+from dispatch import AlertDispatcher, FakeGateway
+
+CONTACTS = {"Delhi": {"AIIMS Delhi": "+911100000001", "Safdarjung": "+911100000002"}}
+
+
+def record(category, name="Ravi"):
+    return {"patient": {"city": "Delhi", "name": name}, "risk": {"category": category}, "summary": f"{name} {category}"}
+
+
+def test_alerts_batched_per_hospital():
+    async def main():
+        gateway = await FakeGateway().start()
+        dispatcher = AlertDispatcher(gateway.url, CONTACTS, batch_window=0.05, backoff=0.01)
+        await dispatcher.start()
+        for i in range(5):
+            dispatcher.submit(record("HIGH", f"P{i}"))
+        dispatcher.submit(record("MEDIUM", "M"))
+        dispatcher.submit(record("LOW", "L"))
+        await dispatcher.close()
+        await gateway.stop()
+        return dispatcher.stats, gateway.messages
+
+    stats, messages = asyncio.run(main())
+    assert stats["skipped"] == 1 and stats["failed"] == 0
+    assert stats["alerts_sent"] == 11
+    assert sorted(m["to"] for m in messages) == ["+911100000001", "+911100000002"]
+
+
+@pytest.mark.parametrize("response", [
+    b"garbage\r\n\r\n",
+    b"HTTP/1.1 200 OK\r\nContent-Length: 9\r\n\r\nnot json!",
+    b"HTTP/1.1 200 OK\r\nContent-Length: lots\r\n\r\n",
+])
+def test_garbled_response_is_not_resent(response):
+    requests = []
+
+    async def handle(reader, writer):
+        await reader.readuntil(b"\r\n\r\n")
+        requests.append(1)
+        writer.write(response)
+        await writer.drain()
+        writer.close()
+
+    async def main():
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        dispatcher = AlertDispatcher(f"http://127.0.0.1:{port}/send", {"Delhi": {"AIIMS": "+91"}},
+                                     batch_window=0.01, backoff=0.01)
+        await dispatcher.start()
+        dispatcher.submit(record("HIGH"))
+        await dispatcher.close()
+        server.close()
+        await server.wait_closed()
+        return dispatcher
+
+    dispatcher = asyncio.run(main())
+    assert len(requests) == 1
+    assert dispatcher.stats["failed"] == 1 and dispatcher.stats["retries"] == 0
+    assert len(dispatcher.failures) == 1
@@ -0,0 +1,49 @@
+"""The optimized engine must score exactly like the original implementation."""
+
+import random
+
+import pytest
+
+from data import CITY_DISEASE_DATA, SYMPTOM_LIST
+from prediction import calculate_risk_score, predict_disease
+
+import reference_engine
+
+CITIES = list(CITY_DISEASE_DATA) + ["Pune", ""]
+EXTRA_SYMPTOMS = ["Itching", "FEVER", "cough"]
+
+
+def random_patient(rng: random.Random) -> tuple:
+    symptoms = rng.sample(SYMPTOM_LIST + EXTRA_SYMPTOMS, rng.randint(0, 9))
+    if symptoms and rng.random() < 0.1:
+        symptoms.append(symptoms[0])
+    return (
+        symptoms,
+        rng.choice(CITIES),
+        rng.randint(-1, 100),
+        rng.choice([0, rng.randint(70, 200)]),
+        rng.choice([0, rng.randint(40, 130)]),
+        rng.choice([0, rng.randint(40, 150)])
+    )
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_reference_on_random_patients(seed):
+    rng = random.Random(seed)
+    for _ in range(2000):
+        symptoms, city, age, systolic, diastolic, pulse = random_patient(rng)
+        expected = reference_engine.predict_disease(symptoms, city, age)
+        predictions = predict_disease(symptoms, city, age)
+        assert list(predictions.items()) == list(expected.items())
+        assert calculate_risk_score(symptoms, age, systolic, diastolic, pulse, city, predictions) == \
+            reference_engine.calculate_risk_score(symptoms, age, systolic, diastolic, pulse, city, expected)
+
+
+def test_boundary_vitals_match_reference():
+    for age in (0, 2, 3, 5, 6, 54, 55, 64, 65, 74, 75):
+        for systolic, diastolic in ((0, 0), (89, 70), (90, 60), (139, 89), (140, 80), (180, 90), (120, 120)):
+            for pulse in (0, 49, 50, 100, 101, 120, 121):
+                args = (["Fever", "Cough"], age, systolic, diastolic, pulse, "Delhi")
+                assert calculate_risk_score(*args, predict_disease(["Fever", "Cough"], "Delhi", age)) == \
+                    reference_engine.calculate_risk_score(*args, reference_engine.predict_disease(
+                        ["Fever", "Cough"], "Delhi", age))
@@ -0,0 +1,49 @@
+"""Free-text place names resolve to the right locality, or to nothing."""
+
+import pytest
+
+from locality import LOCALITY_INDEX
+
+
+def resolved(text, fuzzy=False):
+    node = LOCALITY_INDEX.resolve(text, fuzzy=fuzzy)
+    return node.path_name if node is not None else None
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Ahmedabad", "Gujarat / Ahmedabad"),
+    ("Bombay", "Maharashtra / Mumbai"),
+    ("अहमदाबाद", "Gujarat / Ahmedabad"),
+    ("GJ", "Gujarat"),
+    ("Vastrapur, Amdavad", "Gujarat / Ahmedabad / Vastrapur"),
+    ("Vastrapur area, Ahmedabad", "Gujarat / Ahmedabad / Vastrapur"),
+    ("Andheri West, Mumbai", "Maharashtra / Mumbai / Andheri"),
+])
+def test_resolves_names_aliases_and_qualified_wards(text, expected):
+    assert resolved(text) == expected
+
+
+@pytest.mark.parametrize("text", ["", "Atlantis", "Vastrapur", "Ahmedabad Mumbai"])
+def test_unknown_bare_ward_or_conflicting_places_resolve_to_none(text):
+    assert resolved(text) is None
+
+
+@pytest.mark.parametrize("text", [
+    "Navi Mumbai",
+    "Mumbai Pune Highway",
+    "Delhi Public School Hyderabad",
+    "Ahmedabad Road Kolkata",
+    "Vastrapr, Ahmedabad",
+])
+def test_unmatched_words_make_the_place_unknown(text):
+    assert resolved(text) is None
+
+
+def test_fuzzy_only_inside_an_exact_anchor():
+    assert resolved("Vastrapr, Ahmedabad", fuzzy=True) == "Gujarat / Ahmedabad / Vastrapur"
+    assert resolved("Vastrapr", fuzzy=True) is None
+
+
+def test_search_prefix():
+    names = [node.name for node in LOCALITY_INDEX.search("ahm")]
+    assert names[0] == "Ahmedabad"
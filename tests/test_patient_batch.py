@@ -0,0 +1,41 @@
+"""Columnar patient storage round-trips the app's dict shapes."""
+
+import random
+
+from data import CITY_DISEASE_DATA, SYMPTOM_LIST
+from patient_batch import PatientBatch
+from prediction import calculate_risk_score, predict_disease
+
+
+def test_round_trip():
+    rng = random.Random(6)
+    patients, predictions, risks = [], [], []
+    for i in range(200):
+        symptoms = rng.sample(SYMPTOM_LIST, rng.randint(0, 6)) + (["Itching"] if i % 7 == 0 else [])
+        patient = {
+            "name": f"Patient {i}", "age": rng.randint(0, 90), "gender": rng.choice(["", "M", "F"]),
+            "city": rng.choice(list(CITY_DISEASE_DATA)), "symptoms": symptoms,
+            "bp": f"{rng.randint(90, 190)}/{rng.randint(50, 120)}", "pulse": rng.randint(40, 150),
+            "timestamp": "2024-01-01 10:00"
+        }
+        pred = predict_disease(symptoms, patient["city"], patient["age"])
+        patients.append(patient)
+        predictions.append(pred)
+        risks.append(calculate_risk_score(symptoms, patient["age"], 0, 0, patient["pulse"], patient["city"], pred))
+    assert PatientBatch.from_dicts(patients, predictions, risks).to_dicts() == (patients, predictions, risks)
+
+
+def test_string_vitals_are_coerced():
+    batch = PatientBatch.from_dicts([
+        {"age": "45", "pulse": " 80 ", "bp_systolic": "130", "bp_diastolic": "85"},
+        {"age": 30.0, "pulse": "N/A", "bp": "high"},
+    ])
+    assert batch.patient(0)["age"] == 45 and batch.patient(0)["pulse"] == 80
+    assert batch.patient(0)["bp"] == "130/85"
+    assert batch.patient(1)["age"] == 30 and batch.patient(1)["pulse"] == 0 and batch.patient(1)["bp"] == ""
+
+
+def test_many_unlisted_factors():
+    factors = [f"Site note {i}" for i in range(40000)]
+    batch = PatientBatch.from_dicts([{}], risks=[{"score": 10, "category": "LOW", "factors": factors}])
+    assert batch.factors(0)[-1] == "Site note 39999"
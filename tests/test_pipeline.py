@@ -0,0 +1,55 @@
+"""Camp dictations split into patients and score as they stream."""
+
+from pipeline import parse_bp, screen_transcript, segment_transcript
+
+
+def segments(chunks):
+    return [(s["index"], s["text"]) for s in segment_transcript(chunks)]
+
+
+def test_header_sets_numbering_and_is_not_a_patient():
+    text = "camp screening patients 5 to 8. next patient Ramesh age 40 fever cough. next patient Sita age 30 rash"
+    assert segments([text]) == [(5, "Ramesh age 40 fever cough."), (6, "Sita age 30 rash")]
+
+
+def test_numbered_markers():
+    text = "patient 3 Ramesh age 40 fever. patient number 7 Sita age 30 rash. मरीज 9 Gita age 20 cough"
+    assert [index for index, _ in segments([text])] == [3, 7, 9]
+
+
+def test_marker_split_across_chunks():
+    chunks = ["patients 1 to 20. patient 1 Ramesh age 40 fever. pat", "ient 1", "2 Sita age 30 rash"]
+    assert segments(chunks) == [(1, "Ramesh age 40 fever."), (12, "Sita age 30 rash")]
+
+
+def test_unmarked_dictation_is_one_patient():
+    assert segments(["Ramesh age 40 ", "fever cough"]) == [(1, "Ramesh age 40 fever cough")]
+
+
+def test_screen_transcript_scores_each_patient():
+    records = list(screen_transcript(
+        ["patients 1 to 2. patient 1 Ramesh age 40 fever cough. patient 2 age 30 rash fever"], "Delhi"
+    ))
+    assert [r["patient"]["name"] for r in records] == ["Ramesh", "Patient 2"]
+    assert [r["patient"]["age"] for r in records] == [40, 30]
+    assert all(r["risk"]["category"] in ("LOW", "MEDIUM", "HIGH") for r in records)
+    assert "Dengue" in records[1]["predictions"]
+
+
+def test_parse_bp():
+    assert parse_bp("120/80") == (120, 80)
+    assert parse_bp("") == (0, 0)
+    assert parse_bp("high") == (0, 0)
+
+
+def test_text_before_first_marker_is_a_patient():
+    text = "Ramesh age 40 fever cough. next patient Sita age 30 rash fever"
+    assert segments([text]) == [(1, "Ramesh age 40 fever cough."), (2, "Sita age 30 rash fever")]
+    assert segments(["Ramesh age 40 fever. ", "patient 5 Sita age 30 rash"]) == [
+        (1, "Ramesh age 40 fever."), (5, "Sita age 30 rash")
+    ]
+
+
+def test_marker_at_end_of_stream_closes_the_segment():
+    assert segments(["patient 1 Ramesh age 40 fever. next patient"]) == [(1, "Ramesh age 40 fever.")]
+    assert segments(["patient 1 Ramesh age 40 fever. patient", " 2"]) == [(1, "Ramesh age 40 fever.")]
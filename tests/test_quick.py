@@ -0,0 +1,38 @@
+"""quick_triage gives the same category and ranking as the full engine."""
+
+import random
+
+from data import CITY_DISEASE_DATA, SYMPTOM_LIST
+from prediction import calculate_risk_score, predict_disease
+from quick import quick_triage, top_diseases
+
+
+def test_category_and_top_match_full_engine():
+    rng = random.Random(9)
+    cities = list(CITY_DISEASE_DATA) + ["Pune"]
+    for _ in range(5000):
+        symptoms = rng.sample(SYMPTOM_LIST, rng.randint(0, 9))
+        city = rng.choice(cities)
+        age = rng.randint(0, 95)
+        vitals = (rng.choice([0, rng.randint(70, 200)]), rng.choice([0, rng.randint(40, 130)]),
+                  rng.choice([0, rng.randint(40, 150)]))
+        k = rng.randint(0, 3)
+        predictions = predict_disease(symptoms, city, age)
+        expected = calculate_risk_score(symptoms, age, *vitals, city, predictions)
+        result = quick_triage(symptoms, age, *vitals, city, k=k)
+        assert result.category == expected["category"]
+        assert result.top == list(predictions.items())[:k]
+        assert result.risk == expected
+
+
+def test_top_diseases_is_a_prefix_of_predict_disease():
+    symptoms = ["Fever", "Headache", "Body Pain", "Fatigue"]
+    predictions = list(predict_disease(symptoms, "Ahmedabad", 40).items())
+    for k in range(len(predictions) + 2):
+        assert top_diseases(symptoms, "Ahmedabad", 40, k) == predictions[:k]
+
+
+def test_lazy_explanation():
+    result = quick_triage(["Breathlessness", "Chest Pain"], 80, 190, 100, 130, "Delhi")
+    assert result.high
+    assert "Very Elderly (75+)" in result.factors
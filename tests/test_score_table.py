@@ -0,0 +1,53 @@
+"""The precomputed score table serves the same answers as the live engine."""
+
+import random
+
+import pytest
+
+from city_index import update_city_disease
+from data import CITY_DISEASE_DATA, SYMPTOM_LIST
+from prediction import calculate_risk_score, predict_disease
+from score_table import build_score_table, load_score_table
+
+
+@pytest.fixture(scope="module")
+def table_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp("table") / "scores.bin"
+    build_score_table(str(path))
+    return str(path)
+
+
+def assert_matches_engine(table, rng, n):
+    cities = list(CITY_DISEASE_DATA) + ["Pune"]
+    for _ in range(n):
+        symptoms = rng.sample(SYMPTOM_LIST, rng.randint(0, 9))
+        if symptoms and rng.random() < 0.05:
+            symptoms.append(symptoms[0])
+        city = rng.choice(cities)
+        age = rng.randint(-1, 100)
+        vitals = (rng.choice([0, rng.randint(70, 200)]), rng.choice([0, rng.randint(40, 130)]),
+                  rng.choice([0, rng.randint(40, 150)]))
+        predictions = predict_disease(symptoms, city, age)
+        assert list(table.predict(symptoms, city, age).items()) == list(predictions.items())
+        expected = calculate_risk_score(symptoms, age, *vitals, city, predictions)
+        assert table.risk(symptoms, age, *vitals, city) == {"score": expected["score"], "category": expected["category"]}
+
+
+def test_table_matches_engine(table_path):
+    table = load_score_table(table_path)
+    assert table.valid
+    assert_matches_engine(table, random.Random(3), 5000)
+
+
+def test_city_update_falls_back_to_live_engine(table_path, city_data):
+    table = load_score_table(table_path)
+    city = next(iter(CITY_DISEASE_DATA))
+    update_city_disease(city, "Dengue", risk="LOW" if city_data[city]["diseases"]["Dengue"]["risk"] != "LOW" else "HIGH")
+    assert_matches_engine(table, random.Random(4), 2000)
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"not a table")
+    with pytest.raises(ValueError):
+        load_score_table(str(path))
@@ -0,0 +1,63 @@
+"""Bulk file screening: formats, passthrough columns and per-row errors."""
+
+import csv
+import io
+import json
+
+from prediction import calculate_risk_score, predict_disease
+from screen_file import ResultWriter, main, read_rows, score_chunk
+
+
+def screen(lines, fmt_in="jsonl", fmt_out="csv"):
+    rows = score_chunk(list(read_rows(io.StringIO(lines), fmt_in)))
+    out = io.StringIO()
+    writer = ResultWriter(out, fmt_out)
+    writer.write(rows[:1])
+    writer.write(rows[1:])
+    writer.close()
+    return out.getvalue()
+
+
+def test_scores_match_engine():
+    rows = score_chunk([{"symptoms": "Fever; Rash", "age": "30", "city": "Delhi", "bp": "150/95", "pulse": "110"}])
+    predictions = predict_disease(["Fever", "Rash"], "Delhi", 30)
+    risk = calculate_risk_score(["Fever", "Rash"], 30, 150, 95, 110, "Delhi", predictions)
+    assert rows[0]["predictions"] == predictions
+    assert (rows[0]["risk_score"], rows[0]["risk_category"]) == (risk["score"], risk["category"])
+
+
+def test_csv_output_keeps_columns_first_seen_in_later_rows():
+    lines = "\n".join([
+        json.dumps({"id": 1, "symptoms": ["Fever"], "age": 30, "city": "Delhi"}),
+        json.dumps({"id": 2, "symptoms": ["Cough"], "age": 40, "city": "Delhi", "ward": "Rohini"}),
+    ])
+    rows = list(csv.DictReader(io.StringIO(screen(lines))))
+    assert rows[1]["ward"] == "Rohini" and rows[0]["ward"] == ""
+    assert list(rows[0])[:3] == ["id", "symptoms", "age"]
+
+
+def test_bad_rows_get_an_error_column():
+    lines = "\n".join([
+        json.dumps({"id": 1, "symptoms": ["Fever", "Cough"], "age": 30, "city": "Delhi"}),
+        "{not json",
+        json.dumps({"id": 3, "symptoms": ["Fever"], "age": "inf", "city": "Delhi"}),
+        json.dumps({"id": 4, "symptoms": 5, "age": 30, "city": "Delhi"}),
+        json.dumps([1, 2]),
+    ])
+    rows = [json.loads(line) for line in screen(lines, fmt_out="jsonl").splitlines()]
+    assert len(rows) == 5
+    assert "error" not in rows[0] and rows[0]["risk_category"]
+    assert "line 2" in rows[1]["error"] and rows[1]["risk_category"] == ""
+    assert rows[2]["age"] == "inf" and "error" not in rows[2]
+    assert rows[3]["id"] == 4 and rows[3]["error"].startswith("TypeError")
+    assert "line 5" in rows[4]["error"]
+
+
+def test_cli_round_trip(tmp_path):
+    source = tmp_path / "patients.csv"
+    source.write_text("name,symptoms,age,city,bp\nRavi,Fever;Rash,30,Delhi,120/80\nSita,Cough,70,Surat,\n")
+    output = tmp_path / "scored.json"
+    assert main([str(source), "-o", str(output), "--workers", "1"]) == 0
+    rows = json.loads(output.read_text())
+    assert [row["name"] for row in rows] == ["Ravi", "Sita"]
+    assert rows[0]["predictions"] == predict_disease(["Fever", "Rash"], "Delhi", 30)
@@ -0,0 +1,100 @@
+"""ASGI scoring service: batching, validation and shutdown."""
+
+import asyncio
+import json
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from data import CITY_DISEASE_DATA, SYMPTOM_LIST
+from prediction import calculate_risk_score, predict_disease
+from service import MicroBatcher, Overloaded, ScoringService
+
+
+async def call(app, method, path, body=None):
+    if body is None:
+        raw = b""
+    else:
+        raw = body if isinstance(body, bytes) else json.dumps(body).encode()
+    messages = [{"type": "http.request", "body": raw, "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    await app({"type": "http", "method": method, "path": path, "headers": []}, receive, send)
+    return sent[0]["status"], json.loads(sent[1]["body"])
+
+
+def test_concurrent_requests_match_engine():
+    rng = random.Random(8)
+    patients = [
+        {
+            "symptoms": rng.sample(SYMPTOM_LIST, rng.randint(0, 6)),
+            "city": rng.choice(list(CITY_DISEASE_DATA)),
+            "age": rng.randint(0, 90),
+            "bp_systolic": rng.randint(90, 200),
+            "bp_diastolic": rng.randint(50, 120),
+            "pulse": rng.randint(40, 150)
+        }
+        for _ in range(100)
+    ]
+
+    async def main():
+        app = ScoringService(max_batch=16, max_wait=0.005)
+        try:
+            return await asyncio.gather(*[call(app, "POST", "/risk", p) for p in patients])
+        finally:
+            await app.shutdown()
+
+    for patient, (status, body) in zip(patients, asyncio.run(main())):
+        predictions = predict_disease(patient["symptoms"], patient["city"], patient["age"])
+        expected = calculate_risk_score(
+            patient["symptoms"], patient["age"], patient["bp_systolic"], patient["bp_diastolic"],
+            patient["pulse"], patient["city"], predictions
+        )
+        assert status == 200
+        assert body == json.loads(json.dumps(expected))
+
+
+def test_bad_requests_get_400():
+    async def main():
+        app = ScoringService()
+        try:
+            return [
+                await call(app, "POST", "/predict", b'{"symptoms": [], "city": "Delhi", "age": 1e400}'),
+                await call(app, "POST", "/predict", {"symptoms": "Fever", "city": "Delhi", "age": 30}),
+                await call(app, "POST", "/predict", b"not json"),
+            ]
+        finally:
+            await app.shutdown()
+
+    assert [status for status, _ in asyncio.run(main())] == [400, 400, 400]
+
+
+def test_stop_refuses_queued_items():
+    release = threading.Event()
+
+    def slow(items):
+        release.wait(5)
+        return items
+
+    async def main():
+        executor = ThreadPoolExecutor(1)
+        batcher = MicroBatcher(slow, executor, max_batch=1, max_wait=0)
+        batcher.start(concurrency=1)
+        submitted = [asyncio.ensure_future(batcher.submit(i)) for i in range(5)]
+        await asyncio.sleep(0.05)
+        stopping = asyncio.ensure_future(batcher.stop())
+        await asyncio.sleep(0.05)
+        release.set()
+        await stopping
+        executor.shutdown()
+        return await asyncio.gather(*submitted, return_exceptions=True)
+
+    outcomes = asyncio.run(main())
+    assert outcomes[0] == 0
+    assert all(isinstance(outcome, Overloaded) for outcome in outcomes[2:])
@@ -0,0 +1,64 @@
+"""Incremental edits keep the session in step with a full rescore."""
+
+import random
+
+from city_index import update_city_disease
+from data import CITY_DISEASE_DATA, SYMPTOM_LIST
+from prediction import calculate_risk_score, predict_disease
+from session import AssessmentSession
+
+
+def full_score(session):
+    predictions = predict_disease(session.symptoms, session.city, session.age)
+    risk = calculate_risk_score(
+        session.symptoms, session.age, session.bp_systolic, session.bp_diastolic,
+        session.pulse, session.city, predictions
+    )
+    return predictions, risk
+
+
+def assert_consistent(session):
+    predictions, risk = full_score(session)
+    assert list(session.predictions.items()) == list(predictions.items())
+    assert session.risk == risk
+
+
+def test_random_edits_match_full_rescore():
+    rng = random.Random(5)
+    cities = list(CITY_DISEASE_DATA) + ["Pune"]
+    session = AssessmentSession(city="Delhi", age=30)
+    for _ in range(3000):
+        action = rng.randrange(6)
+        if action == 0:
+            session.add_symptom(rng.choice(SYMPTOM_LIST))
+        elif action == 1 and session.symptoms:
+            session.remove_symptom(rng.choice(session.symptoms).upper())
+        elif action == 2:
+            session.toggle_symptom(rng.choice(SYMPTOM_LIST))
+        elif action == 3:
+            session.set_age(rng.randint(0, 95))
+        elif action == 4:
+            session.set_bp(rng.choice([0, rng.randint(80, 200)]), rng.choice([0, rng.randint(50, 130)]))
+        else:
+            session.set_city(rng.choice(cities))
+        assert_consistent(session)
+
+
+def test_edit_returns_only_what_changed():
+    session = AssessmentSession(["Fever"], age=30, city="Pune")
+    diff = session.add_symptom("Rash")
+    assert diff["predictions"]["Dengue"][0] is None
+    assert diff["predictions"]["Dengue"][1] == session.predictions["Dengue"]
+    assert session.set_pulse(0) == {}
+    diff = session.set_pulse(130)
+    assert diff["factors_added"] == ["Tachycardia (Rapid Heart)"]
+    assert session.remove_symptom("Itching") == {}
+
+
+def test_city_update_picked_up_on_refresh(city_data):
+    session = AssessmentSession(["Fever", "Rash"], age=30, city="Delhi")
+    level = city_data["Delhi"]["diseases"]["Dengue"]["risk"]
+    update_city_disease("Delhi", "Dengue", risk="LOW" if level != "LOW" else "HIGH")
+    diff = session.refresh()
+    assert "predictions" in diff
+    assert_consistent(session)
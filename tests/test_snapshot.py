@@ -0,0 +1,35 @@
+"""The engine snapshot is only written by the explicit build command."""
+
+import marshal
+
+import snapshot
+
+
+def test_engine_part_does_not_write(tmp_path, monkeypatch):
+    path = tmp_path / "engine.bin"
+    monkeypatch.setenv(snapshot.ENV_VAR, str(path))
+    monkeypatch.setattr(snapshot, "_state", {"loaded": False, "recording": False, "fingerprint": None, "parts": {}})
+
+    class Part:
+        def __init__(self):
+            self.table = {"a": 1}
+
+        def __getstate__(self):
+            return self.__dict__
+
+    assert snapshot.engine_part("part", Part).table == {"a": 1}
+    assert not path.exists()
+
+
+def test_engine_part_restores_a_current_snapshot(tmp_path, monkeypatch):
+    path = tmp_path / "engine.bin"
+    monkeypatch.setenv(snapshot.ENV_VAR, str(path))
+    monkeypatch.setattr(snapshot, "_state", {"loaded": False, "recording": False, "fingerprint": None, "parts": {}})
+    snapshot.save_snapshot(str(path), snapshot.source_fingerprint(), {"part": {"table": {"b": 2}}})
+
+    class Part:
+        def __init__(self):
+            raise AssertionError("should be restored, not built")
+
+    assert snapshot.engine_part("part", Part).table == {"b": 2}
+    assert marshal.loads(path.read_bytes())["parts"] == {"part": {"table": {"b": 2}}}
@@ -0,0 +1,70 @@
+"""SQLite assessment store: buffered writes, queries and replay."""
+
+import sqlite3
+import threading
+
+import pytest
+
+from store import AssessmentStore
+
+RISK = {"score": 40, "category": "MEDIUM", "factors": []}
+
+
+@pytest.fixture
+def store(tmp_path):
+    with AssessmentStore(str(tmp_path / "health.db"), batch_size=50) as store:
+        yield store
+
+
+def fill(store, n):
+    for i in range(n):
+        store.add_assessment(
+            {"city": ("Delhi", "Surat")[i % 2], "age": i, "symptoms": ["Fever"], "bp": "120/80"},
+            {"Dengue": 60},
+            RISK,
+            recorded_at=1000 + (i * 7) % 300
+        )
+    store.flush()
+
+
+def test_queries_use_indexes(store):
+    fill(store, 200)
+    assert store.count(city="Delhi") == 100
+    assert store.counts_by("city") == {"Delhi": 100, "Surat": 100}
+    assert all("INDEX" in step for step in store.query_plan(city="Delhi", since=1000))
+    rows = store.query(city="Surat", limit=5)
+    assert [row["recorded_at"] for row in rows] == sorted((row["recorded_at"] for row in rows), reverse=True)
+
+
+def test_replay_pages_in_time_order(store):
+    fill(store, 1000)
+    chunks = list(store.replay(city="Delhi", since=1100, chunk_size=33))
+    rows = [row for chunk in chunks for row in chunk]
+    assert max(len(chunk) for chunk in chunks) == 33
+    assert len(rows) == store.count(city="Delhi", since=1100)
+    assert [(r["recorded_at"], r["id"]) for r in rows] == sorted((r["recorded_at"], r["id"]) for r in rows)
+    assert rows[0]["symptoms"] == ["Fever"]
+    assert sum(len(chunk) for chunk in store.replay(chunk_size=100)) == 1000
+
+
+def test_paths_with_uri_characters(tmp_path):
+    path = tmp_path / "odd ?name#1%.db"
+    with AssessmentStore(str(path)) as store:
+        fill(store, 10)
+        assert store.count() == 10
+    assert not (tmp_path / "odd ").exists()
+
+
+def test_close_closes_every_reader(tmp_path):
+    store = AssessmentStore(str(tmp_path / "health.db"))
+    fill(store, 5)
+    readers = []
+    for _ in range(3):
+        thread = threading.Thread(target=lambda: readers.append(store._reader()) or store.count())
+        thread.start()
+        thread.join()
+    store.count()
+    store.close()
+    for conn in readers:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
@@ -0,0 +1,57 @@
+"""Clinic samples feed the city index without overriding city-wide figures."""
+
+import copy
+
+from city_index import CityRiskIndex
+from data import CITY_DISEASE_DATA
+from surveillance import SurveillanceAggregator, WindowCounter
+
+WEEK = 7 * 24 * 3600
+
+
+def test_window_counter_splits_recent_and_older():
+    counter = WindowCounter(10.0, 3)
+    for when in (0, 5, 12, 31, 35):
+        counter.add(when)
+    assert (counter.recent, counter.older) == (3, 2)
+    counter.advance(65)
+    assert (counter.recent, counter.older) == (0, 3)
+    counter.advance(95)
+    assert (counter.recent, counter.older) == (0, 0)
+    assert not counter.add(0)
+
+
+def test_small_sample_never_lowers_seeded_level():
+    index = CityRiskIndex(copy.deepcopy(CITY_DISEASE_DATA))
+    seeded = dict(index.city_data["Ahmedabad"]["diseases"]["Dengue"])
+    aggregator = SurveillanceAggregator(index)
+    start = 2000 * WEEK
+    for week in range(4):
+        for i in range(30):
+            aggregator.observe("Ahmedabad", {"Dengue": 80}, start + week * WEEK + i * 3600)
+    aggregator.expire(start + 4 * WEEK - 1)
+    record = index.city_data["Ahmedabad"]["diseases"]["Dengue"]
+    assert record["risk"] == seeded["risk"] == "HIGH"
+    assert (record["current"], record["trend"]) == (seeded["current"], seeded["trend"])
+    assert record["screened"] == 30
+
+
+def test_scaled_sample_raises_level():
+    index = CityRiskIndex(copy.deepcopy(CITY_DISEASE_DATA))
+    assert index.city_data["Ahmedabad"]["diseases"]["Malaria"]["risk"] == "LOW"
+    aggregator = SurveillanceAggregator(index, scale=10.0)
+    for i in range(20):
+        aggregator.observe("Ahmedabad", {"Malaria": 80}, 1_000_000.0 + i * 60)
+    assert index.risk_levels("Ahmedabad")["Malaria"] == "HIGH"
+
+
+def test_unreported_diseases_are_not_published():
+    index = CityRiskIndex(copy.deepcopy(CITY_DISEASE_DATA))
+    high = index.high_risk_count("Ahmedabad")
+    aggregator = SurveillanceAggregator(index)
+    for i in range(300):
+        aggregator.observe("Ahmedabad", {"Respiratory Infection": 90}, 1_000_000.0 + i * 60)
+    aggregator.publish(1_000_000.0 + 300 * 60)
+    assert "Respiratory Infection" not in index.city_data["Ahmedabad"]["diseases"]
+    assert index.high_risk_count("Ahmedabad") == high
+    assert aggregator.snapshot(1_000_000.0 + 300 * 60)["Ahmedabad"]["Respiratory Infection"]["screened"] == 300
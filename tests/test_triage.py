@@ -0,0 +1,62 @@
+"""Triage queue ordering and its per-city / per-hospital views."""
+
+import random
+
+import pytest
+
+from triage import IndexedHeap, TriageQueue
+
+
+def risk(score, category):
+    return {"score": score, "category": category, "factors": []}
+
+
+def test_indexed_heap_orders_and_updates():
+    rng = random.Random(1)
+    heap = IndexedHeap()
+    keys = {}
+    for item in range(200):
+        keys[item] = rng.random()
+        heap.push(item, keys[item])
+    for item in rng.sample(range(200), 50):
+        keys[item] = rng.random()
+        heap.update(item, keys[item])
+    for item in rng.sample(range(200), 30):
+        heap.remove(item)
+        del keys[item]
+    assert list(heap.smallest(10)) == sorted(keys, key=keys.get)[:10]
+    popped = [heap.pop() for _ in range(len(heap))]
+    assert popped == sorted(keys, key=keys.get)
+    assert heap.peek() is None
+
+
+def test_category_then_score_then_arrival():
+    queue = TriageQueue()
+    queue.push("a", risk(50, "MEDIUM"), arrival=1)
+    queue.push("b", risk(75, "HIGH"), arrival=2)
+    queue.push("c", risk(90, "HIGH"), arrival=3)
+    queue.push("d", risk(90, "HIGH"), arrival=0)
+    assert [e["patient_id"] for e in queue.ordered()] == ["d", "c", "b", "a"]
+    queue.update("a", risk(95, "HIGH"))
+    assert queue.peek()["patient_id"] == "a"
+    assert queue.counts() == {"HIGH": 4, "MEDIUM": 0, "LOW": 0}
+
+
+def test_city_and_hospital_views():
+    queue = TriageQueue()
+    queue.push(1, risk(80, "HIGH"), city="Delhi", hospital="AIIMS", arrival=0)
+    queue.push(2, risk(30, "LOW"), city="Delhi", arrival=1)
+    queue.push(3, risk(60, "MEDIUM"), city="Surat", hospital="AIIMS", arrival=2)
+    assert [e["patient_id"] for e in queue.ordered(city="Delhi")] == [1, 2]
+    assert [e["patient_id"] for e in queue.ordered(hospital="AIIMS")] == [1, 3]
+
+    queue.assign(2, "AIIMS")
+    assert queue.counts("hospital") == {"AIIMS": 3}
+    assert queue.pop(hospital="AIIMS")["patient_id"] == 1
+    assert queue.counts("city") == {"Delhi": 1, "Surat": 1}
+    queue.remove(3)
+    assert "Surat" not in queue.counts("city")
+    assert queue.pop(city="Surat") is None
+    assert len(queue) == 1 and 2 in queue
+    with pytest.raises(ValueError):
+        queue.ordered(city="Delhi", hospital="AIIMS")
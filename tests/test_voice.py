@@ -0,0 +1,37 @@
+"""Incremental parsing of ASR partials matches a full parse."""
+
+import random
+
+import pytest
+
+from voice import VOICE_PARSER, IncrementalVoiceParser
+
+TRANSCRIPTS = [
+    "Ramesh age 45 male fever cough and headache bp 140/90",
+    "patients 1 to 40 next patient Sita 30 years female rash joint pain",
+    "İ patients 1 to 40 fever cough age 40",
+    "patient 2 İstanbul visitor age 33 vomiting diarrhea",
+]
+
+
+@pytest.mark.parametrize("text", TRANSCRIPTS)
+def test_growing_partials_match_full_parse(text):
+    parser = IncrementalVoiceParser()
+    for end in range(1, len(text) + 1):
+        parser.partial(text[:end])
+        assert parser.result == VOICE_PARSER.parse(text[:end])
+
+
+def test_revised_hypotheses_match_full_parse():
+    rng = random.Random(2)
+    parser = IncrementalVoiceParser()
+    for _ in range(300):
+        text = rng.choice(TRANSCRIPTS)
+        cut = rng.randint(0, len(text))
+        hypothesis = text[:cut] + rng.choice(["", " fever", " age 70", "İ"])
+        parser.partial(hypothesis)
+        assert parser.result == VOICE_PARSER.parse(parser.text)
+        if rng.random() < 0.1:
+            parser.final(hypothesis)
+        if rng.random() < 0.05:
+            parser.reset()
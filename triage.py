@@ -0,0 +1,323 @@
+"""
+🚑 Triage Queue
+Live waiting list ordered by risk, with O(log n) updates and per-city/per-hospital views
+
+Usage:
+    queue = TriageQueue()
+    for record in screen_transcript(chunks, "Ahmedabad"):
+        queue.push_record(record, hospital="Civil Hospital Ahmedabad")
+    queue.update(patient_id, session.risk)        # vitals re-scored
+    queue.pop(hospital="Civil Hospital Ahmedabad")
+    queue.ordered(city="Ahmedabad", limit=20)     # dashboard view
+"""
+
+import heapq
+import itertools
+import time
+
+# Lower ranks are seen first
+CATEGORY_RANK = {"HIGH": 0, "MEDIUM": 1, "LOW": 2}
+
+
+def triage_key(risk: dict, arrival: float, seq: int) -> tuple:
+    """Sort key: category, then higher score, then earlier arrival (then insertion order)."""
+    return CATEGORY_RANK.get(risk["category"], len(CATEGORY_RANK)), -risk["score"], arrival, seq
+
+
+# ============================================================
+# 🔢 INDEXED HEAP
+# ============================================================
+
+class IndexedHeap:
+    """
+    Binary min-heap of ids with a position index.
+
+    Besides push and pop, any id's key can be changed or the id removed in
+    O(log n), since its slot in the heap array is always known.
+    """
+
+    def __init__(self):
+        self._heap = []    # ids in heap order
+        self._keys = {}    # id -> key
+        self._pos = {}     # id -> index in _heap
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __contains__(self, item_id) -> bool:
+        return item_id in self._pos
+
+    def push(self, item_id, key):
+        """Add an id, or change its key if it is already present."""
+        if item_id in self._pos:
+            self.update(item_id, key)
+            return
+        self._keys[item_id] = key
+        self._heap.append(item_id)
+        self._pos[item_id] = len(self._heap) - 1
+        self._sift_up(len(self._heap) - 1)
+
+    def peek(self):
+        """Smallest id, or None when empty."""
+        return self._heap[0] if self._heap else None
+
+    def pop(self):
+        """Remove and return the smallest id (IndexError when empty)."""
+        item_id = self._heap[0]
+        self.remove(item_id)
+        return item_id
+
+    def update(self, item_id, key):
+        """Change an id's key and restore heap order."""
+        old = self._keys[item_id]
+        self._keys[item_id] = key
+        if key < old:
+            self._sift_up(self._pos[item_id])
+        elif old < key:
+            self._sift_down(self._pos[item_id])
+
+    def remove(self, item_id):
+        """Remove an id from anywhere in the heap."""
+        idx = self._pos.pop(item_id)
+        del self._keys[item_id]
+        last = self._heap.pop()
+        if idx < len(self._heap):
+            self._heap[idx] = last
+            self._pos[last] = idx
+            self._sift_down(self._sift_up(idx))
+
+    def smallest(self, limit: int = None):
+        """
+        Yield ids in key order without modifying the heap.
+
+        Walks the heap best-first, so the first k ids cost O(k log k)
+        rather than a sort of the whole heap.
+        """
+        heap, keys = self._heap, self._keys
+        if not heap:
+            return
+        frontier = [(keys[heap[0]], 0)]
+        count = 0
+        while frontier and (limit is None or count < limit):
+            _, idx = heapq.heappop(frontier)
+            yield heap[idx]
+            count += 1
+            for child in (2 * idx + 1, 2 * idx + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (keys[heap[child]], child))
+
+    def _sift_up(self, idx: int) -> int:
+        heap, keys, pos = self._heap, self._keys, self._pos
+        item_id = heap[idx]
+        key = keys[item_id]
+        while idx:
+            parent = (idx - 1) // 2
+            if not key < keys[heap[parent]]:
+                break
+            heap[idx] = heap[parent]
+            pos[heap[idx]] = idx
+            idx = parent
+        heap[idx] = item_id
+        pos[item_id] = idx
+        return idx
+
+    def _sift_down(self, idx: int) -> int:
+        heap, keys, pos = self._heap, self._keys, self._pos
+        size = len(heap)
+        item_id = heap[idx]
+        key = keys[item_id]
+        while True:
+            child = 2 * idx + 1
+            if child >= size:
+                break
+            if child + 1 < size and keys[heap[child + 1]] < keys[heap[child]]:
+                child += 1
+            if not keys[heap[child]] < key:
+                break
+            heap[idx] = heap[child]
+            pos[heap[idx]] = idx
+            idx = child
+        heap[idx] = item_id
+        pos[item_id] = idx
+        return idx
+
+
+# ============================================================
+# 🚑 TRIAGE QUEUE
+# ============================================================
+
+class TriageQueue:
+    """
+    Waiting patients, most urgent first.
+
+    Patients are ordered by risk category (HIGH first), then risk score,
+    then arrival time. Besides the queue as a whole, every city and every
+    assigned hospital keeps its own indexed heap of the same entries, so
+    pushing, popping, re-scoring and re-assigning a patient are all
+    O(log n) in every view they belong to, and no view is ever re-sorted.
+    """
+
+    def __init__(self):
+        self._all = IndexedHeap()
+        self._cities = {}       # city -> IndexedHeap
+        self._hospitals = {}    # hospital -> IndexedHeap
+        self._entries = {}      # patient_id -> entry dict
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._all)
+
+    def __contains__(self, patient_id) -> bool:
+        return patient_id in self._entries
+
+    # ---------- views ----------
+
+    def _views(self, entry: dict) -> list:
+        views = [self._all, self._cities.setdefault(entry["city"], IndexedHeap())]
+        if entry["hospital"] is not None:
+            views.append(self._hospitals.setdefault(entry["hospital"], IndexedHeap()))
+        return views
+
+    def _view(self, city: str, hospital: str) -> IndexedHeap:
+        if city is not None and hospital is not None:
+            raise ValueError("filter by city or by hospital, not both")
+        if hospital is not None:
+            return self._hospitals.get(hospital, IndexedHeap())
+        if city is not None:
+            return self._cities.get(city, IndexedHeap())
+        return self._all
+
+    def _detach(self, entry: dict):
+        for view in self._views(entry):
+            view.remove(entry["patient_id"])
+        for views, name in ((self._cities, entry["city"]), (self._hospitals, entry["hospital"])):
+            if name is not None and not views[name]:
+                del views[name]
+
+    # ---------- updates ----------
+
+    def push(
+        self,
+        patient_id,
+        risk: dict,
+        city: str = "",
+        hospital: str = None,
+        patient: dict = None,
+        arrival: float = None
+    ) -> dict:
+        """
+        Add a waiting patient, or re-score them if already queued.
+
+        Args:
+            patient_id: Any hashable id, unique among waiting patients
+            risk: calculate_risk_score result (score and category are used)
+            city: Patient's city
+            hospital: Hospital the patient is waiting at, if assigned
+            patient: patient_data dict kept with the entry
+            arrival: Epoch seconds (default: now)
+
+        Returns:
+            The queue entry
+        """
+        if patient_id in self._entries:
+            return self.update(patient_id, risk)
+        entry = {
+            "patient_id": patient_id,
+            "risk": risk,
+            "city": city,
+            "hospital": hospital,
+            "patient": patient,
+            "arrival": time.time() if arrival is None else arrival,
+            "seq": next(self._seq)
+        }
+        self._entries[patient_id] = entry
+        key = triage_key(risk, entry["arrival"], entry["seq"])
+        for view in self._views(entry):
+            view.push(patient_id, key)
+        return entry
+
+    def push_record(self, record: dict, patient_id=None, hospital: str = None, arrival: float = None) -> dict:
+        """
+        Queue a screen_transcript record ({"patient", "risk", ...}).
+
+        The id defaults to the patient's name, which must then be unique
+        among waiting patients.
+        """
+        patient = record["patient"]
+        return self.push(
+            patient.get("name") if patient_id is None else patient_id,
+            record["risk"], patient.get("city", ""), hospital, patient, arrival
+        )
+
+    def update(self, patient_id, risk: dict) -> dict:
+        """Re-prioritize a waiting patient after re-scoring; arrival order is kept."""
+        entry = self._entries[patient_id]
+        entry["risk"] = risk
+        key = triage_key(risk, entry["arrival"], entry["seq"])
+        for view in self._views(entry):
+            view.update(patient_id, key)
+        return entry
+
+    def assign(self, patient_id, hospital: str) -> dict:
+        """Move a waiting patient to a hospital's queue (None to unassign)."""
+        entry = self._entries[patient_id]
+        if entry["hospital"] != hospital:
+            self._detach(entry)
+            entry["hospital"] = hospital
+            key = triage_key(entry["risk"], entry["arrival"], entry["seq"])
+            for view in self._views(entry):
+                view.push(patient_id, key)
+        return entry
+
+    def remove(self, patient_id) -> dict:
+        """Take a patient off the queue (left, transferred) and return their entry."""
+        entry = self._entries.pop(patient_id)
+        self._detach(entry)
+        return entry
+
+    def pop(self, city: str = None, hospital: str = None) -> dict:
+        """
+        Remove and return the most urgent entry, overall or within one city or hospital.
+
+        Returns:
+            The entry, or None if that view is empty
+        """
+        view = self._view(city, hospital)
+        if not view:
+            return None
+        return self.remove(view.peek())
+
+    # ---------- reads ----------
+
+    def peek(self, city: str = None, hospital: str = None) -> dict:
+        """Most urgent entry without removing it, or None."""
+        patient_id = self._view(city, hospital).peek()
+        return None if patient_id is None else self._entries[patient_id]
+
+    def get(self, patient_id) -> dict:
+        return self._entries[patient_id]
+
+    def ordered(self, city: str = None, hospital: str = None, limit: int = None) -> list:
+        """
+        Waiting entries in triage order, overall or for one city or hospital.
+
+        Args:
+            city: Only this city's patients
+            hospital: Only this hospital's patients
+            limit: Return at most this many (the cheap case for dashboards)
+
+        Returns:
+            List of entries, most urgent first
+        """
+        return [self._entries[pid] for pid in self._view(city, hospital).smallest(limit)]
+
+    def counts(self, by: str = "category") -> dict:
+        """Waiting patients per "category", "city" or "hospital"."""
+        if by == "city":
+            return {city: len(view) for city, view in self._cities.items()}
+        if by == "hospital":
+            return {hospital: len(view) for hospital, view in self._hospitals.items()}
+        counts = dict.fromkeys(CATEGORY_RANK, 0)
+        for entry in self._entries.values():
+            counts[entry["risk"]["category"]] = counts.get(entry["risk"]["category"], 0) + 1
+        return counts
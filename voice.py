@@ -0,0 +1,370 @@
+"""
+🗣️ Voice Transcript Matching
+Compiled keyword tables for multilingual voice intake
+"""
+
+import re
+from collections import deque
+from data import VOICE_PATTERNS
+from snapshot import engine_part
+
+
+# ============================================================
+# 🔎 MULTI-PATTERN KEYWORD AUTOMATON (AHO-CORASICK)
+# ============================================================
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over a {keyword: value} table.
+
+    Finds every keyword occurrence in a single pass over the text, so the
+    cost of a scan grows with the text length rather than the table size.
+    Keywords are matched as lowercase substrings.
+    """
+
+    def __init__(self, keywords: dict):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+
+        for keyword, value in keywords.items():
+            keyword = keyword.lower()
+            if not keyword:
+                continue
+            state = 0
+            for ch in keyword:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = nxt
+            self._out[state] += ((len(keyword), value),)
+
+        # Breadth-first failure links; each state inherits its fallback's outputs
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+    def find_all(self, text: str):
+        """
+        Yield (start, end, value) for every keyword occurrence in text.
+
+        Args:
+            text: Lowercased text to scan
+        """
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for pos, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, value in out[state]:
+                yield pos + 1 - length, pos + 1, value
+
+    def first_mentions(self, text: str) -> list:
+        """
+        Return matched values once each, ordered by where they are first mentioned.
+
+        Args:
+            text: Lowercased text to scan
+
+        Returns:
+            List of distinct values in first-mention order
+        """
+        goto, fail, out = self._goto, self._fail, self._out
+        first = {}
+        state = 0
+        for pos, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, value in out[state]:
+                start = pos + 1 - length
+                if start < first.get(value, start + 1):
+                    first[value] = start
+        return sorted(first, key=first.get)
+
+
+def build_symptom_matcher(voice_patterns: dict = VOICE_PATTERNS) -> KeywordAutomaton:
+    """
+    Compile the symptom keywords of every language into one automaton.
+
+    Args:
+        voice_patterns: Language -> {"symptoms": {keyword: symptom}} table
+
+    Returns:
+        KeywordAutomaton mapping each keyword to its canonical symptom
+    """
+    keywords = {}
+    for patterns in voice_patterns.values():
+        for keyword, symptom in patterns.get("symptoms", {}).items():
+            keywords.setdefault(keyword.lower(), symptom)
+    return KeywordAutomaton(keywords)
+
+
+SYMPTOM_MATCHER = engine_part("symptom_matcher", KeywordAutomaton, build_symptom_matcher)
+
+
+# ============================================================
+# 📝 FIELD EXTRACTION
+# ============================================================
+# (field, value, pattern) in priority order: for each field the earliest
+# listed pattern that matches anywhere wins. Patterns run on lowercased text;
+# a fixed value (gender, "bp normal") is used instead of the captured groups.
+
+FIELD_PATTERNS = [
+    # Bulk mode
+    ("bulk", None, r"patients?\s+(\d+)\s*(?:to|-)\s*(\d+)"),
+    ("bulk", None, r"(\d+)\s*(?:to|-)\s*(\d+)\s*patients?"),
+    # Name
+    ("name", None, r"(?:patient|name|naam|નામ|मरीज)\s+([a-zA-Z\u0900-\u097F\u0A80-\u0AFF]+)"),
+    # Age
+    ("age", None, r"age\s+(\d+)"),
+    ("age", None, r"(\d+)\s*(?:years?|yrs?|साल|વર્ષ)\s*old"),
+    ("age", None, r"उम्र\s+(\d+)"),
+    ("age", None, r"ઉંમર\s+(\d+)"),
+    # Gender (any male keyword beats any female keyword)
+    ("gender", "M", r"male|man|पुरुष|પુરુષ"),
+    ("gender", "F", r"female|woman|महिला|સ્ત્રી"),
+    # Blood pressure ("bp normal" overrides any reading)
+    ("bp", None, r"bp\s+(\d+)[/\s]+(\d+)"),
+    ("bp", None, r"blood\s+pressure\s+(\d+)[/\s]+(\d+)"),
+    ("bp", None, r"(\d{2,3})[/](\d{2,3})"),
+    ("bp_normal", "120/80", r"bp normal|normal bp")
+]
+
+# Fallback name: a capitalised first word followed by age/has/is
+LEADING_NAME_PATTERN = r"^([A-Z][a-z]+)\s+(?:age|has|is)"
+
+
+class VoiceFieldParser:
+    """
+    Compiled extractor for the structured fields of a voice transcript.
+
+    Every field pattern is compiled once up front, the transcript is
+    lowercased once, and each field stops at its first matching pattern.
+    Build one instance and reuse it; parse_voice_input uses VOICE_PARSER.
+    """
+
+    def __init__(
+        self,
+        field_patterns: list = FIELD_PATTERNS,
+        leading_name: str = LEADING_NAME_PATTERN,
+        symptom_matcher: KeywordAutomaton = None
+    ):
+        self.field_patterns = [
+            (field, value, re.compile(pattern)) for field, value, pattern in field_patterns
+        ]
+        self.symptom_matcher = symptom_matcher or SYMPTOM_MATCHER
+        self._leading_name = re.compile(leading_name, re.IGNORECASE)
+
+    def extract(self, text_lower: str) -> dict:
+        """
+        Resolve every field from its highest-priority matching pattern.
+
+        Args:
+            text_lower: Lowercased transcript
+
+        Returns:
+            Dictionary of {field: captured groups, or the pattern's fixed value}
+        """
+        fields = {}
+        for field, value, pattern in self.field_patterns:
+            if field in fields:
+                continue
+            match = pattern.search(text_lower)
+            if match:
+                fields[field] = value if value is not None else match.groups()
+        return fields
+
+    def parse(self, text: str) -> dict:
+        """
+        Parse voice input to extract patient data.
+
+        Args:
+            text: Raw voice transcript
+
+        Returns:
+            Dictionary with extracted fields
+        """
+        text_lower = text.lower()
+        return self.assemble(text, self.extract(text_lower), self.symptom_matcher.first_mentions(text_lower))
+
+    def assemble(self, text: str, fields: dict, symptoms: list) -> dict:
+        """
+        Build the parse result from resolved fields and matched symptoms.
+
+        Args:
+            text: Raw voice transcript (for the leading-name fallback)
+            fields: Output of extract()
+            symptoms: Canonical symptoms in first-mention order
+
+        Returns:
+            Dictionary with extracted fields
+        """
+        result = {
+            "name": "",
+            "age": 0,
+            "symptoms": symptoms,
+            "bp": "",
+            "gender": fields.get("gender", ""),
+            "bulk_mode": False,
+            "patient_range": None
+        }
+
+        if "bulk" in fields:
+            result["bulk_mode"] = True
+            result["patient_range"] = (int(fields["bulk"][0]), int(fields["bulk"][1]))
+
+        if "name" in fields:
+            result["name"] = fields["name"][0].strip().title()
+        else:
+            name_match = self._leading_name.search(text)
+            if name_match:
+                result["name"] = name_match.group(1).strip().title()
+
+        if "age" in fields:
+            result["age"] = int(fields["age"][0])
+
+        if "bp_normal" in fields:
+            result["bp"] = fields["bp_normal"]
+        elif "bp" in fields:
+            result["bp"] = f"{fields['bp'][0]}/{fields['bp'][1]}"
+
+        return result
+
+
+VOICE_PARSER = VoiceFieldParser()
+
+
+# ============================================================
+# 🎙️ INCREMENTAL PARSING
+# ============================================================
+# Field patterns are re-searched from this many characters before the first
+# changed character, so a match may span at most this much stable text.
+
+_STREAM_LOOKBACK = 64
+
+
+def _common_prefix(a: str, b: str) -> int:
+    """Length of the common prefix of a and b, by binary search on slices."""
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+class IncrementalVoiceParser:
+    """
+    Live parse of a transcript that arrives as partial ASR hypotheses.
+
+    Feed each revised hypothesis of the current utterance to partial() and
+    the settled text to final(). Only the text after the first changed
+    character is rescanned: the symptom automaton resumes from its saved
+    state at that point and field patterns are re-searched from just
+    before it, while matches in the stable prefix are kept.
+
+    Every call returns (field, value) events for the result fields that
+    changed; `result` always equals VOICE_PARSER.parse(text).
+    """
+
+    def __init__(self, parser: VoiceFieldParser = None):
+        self.parser = parser or VOICE_PARSER
+        self.reset()
+
+    def reset(self):
+        """Start a new transcript."""
+        self.committed = ""
+        self.text = ""
+        self._lower = ""
+        self._states = []    # automaton state after each character
+        self._hits = []      # (end, start, symptom) in scan order
+        self._field_hits = [None] * len(self.parser.field_patterns)   # (start, end, groups)
+        self.result = self.parser.assemble("", {}, [])
+
+    def _join(self, text: str) -> str:
+        return f"{self.committed} {text}" if self.committed and text else self.committed + text
+
+    def partial(self, hypothesis: str) -> list:
+        """Replace the current utterance's hypothesis."""
+        return self.update(self._join(hypothesis))
+
+    def final(self, text: str) -> list:
+        """Settle the current utterance; later partials start after it."""
+        self.committed = self._join(text)
+        return self.update(self.committed)
+
+    def update(self, text: str) -> list:
+        """
+        Move to a new full transcript, reparsing only what changed.
+
+        Args:
+            text: The whole transcript so far
+
+        Returns:
+            List of (field, new value) for every result field that changed
+        """
+        if text == self.text:
+            return []
+        changed = _common_prefix(self.text, text)
+        tail = text[changed:].lower()
+        if len(tail) != len(text) - changed or len(self._lower) != len(self.text):
+            # Lowercasing changed the length ("İ" -> "i̇"), here or in the kept
+            # prefix; offsets no longer line up, so rescan from the start
+            changed, tail = 0, text.lower()
+        self.text = text
+        self._lower = lowered = self._lower[:changed] + tail
+
+        # Resume the symptom automaton at the first changed character
+        matcher = self.parser.symptom_matcher
+        goto, fail, out = matcher._goto, matcher._fail, matcher._out
+        states, hits = self._states, self._hits
+        del states[changed:]
+        while hits and hits[-1][0] > changed:
+            hits.pop()
+        state = states[-1] if states else 0
+        for pos in range(changed, len(lowered)):
+            ch = lowered[pos]
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            states.append(state)
+            for length, value in out[state]:
+                hits.append((pos + 1, pos + 1 - length, value))
+
+        first = {}
+        for _, start, value in hits:
+            if start < first.get(value, start + 1):
+                first[value] = start
+        symptoms = sorted(first, key=first.get)
+
+        # Keep field matches well clear of the change, re-search the rest
+        fields = {}
+        for i, (field, value, pattern) in enumerate(self.parser.field_patterns):
+            hit = self._field_hits[i]
+            if hit is None or hit[1] + _STREAM_LOOKBACK > changed:
+                start = changed - _STREAM_LOOKBACK if hit is None else min(hit[0], changed - _STREAM_LOOKBACK)
+                match = pattern.search(lowered, max(start, 0))
+                hit = self._field_hits[i] = (match.start(), match.end(), match.groups()) if match else None
+            if hit is not None and field not in fields:
+                fields[field] = value if value is not None else hit[2]
+
+        result = self.parser.assemble(text, fields, symptoms)
+        events = [(key, value) for key, value in result.items() if self.result.get(key) != value]
+        self.result = result
+        return events